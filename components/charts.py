@@ -4,6 +4,8 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import pandas as pd
 
+from services.transfers import TransferSeries
+
 def create_price_chart(price_data):
     """Create a clean and modern price chart with white background."""
     if not price_data or not isinstance(price_data, list):
@@ -242,10 +244,15 @@ def create_wallet_chart(wallet_data, wallet_name):
     
     # Filter for last 30 days
     cutoff_date = datetime.now() - timedelta(days=30)
-    daily_flows = [
-        flow for flow in daily_flows 
-        if flow['date'] >= cutoff_date
-    ]
+    transfers = wallet_data.get('transfers')
+    if isinstance(transfers, TransferSeries):
+        # Day buckets come straight from the sorted arrays via binary search
+        daily_flows = transfers.daily_flows(start=cutoff_date.timestamp())
+    else:
+        daily_flows = [
+            flow for flow in daily_flows 
+            if flow['date'] >= cutoff_date
+        ]
     
     dates = [flow['date'] for flow in daily_flows]
     
@@ -0,0 +1,78 @@
+import streamlit as st
+import pandas as pd
+
+from services.circuit_breaker import breaker_states
+from services.updater import collector_role
+from utils import metrics
+
+
+def _latency_frame(histogram, label_names):
+    rows = []
+    for labels, summary in histogram.summaries().items():
+        row = dict(zip(label_names, labels))
+        row.update({
+            'Count': summary['count'],
+            'Avg (ms)': round(summary['avg'] * 1000, 1),
+            'p50 (ms)': summary['p50'] * 1000,
+            'p95 (ms)': summary['p95'] * 1000
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def display_diagnostics():
+    """Render upstream, cache, job and render-time metrics for this process"""
+    role = collector_role()
+    if role:
+        st.caption(f"Background collectors: this replica is the {role}")
+
+    st.markdown("**Upstream requests**")
+    http = _latency_frame(metrics.http_request_seconds, ('Host', 'Endpoint'))
+    if http.empty:
+        st.caption("No upstream requests yet")
+    else:
+        st.dataframe(http, hide_index=True, use_container_width=True)
+
+    statuses = [
+        {'Endpoint': endpoint, 'Status': status, 'Count': count}
+        for (host, endpoint, status), count in sorted(metrics.http_requests_total.values().items())
+    ]
+    if statuses:
+        st.dataframe(pd.DataFrame(statuses), hide_index=True, use_container_width=True)
+
+    open_breakers = {name: state for name, state in breaker_states().items() if state != 'closed'}
+    if open_breakers:
+        st.markdown("**Circuit breakers**")
+        st.dataframe(
+            pd.DataFrame([{'Endpoint': name, 'State': state} for name, state in sorted(open_breakers.items())]),
+            hide_index=True,
+            use_container_width=True
+        )
+
+    st.markdown("**Cache hit ratio**")
+    ratios = [
+        {'Key': key, 'Hits': hits, 'Misses': misses, 'Hit ratio': f"{ratio:.0%}"}
+        for key, (hits, misses, ratio) in sorted(metrics.cache_hit_ratios().items())
+    ]
+    if ratios:
+        st.dataframe(pd.DataFrame(ratios), hide_index=True, use_container_width=True)
+    else:
+        st.caption("No cache lookups yet")
+
+    st.markdown("**Updater jobs**")
+    jobs = _latency_frame(metrics.job_duration_seconds, ('Job',))
+    if jobs.empty:
+        st.caption("No jobs have run yet")
+    else:
+        st.dataframe(jobs, hide_index=True, use_container_width=True)
+
+    writes = _latency_frame(metrics.db_write_seconds, ('Database write',))
+    if not writes.empty:
+        st.dataframe(writes, hide_index=True, use_container_width=True)
+
+    st.markdown("**Section render time**")
+    sections = _latency_frame(metrics.render_seconds, ('Section',))
+    if sections.empty:
+        st.caption("No sections rendered yet")
+    else:
+        st.dataframe(sections, hide_index=True, use_container_width=True)
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from utils.cache import get_freshness
+
 def display_metrics(label, value):
     """Display a metric in a styled container"""
     st.markdown(f"""
@@ -8,3 +10,15 @@ def display_metrics(label, value):
             <div class="metric-value">{value}</div>
         </div>
     """, unsafe_allow_html=True)
+
+def display_freshness(key):
+    """Note under a section when it is showing a stale value"""
+    freshness = get_freshness(key)
+    if not freshness or not freshness['stale']:
+        return
+    minutes, seconds = divmod(int(freshness['age']), 60)
+    age = f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+    note = f"⏳ Showing data from {age} ago while refreshing"
+    if freshness['error']:
+        note += " (upstream unavailable)"
+    st.caption(note)
@@ -1,5 +1,7 @@
 import streamlit.components.v1 as components
 
+from services.api_server import API_PORT, API_PUBLIC_URL
+
 def tps_gauge_component(tps_value):
     """Custom component for TPS gauge that auto-updates"""
     
@@ -42,14 +44,19 @@ def tps_gauge_component(tps_value):
                 // Create initial gauge
                 createGauge();
                 
-                // Setup WebSocket-like connection to get updates
-                var eventSource = new EventSource('/_stcore/stream');
+                // Subscribe to the server-push TPS channel on the API server
+                var apiBase = "{API_PUBLIC_URL}" ||
+                    (window.parent.location.protocol + '//' + window.parent.location.hostname + ':{API_PORT}');
+                var eventSource = new EventSource(apiBase + '/tps/stream');
                 eventSource.onmessage = function(e) {{
                     try {{
                         var data = JSON.parse(e.data);
                         if (data.tps !== undefined) {{
                             tps = data.tps;
-                            Plotly.update('tps-gauge', {{'value': [tps]}});
+                            Plotly.restyle('tps-gauge', {{
+                                'value': [tps],
+                                'gauge.bar.color': [tps < 10 ? "red" : tps < 30 ? "orange" : "green"]
+                            }});
                         }}
                     }} catch (err) {{
                         console.error('Error updating TPS:', err);
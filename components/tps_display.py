@@ -1,26 +1,38 @@
 import streamlit.components.v1 as components
 
+from services.api_server import API_PORT, API_PUBLIC_URL
+
 def tps_display(tps_value):
     """Custom component for TPS display with auto-refresh"""
-    
+
     html = f"""
         <div id="tps-display" style="font-size: 1rem; margin-bottom: 1rem;">
             <div style="color: #808495;">Network Speed</div>
             <div id="tps-value" style="font-size: 1.5rem; font-weight: bold;">{tps_value} TPS</div>
-            
+
             <script>
+                // The snapshot API runs next to Streamlit on its own port
+                var apiBase = "{API_PUBLIC_URL}" ||
+                    (window.parent.location.protocol + '//' + window.parent.location.hostname + ':{API_PORT}');
+
                 function updateTPS() {{
-                    fetch('/network_stats')
-                        .then(response => response.json())
+                    // no-cache makes the browser revalidate with If-None-Match,
+                    // so an unchanged snapshot costs a 304 with no body
+                    fetch(apiBase + '/tps', {{cache: 'no-cache'}})
+                        .then(response => response.ok ? response.json() : null)
                         .then(data => {{
-                            document.getElementById('tps-value').innerText = data.tps + ' TPS';
-                        }});
+                            if (data && data.tps !== undefined) {{
+                                document.getElementById('tps-value').innerText =
+                                    data.tps + ' TPS' + (data.stale ? ' (stale)' : '');
+                            }}
+                        }})
+                        .catch(err => console.error('Error updating TPS:', err));
                 }}
-                
+
                 // Update every 6 seconds
                 setInterval(updateTPS, 6000);
             </script>
         </div>
     """
-    
-    components.html(html, height=100) 
\ No newline at end of file
+
+    components.html(html, height=100)
@@ -0,0 +1,49 @@
+"""Measure batched EGLD denomination against per-value float conversion.
+
+Run from the repository root:
+
+    python scripts/denomination_benchmark.py
+
+Converts 100,000 random atomic amounts both ways and reports the time of
+each and the largest relative error of the batched floats against the
+exact Decimal values.
+"""
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.denomination import to_decimal, to_float_array  # noqa: E402
+
+
+def main():
+    count = 100000
+    values = [str(random.randint(0, 10 ** 26)) for _ in range(count)]
+
+    def best_of(func, runs=5):
+        best = float('inf')
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - t0)
+        return result, best
+
+    # The previous wallet history path: one float() and division per transfer
+    _, per_item_seconds = best_of(lambda: np.fromiter((float(value) / 10**18 for value in values), dtype=np.float64))
+    batched, batched_seconds = best_of(lambda: to_float_array(values))
+
+    exact = [to_decimal(value) for value in values]
+    worst = max(abs(Decimal(b) - e) / e for b, e in zip(batched.tolist(), exact) if e)
+
+    print(f"{count} values: per-item float {per_item_seconds * 1000:.1f} ms, "
+          f"batched {batched_seconds * 1000:.1f} ms, max relative error {worst:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure the exchange flow matrix: wallet ingest, daily build and cached reads.
+
+Run from the repository root:
+
+    python scripts/exchange_flows_benchmark.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.address_book import WALLETS, AddressBook, wallet_exchange  # noqa: E402
+from services.exchange_flows import DAY, ExchangeFlowMatrix  # noqa: E402
+from services.transfers import INCOMING, OUTGOING, TransferSeries, address_key  # noqa: E402
+
+
+def main():
+    # Every collected wallet with a 9000-transfer history, thousands of labeled
+    # addresses, and a fifth of the transfers going to a labeled address
+    labels = 5000
+    rng = np.random.default_rng(1)
+    book = AddressBook()
+    for name, address in WALLETS.items():
+        book.add(address, wallet_exchange(name))
+    labeled = [f'erd1labeled{i:06d}' for i in range(labels)]
+    for i, address in enumerate(labeled):
+        book.add(address, f'Exchange {i % 200}')
+    labeled_keys = np.array([address_key(a) for a in labeled + list(WALLETS.values())], dtype=np.int64)
+
+    matrix = ExchangeFlowMatrix(book)
+    now = time.time()
+    count = 9000
+    ingest = 0.0
+    for name in WALLETS:
+        counterparties = rng.integers(-2**63, 2**63 - 1, count, dtype=np.int64)
+        to_labeled = rng.random(count) < 0.2
+        counterparties[to_labeled] = rng.choice(labeled_keys, to_labeled.sum())
+        series = TransferSeries.from_arrays(
+            rng.integers(now - 30 * DAY, now, count), rng.random(count) * 1000,
+            rng.choice([INCOMING, OUTGOING], count), counterparties
+        )
+        t0 = time.perf_counter()
+        matrix.update(f'{name}_wallet', series)
+        ingest += time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rows = matrix.daily_net(30, now)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    matrix.daily_net(30, now)
+    cached = time.perf_counter() - t0
+    exchanges, net = matrix.net_matrix(30, now)
+    assert np.allclose(net, -net.T)
+    print(f"{len(WALLETS)} wallets x {count} transfers, {labels} labels: "
+          f"ingest {ingest / len(WALLETS) * 1e6:.1f} us/wallet, build {build * 1000:.1f} ms, "
+          f"cached read {cached * 1e6:.1f} us, {len(rows)} daily rows, {len(exchanges)} exchanges")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Measure the large-transfer detector's per-transfer cost as history grows.
+
+Run from the repository root:
+
+    python scripts/large_transfers_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.large_transfers import EVENT_LOG_SIZE, LargeTransferDetector  # noqa: E402
+from services.transfers import INCOMING  # noqa: E402
+
+
+def main():
+    # Per-transfer cost should stay flat as the history grows
+    detector = LargeTransferDetector()
+    now = time.time()
+    for count in (10000, 100000, 1000000):
+        transfers = [
+            (now - count + i, random.lognormvariate(3, 1.5), INCOMING if i % 2 else -1)
+            for i in range(count)
+        ]
+        start = time.perf_counter()
+        detector.observe_many(f'bench_{count}', transfers, now)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>8} transfers: {elapsed / count * 1e6:.2f} µs/transfer")
+    print(f"events logged: {len(detector.events(EVENT_LOG_SIZE))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Drive the dashboard headlessly and fail if memory or threads grow without bound.
+
+Run from the repository root:
+
+    python scripts/memory_profile.py [--sessions 10] [--reruns 20] [--top 15]
+
+Each simulated session is a Streamlit AppTest (its own session state)
+rerun --reruns times in this process, so module-level singletons,
+caches and background threads are shared exactly as in a server. After
+a warm-up session the harness records, with tracemalloc:
+
+- traced memory after every rerun and after every session is dropped,
+- what a live session holds (memory released when it is dropped),
+- live threads, by name,
+- the top allocation sites that grew between the warm-up and the end.
+
+The run fails (exit status 1) if memory retained per session or per
+rerun over the second half of the run is above the thresholds, or if
+the thread count grew. Growth during the first half is reported but
+not judged, since caches legitimately fill then.
+
+DATABASE_URL defaults to a scratch SQLite file and ARCHIVE_DIR to a
+scratch directory.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frames kept per allocation; enough to see which app code triggered it
+TRACE_DEPTH = 12
+
+
+def _traced_kib():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 1024
+
+
+def _rss_kib():
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('VmRSS'))
+    except (OSError, StopIteration):
+        return None
+
+
+def _threads():
+    names = {}
+    for thread in threading.enumerate():
+        # Collapse numbered pool workers ("ThreadPoolExecutor-0_3") into one name
+        name = thread.name.rstrip('0123456789').rstrip('_-')
+        names[name] = names.get(name, 0) + 1
+    return names
+
+
+def _slope(values):
+    """Least-squares growth per step of a series"""
+    count = len(values)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    return numerator / sum((x - mean_x) ** 2 for x in range(count))
+
+
+def _second_half(values):
+    return values[len(values) // 2:]
+
+
+def _top_sites(before, after, limit):
+    """Largest growth among allocations made with this repository's code on the stack.
+
+    Grouping every trace by full traceback is very slow on a snapshot of
+    the whole Streamlit runtime, so only traces reached from app code are
+    compared.
+    """
+    app_code = (tracemalloc.Filter(True, os.path.join(ROOT, '*'), all_frames=True),)
+    after = after.filter_traces(app_code)
+    before = before.filter_traces(app_code)
+    return [stat for stat in after.compare_to(before, 'traceback') if stat.size_diff > 0][:limit]
+
+
+def _app_frame(traceback):
+    """Innermost frame in this repository, else the innermost frame"""
+    for frame in reversed(traceback):
+        if frame.filename.startswith(ROOT) and '/scripts/' not in frame.filename:
+            return frame
+    return traceback[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument('--reruns', type=int, default=20, help='reruns per session')
+    parser.add_argument('--top', type=int, default=15, help='allocation sites to list')
+    parser.add_argument('--timeout', type=int, default=120, help='AppTest timeout per run, seconds')
+    parser.add_argument('--max-session-growth-kib', type=float, default=256.0,
+                        help='allowed memory retained per dropped session (second half)')
+    parser.add_argument('--max-rerun-growth-kib', type=float, default=64.0,
+                        help='allowed memory retained per rerun within a session (second half)')
+    parser.add_argument('--max-thread-growth', type=int, default=0)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(scratch, 'memory.db')}")
+    os.environ.setdefault('ARCHIVE_DIR', os.path.join(scratch, 'archive'))
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    from streamlit.testing.v1 import AppTest
+
+    def new_session():
+        return AppTest.from_file('streamlit_app.py', default_timeout=args.timeout)
+
+    # Warm-up: imports, singletons, caches and background threads start here.
+    # Tracing starts afterwards; tracing the imports slows them down severalfold.
+    start = time.perf_counter()
+    warm = new_session()
+    for _ in range(2):
+        warm.run()
+    exceptions = [str(e.value) for e in warm.exception]
+    del warm
+    tracemalloc.start(TRACE_DEPTH)
+    baseline_kib = _traced_kib()
+    baseline_rss = _rss_kib()
+    baseline_threads = _threads()
+    baseline = tracemalloc.take_snapshot()
+    print(f"Warm-up {time.perf_counter() - start:.1f} s: traced {baseline_kib / 1024:.1f} MiB, "
+          f"RSS {baseline_rss / 1024 if baseline_rss else float('nan'):.1f} MiB, "
+          f"{sum(baseline_threads.values())} threads")
+    for exception in exceptions:
+        print(f"  page raised: {exception}")
+
+    after_session = []
+    rerun_slopes = []
+    held_per_session = []
+    for index in range(args.sessions):
+        before_session = _traced_kib()
+        session = new_session()
+        after_rerun = []
+        for _ in range(args.reruns):
+            session.run()
+            after_rerun.append(_traced_kib())
+        rerun_slopes.append(_slope(_second_half(after_rerun)))
+        live = _traced_kib()
+        del session
+        dropped = _traced_kib()
+        after_session.append(dropped)
+        held_per_session.append(live - dropped)
+        print(f"session {index + 1:3d}: live {live / 1024:7.1f} MiB, held by session {live - dropped:7.1f} KiB, "
+              f"retained {dropped - before_session:+8.1f} KiB, rerun slope {rerun_slopes[-1]:+6.1f} KiB, "
+              f"threads {threading.active_count()}")
+
+    end_threads = _threads()
+    end = tracemalloc.take_snapshot()
+    end_rss = _rss_kib()
+
+    print(f"\nTop {args.top} allocation sites grown since warm-up:")
+    for stat in _top_sites(baseline, end, args.top):
+        frame = _app_frame(stat.traceback)
+        print(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  "
+              f"{os.path.relpath(frame.filename, ROOT) if frame.filename.startswith(ROOT) else frame.filename}"
+              f":{frame.lineno}")
+
+    print("\nThreads (warm-up -> end):")
+    for name in sorted(set(baseline_threads) | set(end_threads)):
+        print(f"  {name:32s} {baseline_threads.get(name, 0):3d} -> {end_threads.get(name, 0):3d}")
+
+    session_growth = _slope(_second_half(after_session))
+    rerun_growth = max(rerun_slopes[len(rerun_slopes) // 2:] or [0.0])
+    thread_growth = sum(end_threads.values()) - sum(baseline_threads.values())
+    print(f"\nPer session held while live: {sum(held_per_session) / len(held_per_session):.1f} KiB average")
+    print(f"Retained per session (second half): {session_growth:+.1f} KiB "
+          f"(limit {args.max_session_growth_kib:.0f})")
+    print(f"Retained per rerun (worst session, second half): {rerun_growth:+.1f} KiB "
+          f"(limit {args.max_rerun_growth_kib:.0f})")
+    print(f"Thread growth: {thread_growth:+d} (limit {args.max_thread_growth})")
+    if baseline_rss and end_rss:
+        print(f"RSS: {baseline_rss / 1024:.1f} -> {end_rss / 1024:.1f} MiB")
+
+    failures = []
+    if session_growth > args.max_session_growth_kib:
+        failures.append('memory retained per session keeps growing')
+    if rerun_growth > args.max_rerun_growth_kib:
+        failures.append('memory retained per rerun keeps growing')
+    if thread_growth > args.max_thread_growth:
+        failures.append('thread count grew')
+    if failures:
+        print('\nFAIL: ' + '; '.join(failures))
+        sys.exit(1)
+    print('\nPASS')
+
+
+if __name__ == "__main__":
+    main()
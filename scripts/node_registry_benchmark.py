@@ -0,0 +1,70 @@
+"""Measure the node registry: full load, epoch change with diff, and summary.
+
+Run from the repository root:
+
+    python scripts/node_registry_benchmark.py
+
+3200 validators over four shards and meta, then one epoch of churn.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.node_registry import NodeRegistry  # noqa: E402
+
+
+def main():
+    rng = np.random.default_rng(1)
+    providers = [f'erd1qqqqqqqqqqqqqpgq{i:04d}' for i in range(150)]
+
+    def node(i):
+        return {
+            'bls': '%0184x' % int(rng.integers(0, 2 ** 62)) + f'{i:08x}',
+            'shard': int(rng.choice([0, 1, 2, 4294967295])),
+            'status': str(rng.choice(['eligible', 'waiting'], p=[0.8, 0.2])),
+            'provider': providers[int(rng.integers(0, len(providers)))] if rng.random() < 0.9 else None,
+            'stake': '2500000000000000000000',
+            'rating': float(rng.uniform(80, 100)),
+        }
+
+    nodes = [node(i) for i in range(3200)]
+    registry = NodeRegistry(path=os.path.join(tempfile.mkdtemp(), 'nodes.npz'))
+    t0 = time.perf_counter()
+    registry.refresh(nodes, 1500)
+    full = time.perf_counter() - t0
+
+    churned = [dict(n) for n in nodes[40:]] + [node(i) for i in range(3200, 3230)]
+    for n in churned[:12]:
+        n['status'] = 'jailed'
+    t0 = time.perf_counter()
+    change = registry.refresh(churned, 1501)
+    epoch = time.perf_counter() - t0
+    assert (len(change['joined']), len(change['left']), len(change['jailed'])) == (30, 40, 12)
+    assert change['previous_epoch'] == 1500
+    assert registry.table.keys.tolist() == registry.build_table(churned).keys.tolist()
+
+    registry.save()
+    restored = NodeRegistry(path=registry.path)
+    assert restored.load() and len(restored.table) == len(churned)
+    assert restored.epoch == 1501 and len(restored.epoch_diffs) == 1
+    registry.epoch = None
+    registry.save()
+    assert NodeRegistry(path=registry.path).load()
+    t0 = time.perf_counter()
+    view = registry.summary()
+    summarized = time.perf_counter() - t0
+    print(f"{len(registry.table)} nodes in {registry.table.nbytes / 1024:.0f} KiB; "
+          f"full load {full * 1000:.1f} ms, epoch change with diff {epoch * 1000:.1f} ms, "
+          f"summary {summarized * 1000:.1f} ms")
+    print({label: shard['nodes'] for label, shard in view['shards'].items()},
+          view['epochs'][0]['joined_count'], view['epochs'][0]['jailed_count'])
+
+
+if __name__ == "__main__":
+    main()
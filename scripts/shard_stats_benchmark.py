@@ -0,0 +1,53 @@
+"""Measure per-shard block-window analytics over a full window.
+
+Run from the repository root:
+
+    python scripts/shard_stats_benchmark.py
+
+Four shards plus meta; shard 2 misses every tenth round and its blocks
+are empty.
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.shard_stats import METACHAIN_ID, WINDOW_BLOCKS, BlockWindow  # noqa: E402
+
+
+def main():
+    window = BlockWindow()
+    now = int(time.time())
+    blocks = []
+    for shard in (0, 1, 2, 3, METACHAIN_ID):
+        nonce = 1000
+        for round_ in range(50000, 50000 + WINDOW_BLOCKS):
+            if shard == 2 and round_ % 10 == 0:
+                continue
+            nonce += 1
+            blocks.append({
+                'shard': shard, 'nonce': nonce, 'round': round_, 'timestamp': now + (round_ - 50000) * 6,
+                'txCount': 0 if shard == 2 else random.randint(0, 40), 'size': random.randint(500, 5000),
+                'gasConsumed': random.randint(0, 10 ** 9), 'maxGasLimit': 15 * 10 ** 8
+            })
+    random.shuffle(blocks)
+    assert window.add(blocks) == len(blocks)
+    assert window.add(blocks[:100]) == 0
+    assert window.add([{'shard': 0, 'nonce': 10 ** 6, 'round': 10 ** 6, 'txCount': None}]) == 0
+    assert window.add([{'nonce': 10 ** 6, 'round': 10 ** 6, 'timestamp': now, 'txCount': 1}]) == 0
+
+    t0 = time.perf_counter()
+    stats = window.stats()
+    elapsed = time.perf_counter() - t0
+    for label, shard in stats.items():
+        print(f"shard {label:>4}: {shard['tx_per_block']:5.1f} tx/block, round {shard['round_time']:.2f}s, "
+              f"missed {shard['missed_ratio']:.1%}, empty {shard['empty_ratio']:.0%}, "
+              f"gas {shard['gas_utilization']:.0%}")
+    print(f"stats over {len(blocks)} blocks: {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
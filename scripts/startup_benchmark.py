@@ -0,0 +1,116 @@
+"""Measure cold start of the dashboard.
+
+Run from the repository root:
+
+    python scripts/startup_benchmark.py [--runs 5] [--skip-app]
+
+Reports, each in a fresh interpreter:
+- import time of the modules the page loads up front, and of the heavy
+  dependencies that are now imported lazily,
+- whether the services import without Streamlit,
+- a first page run through Streamlit's AppTest: time to the page header
+  (the 'startup' render section, i.e. time to first paint) and the whole
+  first run. The first run includes the upstream fetches for a cold cache.
+
+DATABASE_URL defaults to a scratch SQLite file so the benchmark never
+touches a shared database.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    'streamlit',
+    'services.multiversx',
+    'services.coinmarketcap',
+    'services.updater',
+    'services.tps_updater',
+    'utils.cache',
+    'components.tps_component',
+    # Loaded lazily, only by the sections that need them
+    'pandas',
+    'plotly.graph_objects',
+    'plotly.express',
+    'pyarrow.dataset',
+    'components.charts',
+    'components.diagnostics',
+)
+
+SERVICES = ('services.multiversx', 'services.coinmarketcap', 'services.updater',
+            'services.tps_updater', 'services.database', 'services.api_server', 'utils.cache')
+
+_IMPORT_TIMER = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+_NO_STREAMLIT = """
+import sys
+import {modules}
+print(sorted(name for name in ('streamlit', 'pandas', 'plotly', 'pyarrow') if name in sys.modules))
+"""
+
+_APP_RUN = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file('streamlit_app.py', default_timeout={timeout})
+app.run()
+total = time.perf_counter() - start
+from utils import metrics
+sections = {{labels[0]: summary['avg'] for labels, summary in metrics.render_seconds.summaries().items()}}
+print(json.dumps({{'total': total, 'sections': sections, 'exceptions': [str(e.value) for e in app.exception]}}))
+"""
+
+
+def _python(code, env):
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--skip-app', action='store_true', help='only time imports')
+    parser.add_argument('--timeout', type=int, default=120, help='AppTest timeout in seconds')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}")
+
+    print(f"Import time, median of {args.runs} fresh interpreters:")
+    for module in MODULES:
+        timings = [float(_python(_IMPORT_TIMER.format(module=module), env)) for _ in range(args.runs)]
+        print(f"  {module:28s} {statistics.median(timings) * 1000:7.0f} ms")
+
+    loaded = _python(_NO_STREAMLIT.format(modules=', '.join(SERVICES)), env)
+    print(f"Heavy modules loaded by importing the services: {loaded}")
+
+    if args.skip_app:
+        return
+
+    result = json.loads(_python(_APP_RUN.format(timeout=args.timeout), env))
+    startup = result['sections'].get('startup')
+    print("First page run (AppTest):")
+    if startup is not None:
+        print(f"  time to first paint     {startup * 1000:7.0f} ms")
+    print(f"  whole first run         {result['total'] * 1000:7.0f} ms")
+    for section, seconds in sorted(result['sections'].items(), key=lambda item: -item[1]):
+        if section != 'startup':
+            print(f"    {section:24s} {seconds * 1000:7.0f} ms")
+    for exception in result['exceptions']:
+        print(f"  page raised: {exception}")
+
+
+if __name__ == "__main__":
+    main()
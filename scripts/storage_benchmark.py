@@ -0,0 +1,128 @@
+"""Measure the storage backends: wallet upserts, reads and refresh-cycle writes.
+
+Run from the repository root:
+
+    python scripts/storage_benchmark.py [DATABASE_URL ...]
+
+Runs the same workload against each URL, defaulting to a scratch SQLite
+file; bench_* rows are removed afterwards. Reports upsert and read
+latency, reads per second with a concurrent writer, per-wallet writes vs
+one write_cycle, and the shared engine against an engine per instance.
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.database import _SELECT_WALLET, Database  # noqa: E402
+from services.storage import create_backend  # noqa: E402
+from services.transfers import TransferSeries  # noqa: E402
+
+
+def main():
+    urls = sys.argv[1:] or [f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"]
+
+    now = int(time.time())
+    series = TransferSeries.from_arrays(
+        np.random.randint(now - 30 * 86400, now, 9000),
+        np.random.random(9000) * 1000,
+        np.random.choice([1, -1], 9000)
+    )
+    data = {
+        'balance': 1234.5,
+        'balance_atomic': 1234500000000000000000123,
+        'transfers': series,
+        'daily_flows': series.daily_flows()
+    }
+    wallets = [f'bench_{i}_wallet' for i in range(20)]
+
+    for url in urls:
+        db = Database(url)
+
+        writes = 200
+        t0 = time.perf_counter()
+        for i in range(writes):
+            db.update_wallet_data(wallets[i % len(wallets)], data)
+        write_ms = (time.perf_counter() - t0) * 1000 / writes
+
+        loaded = db.get_wallet_data(wallets[0])
+        assert loaded['balance_atomic'] == data['balance_atomic']
+        assert np.array_equal(loaded['transfers'].timestamps, series.timestamps)
+        assert np.array_equal(loaded['transfers'].amounts, series.amounts)
+        assert len(loaded['daily_flows']) == len(data['daily_flows'])
+
+        reads = 1000
+        t0 = time.perf_counter()
+        for i in range(reads):
+            db.get_wallet_data(wallets[i % len(wallets)])
+        read_ms = (time.perf_counter() - t0) * 1000 / reads
+
+        # Readers running while the writer keeps upserting
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            t0 = time.perf_counter()
+            writer = pool.submit(lambda: [db.update_wallet_data(w, data) for w in wallets])
+            readers = [pool.submit(lambda: [db.get_wallet_data(w) for w in wallets * 5]) for _ in range(4)]
+            for future in readers + [writer]:
+                future.result()
+            mixed_reads_per_second = 4 * len(wallets) * 5 / (time.perf_counter() - t0)
+
+        # A refresh cycle: 14 wallets one transaction each vs one write_cycle,
+        # then write_cycle cost as the number of metric samples grows
+        cycle_wallets = {wallet: data for wallet in wallets[:14]}
+        t0 = time.perf_counter()
+        for wallet in cycle_wallets:
+            db.update_wallet_data(wallet, data)
+        per_wallet_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        db.write_cycle(wallets=cycle_wallets)
+        cycle_ms = (time.perf_counter() - t0) * 1000
+
+        sample_timings = []
+        base = datetime(2000, 1, 1)
+        for count in (100, 1000, 10000):
+            samples = [
+                {'transactions': i, 'active_addresses': i, 'tps': 1.0, 'last_updated': base + timedelta(seconds=i)}
+                for i in range(count)
+            ]
+            t0 = time.perf_counter()
+            db.write_cycle(network=samples)
+            sample_timings.append(f"{count} samples {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        # Page-render pattern: construct, read one wallet, close. Before the
+        # shared engine each construction built an engine and ran the DDL.
+        t0 = time.perf_counter()
+        for _ in range(100):
+            render_db = Database(url)
+            render_db.get_wallet_data(wallets[0])
+            render_db.close()
+        shared_ms = (time.perf_counter() - t0) * 1000 / 100
+        t0 = time.perf_counter()
+        for _ in range(20):
+            backend = create_backend(url)
+            backend.migrate()
+            with backend.engine.connect() as conn:
+                conn.execute(_SELECT_WALLET, {'address': wallets[0], 'cutoff': datetime.now() - timedelta(minutes=10)})
+            backend.dispose()
+        per_instance_ms = (time.perf_counter() - t0) * 1000 / 20
+
+        db.backend.write(lambda conn: conn.execute(text("DELETE FROM wallet_data WHERE address LIKE 'bench_%'")))
+        db.backend.write(lambda conn: conn.execute(text("DELETE FROM network_stats WHERE last_updated < :cutoff"), {'cutoff': datetime(2001, 1, 1)}))
+        db.close()
+        print(f"{db.backend.name}: upsert {write_ms:.2f} ms, read {read_ms:.2f} ms, "
+              f"{mixed_reads_per_second:.0f} reads/s with 4 readers + 1 writer")
+        print(f"{db.backend.name}: 14 wallets per-wallet {per_wallet_ms:.1f} ms, one cycle {cycle_ms:.1f} ms; "
+              + ", ".join(sample_timings))
+        print(f"{db.backend.name}: construct + read + close {shared_ms:.2f} ms shared engine, "
+              f"{per_instance_ms:.2f} ms engine per instance")
+
+
+if __name__ == "__main__":
+    main()
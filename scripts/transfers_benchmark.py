@@ -0,0 +1,100 @@
+"""Measure TransferSeries against the dict-per-transfer history it replaced.
+
+Run from the repository root:
+
+    python scripts/transfers_benchmark.py
+
+Reports bytes per transfer and the 24h inflow query for dict records vs
+the columnar series, then JSON vs the packed blob for persisted history,
+checking that the blob round-trips every column.
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.transfers import INCOMING, OUTGOING, TransferSeries  # noqa: E402
+
+
+def main():
+    count = 9000
+    now = int(time.time())
+    records = sorted(
+        (
+            {
+                'timestamp': datetime.fromtimestamp(now - random.randint(0, 30 * 86400)),
+                'value': random.random() * 1000,
+                'action': random.choice(['incoming', 'outgoing'])
+            }
+            for _ in range(count)
+        ),
+        key=lambda r: r['timestamp']
+    )
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    dict_copy = [dict(r, timestamp=datetime.fromtimestamp(r['timestamp'].timestamp())) for r in records]
+    dict_bytes = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+    del dict_copy
+
+    series = TransferSeries.from_records(records)
+    print(f"{count} transfers: dicts {dict_bytes / count:.0f} B/transfer, "
+          f"series {series.nbytes / count:.0f} B/transfer")
+
+    start = now - 86400
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        sum(r['value'] for r in records if r['timestamp'].timestamp() >= start and r['action'] == 'incoming')
+    linear = (time.perf_counter() - t0) / 1000
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        series.window_sums(start)['inflow']
+    bisect = (time.perf_counter() - t0) / 1000
+    print(f"24h inflow: linear {linear * 1e6:.0f} us, bisect {bisect * 1e6:.1f} us")
+
+
+    # Persisted history: JSON records vs the packed columnar blob
+    for count in (9000, 100000):
+        series = TransferSeries.from_arrays(
+            np.random.randint(now - 30 * 86400, now, count),
+            np.random.random(count) * 1000,
+            np.random.choice([INCOMING, OUTGOING], count),
+            np.random.randint(-2**63, 2**63 - 1, count, dtype=np.int64)
+        )
+        as_json = json.dumps([
+            {'timestamp': r['timestamp'].isoformat(), 'value': r['value'], 'action': r['action']}
+            for r in series
+        ])
+        blob = series.to_bytes()
+
+        t0 = time.perf_counter()
+        loaded_records = json.loads(as_json)
+        for r in loaded_records:
+            r['timestamp'] = datetime.fromisoformat(r['timestamp'])
+        json_load = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        loaded = TransferSeries.from_bytes(blob)
+        blob_load = time.perf_counter() - t0
+
+        assert np.array_equal(loaded.timestamps, series.timestamps)
+        assert np.array_equal(loaded.amounts, series.amounts)
+        assert np.array_equal(loaded.directions, series.directions)
+        assert np.array_equal(loaded.counterparties, series.counterparties)
+        assert loaded.window_sums(now - 86400) == series.window_sums(now - 86400)
+
+        print(f"{count} transfers: json {len(as_json) / 1024:.0f} KiB / {json_load * 1000:.1f} ms, "
+              f"blob {len(blob) / 1024:.0f} KiB / {blob_load * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Measure one exchange wallet refresh: bytes on the wire, time and peak RSS.
+
+Run from the repository root:
+
+    python scripts/wallet_fetch_benchmark.py [--live ADDRESS]
+
+Compares, each in a fresh interpreter (Linux, for the peak-RSS reading):
+- full:    full transaction objects loaded with response.json(), as the
+           wallet refresh used to fetch them,
+- current: MultiversXService.get_wallet_history, which requests only the
+           fields it reads and parses the body as it streams (with ijson
+           installed; it falls back to response.json() without it).
+
+By default both run against a local server that returns synthetic
+transactions shaped like the API's, gzip-compressed, and honours
+fields=. --live runs them against the real API for ADDRESS instead.
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.multiversx import WALLET_HISTORY_SIZE  # noqa: E402
+ADDRESS = 'erd1sdslvlxvfnnflzj42l8czrcngq3xjjzkjp3rgul4ttk6hntr4qdsv6sets'
+
+_CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from services import http_client
+from services.multiversx import WALLET_HISTORY_SIZE, MultiversXService
+
+responses = []
+_get = http_client.get
+def recording_get(*args, **kwargs):
+    response = _get(*args, **kwargs)
+    responses.append(response)
+    return response
+http_client.get = recording_get
+
+service = MultiversXService()
+if {base_url!r}:
+    service.base_url = {base_url!r}
+address = {address!r}
+
+
+def full():
+    import numpy as np
+    from services.transfers import INCOMING, OUTGOING
+    from utils import denomination
+    balance = http_client.get(f"{{service.base_url}}/accounts/{{address}}", endpoint='/accounts/{{address}}').json()
+    transactions = http_client.get(
+        f"{{service.base_url}}/accounts/{{address}}/transactions?size={{WALLET_HISTORY_SIZE}}&order=desc",
+        endpoint='/accounts/{{address}}/transactions'
+    ).json()
+    timestamps = np.array([int(tx.get('timestamp', 0)) for tx in transactions])
+    amounts = denomination.to_float_array([tx.get('value', '0') for tx in transactions])
+    directions = np.array([OUTGOING if tx.get('sender') == address else INCOMING for tx in transactions])
+    return len(transactions)
+
+
+def current():
+    return len(service.get_wallet_history(address)['transfers'])
+
+
+# Import what either variant touches up front so RSS growth is the fetch itself
+import numpy, requests
+from services import transfers
+from utils import denomination
+if http_client.ijson is not None:
+    http_client.ijson.items(b'[]', 'item')
+
+
+def status_kib(name):
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(name))
+
+# Reset the peak-RSS mark (Linux) so imports above do not hide the fetch's peak
+with open('/proc/self/clear_refs', 'w') as f:
+    f.write('5')
+before = status_kib('VmRSS')
+start = time.perf_counter()
+count = {variant}()
+elapsed = time.perf_counter() - start
+peak = status_kib('VmHWM')
+print(json.dumps({{
+    'count': count,
+    'seconds': elapsed,
+    'bytes': sum(response.raw.tell() for response in responses),
+    'rss_growth_kib': max(0, peak - before),
+    'ijson': http_client.ijson is not None,
+}}))
+"""
+
+
+def _transaction(i, rng):
+    """Synthetic transaction with the fields the accounts endpoint returns"""
+    outgoing = rng.random() < 0.5
+    other = 'erd1' + ''.join(rng.choice('023456789acdefghjklmnpqrstuvwxyz') for _ in range(58))
+    tx_hash = '%064x' % rng.getrandbits(256)
+    return {
+        'txHash': tx_hash,
+        'gasLimit': 50000,
+        'gasPrice': 1000000000,
+        'gasUsed': 50000,
+        'miniBlockHash': '%064x' % rng.getrandbits(256),
+        'nonce': 100000 + i,
+        'receiver': other if outgoing else ADDRESS,
+        'receiverAssets': {'name': 'Some Exchange', 'tags': ['exchange']},
+        'receiverShard': rng.randrange(3),
+        'round': 20000000 - i * 10,
+        'sender': ADDRESS if outgoing else other,
+        'senderShard': rng.randrange(3),
+        'signature': '%0128x' % rng.getrandbits(512),
+        'status': 'success',
+        'value': str(rng.randrange(10 ** 15, 10 ** 22)),
+        'fee': '50000000000000',
+        'timestamp': 1700000000 - i * 60,
+        'data': base64.b64encode(f'deposit@{i:08x}'.encode()).decode(),
+        'function': 'transfer',
+        'action': {'category': 'esdtNft', 'name': 'transfer', 'description': f'Transfer {i}'},
+        'operations': [{
+            'id': tx_hash, 'action': 'transfer', 'type': 'egld',
+            'sender': ADDRESS, 'receiver': other, 'value': '1000000000000000000'
+        }],
+        'logs': {
+            'address': ADDRESS,
+            'events': [{
+                'identifier': 'completedTxEvent', 'address': other,
+                'topics': [base64.b64encode(tx_hash.encode()).decode()], 'order': 0
+            }]
+        },
+    }
+
+
+def _serve(count):
+    rng = random.Random(1)
+    transactions = [_transaction(i, rng) for i in range(count)]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            if url.path.endswith('/transactions'):
+                body = transactions[:int(query.get('size', [count])[0])]
+                if 'fields' in query:
+                    fields = query['fields'][0].split(',')
+                    body = [{name: tx[name] for name in fields if name in tx} for tx in body]
+            else:
+                body = {'address': ADDRESS, 'balance': '123456789000000000000000', 'nonce': 1}
+            payload = gzip.compress(json.dumps(body).encode(), compresslevel=6)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--live', metavar='ADDRESS', help='measure against the real API for this address')
+    args = parser.parse_args()
+
+    base_url = ''
+    address = args.live or ADDRESS
+    if not args.live:
+        server = _serve(WALLET_HISTORY_SIZE)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = {}
+    for variant in ('full', 'current'):
+        code = _CHILD.format(root=ROOT, base_url=base_url, address=address, variant=variant)
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        results[variant] = json.loads(output.stdout.strip().splitlines()[-1])
+
+    print(f"{'':8} {'transactions':>12} {'wire KiB':>9} {'time ms':>8} {'RSS growth MiB':>15}")
+    for variant, result in results.items():
+        print(f"{variant:8} {result['count']:>12} {result['bytes'] / 1024:>9.0f} "
+              f"{result['seconds'] * 1000:>8.0f} {result['rss_growth_kib'] / 1024:>15.1f}")
+    full, current = results['full'], results['current']
+    print(f"reduction: bytes {full['bytes'] / max(current['bytes'], 1):.1f}x, "
+          f"time {full['seconds'] / current['seconds']:.1f}x, "
+          f"RSS growth {full['rss_growth_kib'] / max(current['rss_growth_kib'], 1):.1f}x"
+          f" (ijson {'on' if current['ijson'] else 'not installed'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import csv
+import logging
+import os
+import threading
+
+import numpy as np
+
+from services.transfers import address_key
+
+# Exchange wallets whose full history is collected
+WALLETS = {
+    'binance': 'erd1sdslvlxvfnnflzj42l8czrcngq3xjjzkjp3rgul4ttk6hntr4qdsv6sets',
+    'binance_cold': 'erd1v4ms58e22zjcp08suzqgm9ajmumwxcy4hfkdc23gvynnegjdflmsj6gmaq',
+    'upbit': 'erd1hqamcl7hacu28q0l2kh7jt0vs6tjfhq4vp2tv7hufkx3phu0jn5ql3qw7x',
+    'bybit': 'erd1vj3efd5czwearu0gr3vjct8ef53lvtl7vs42vts2kh2qn3cucrnsj7ymqx',
+    'gateio': 'erd1p4vy5n9mlkdys7xczegj398xtyvw2nawz00nnfh4yr7fpjh297cqtsu7lw',
+    'bitfinex': 'erd1a56dkgcpwwx6grmcvw9w5vpf9zeq53w3w7n6dmxcpxjry3l7uh2s3h9dtr',
+    'cryptocom': 'erd1hzccjg25yqaqnr732x2ka7pj5glx72pfqzf05jj9hxqn3lxkramq5zu8h4',
+    'kraken': 'erd1nmtkpqzhkla5yreu2dlyzm9fm8v902wjhvzu7xjjkd8ppefmtlws7qvx2a',
+    'bitget': 'erd1w547kw69kpd60vlpr9pe0pn9nnqeljrcaz73znenjpgt0h3qlqqqm3szxj',
+    'mexc': 'erd1ezp86jwmcp4fmmu2mfqz0438py392z5wp6kzuqsjldgd68nwt89qshfs0y',
+    'coinbase': 'erd16jruked88jgtsar78ej85hjp3qsd9jkjcw4swsn7k0teqh3wgcqqgyrupq',
+    'coinbase_cold': 'erd16xta8867juxzm0sqmfevpa5karkd3l5k9cspns6zj28auv7nugqqpph374',
+    'kucoin': 'erd1ty4pvmjtl3mnsjvnsxgcpedd08fsn83f05tu0v5j23wnfce9p86snlkdyy',
+    'kucoin_cold': 'erd1vtlpm6sxxvmgt43ldsrpswjrfcsudmradylpxn9jkp66ra3rkz4qruzvfw'
+}
+
+# Exchange each collected wallet belongs to; hot and cold wallets share one
+EXCHANGE_NAMES = {
+    'binance': 'Binance',
+    'upbit': 'Upbit',
+    'bybit': 'ByBit',
+    'gateio': 'Gate.io',
+    'bitfinex': 'Bitfinex',
+    'cryptocom': 'Crypto.com',
+    'kraken': 'Kraken',
+    'bitget': 'Bitget',
+    'mexc': 'MEXC',
+    'coinbase': 'Coinbase',
+    'kucoin': 'KuCoin'
+}
+
+# Optional CSV of further labeled addresses, with an "address,exchange" header
+LABELS_FILE = os.getenv('ADDRESS_LABELS_FILE', os.path.join('data', 'address_labels.csv'))
+
+
+def wallet_exchange(name):
+    """Exchange label of a collected wallet ('binance_cold' -> 'Binance')"""
+    base = name[:-len('_cold')] if name.endswith('_cold') else name
+    return EXCHANGE_NAMES.get(base, base)
+
+
+class AddressBook:
+    """Hash index from address to exchange.
+
+    Addresses are indexed by address_key(), the same 64-bit key stored in
+    TransferSeries.counterparties. Besides the dict for single lookups, the
+    keys are kept as a sorted array so a whole counterparty column is
+    classified with one vectorized searchsorted, O(n log labels), however
+    many thousands of addresses are labeled.
+    """
+
+    def __init__(self):
+        self.exchanges = []
+        self._codes = {}
+        self._index = {}
+        self._sorted_keys = None
+        self._sorted_codes = None
+
+    def add(self, address, exchange):
+        code = self._codes.get(exchange)
+        if code is None:
+            code = self._codes[exchange] = len(self.exchanges)
+            self.exchanges.append(exchange)
+        self._index[address_key(address)] = code
+        self._sorted_keys = None
+
+    def load_csv(self, path):
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('address') and row.get('exchange'):
+                    self.add(row['address'].strip(), row['exchange'].strip())
+
+    def exchange_code(self, address):
+        """Code of the address's exchange, or -1 if it is not labeled"""
+        return self._index.get(address_key(address), -1)
+
+    def classify(self, keys):
+        """Exchange code for each address key in the array, -1 where unlabeled"""
+        if self._sorted_keys is None:
+            items = sorted(self._index.items())
+            self._sorted_keys = np.array([key for key, _ in items], dtype=np.int64)
+            self._sorted_codes = np.array([code for _, code in items], dtype=np.int32)
+        keys = np.asarray(keys, dtype=np.int64)
+        if not len(self._sorted_keys):
+            return np.full(len(keys), -1, dtype=np.int32)
+        positions = np.minimum(np.searchsorted(self._sorted_keys, keys), len(self._sorted_keys) - 1)
+        return np.where(self._sorted_keys[positions] == keys, self._sorted_codes[positions], -1)
+
+
+_address_book = None
+_address_book_lock = threading.Lock()
+
+
+def get_address_book():
+    """Return the process-wide book: the collected wallets plus LABELS_FILE"""
+    global _address_book
+    with _address_book_lock:
+        if _address_book is None:
+            book = AddressBook()
+            for name, address in WALLETS.items():
+                book.add(address, wallet_exchange(name))
+            if os.path.exists(LABELS_FILE):
+                try:
+                    book.load_csv(LABELS_FILE)
+                except (OSError, csv.Error) as e:
+                    logging.error(f"Could not load address labels from {LABELS_FILE}: {e}")
+            _address_book = book
+        return _address_book
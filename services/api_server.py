@@ -0,0 +1,199 @@
+import logging
+import os
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from services import snapshot
+from services.broadcaster import tps_channel
+from services.tx_feed import transactions_channel
+from utils import metrics
+
+API_HOST = os.getenv('API_HOST', '0.0.0.0')
+API_PORT = int(os.getenv('API_PORT', '8502'))
+# Base URL browsers use to reach this server when it sits behind a proxy
+API_PUBLIC_URL = os.getenv('API_PUBLIC_URL', '')
+
+SSE_HEARTBEAT_SECONDS = 15
+# A client that cannot accept a write within this window is disconnected
+SSE_WRITE_TIMEOUT_SECONDS = 10
+
+_routes = {}
+# Routes that stream an open-ended body; HEAD gets their headers only
+_stream_routes = set()
+_server = None
+# Why the server could not start, kept so later reruns neither retry nor log again
+_server_error = None
+_server_lock = threading.Lock()
+
+
+def route(path, stream=False):
+    """Register a GET handler. Handlers receive the request handler instance."""
+    def decorator(func):
+        _routes[path] = func
+        if stream:
+            _stream_routes.add(path)
+        return func
+    return decorator
+
+
+def send_response(request, status, body=b'', content_type='text/plain; charset=utf-8', headers=None):
+    """Write a complete response on the given request handler"""
+    request.send_response(status)
+    request.send_header('Content-Type', content_type)
+    request.send_header('Content-Length', str(len(body)))
+    request.send_header('Access-Control-Allow-Origin', '*')
+    for name, value in (headers or {}).items():
+        request.send_header(name, value)
+    request.end_headers()
+    if body and request.command != 'HEAD':
+        request.wfile.write(body)
+
+
+@route('/metrics')
+def metrics_endpoint(request):
+    """Prometheus scrape endpoint"""
+    body = metrics.render_prometheus().encode('utf-8')
+    send_response(request, 200, body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _send_snapshot(request, section):
+    """Serve a snapshot section as JSON with ETag / If-None-Match support"""
+    encoded = snapshot.STORE.get(section)
+    if encoded is None:
+        send_response(request, 404, b'{}', content_type='application/json')
+        return
+
+    body, etag = encoded
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'no-cache',
+        'Access-Control-Expose-Headers': 'ETag'
+    }
+    if_none_match = request.headers.get('If-None-Match', '')
+    if if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(',')):
+        send_response(request, 304, headers=headers, content_type='application/json')
+        return
+
+    send_response(request, 200, body, content_type='application/json', headers=headers)
+
+
+@route('/snapshot')
+def snapshot_endpoint(request):
+    """Full dashboard snapshot: TPS, network, staking, market and wallet summaries"""
+    _send_snapshot(request, None)
+
+
+@route('/network_stats')
+def network_stats_endpoint(request):
+    _send_snapshot(request, 'network_stats')
+
+
+@route('/tps')
+def tps_endpoint(request):
+    """Latest TPS sample, written only by the TPS sampler"""
+    _send_snapshot(request, 'tps')
+
+
+def send_stream_headers(request):
+    """Status and headers of a Server-Sent Events response"""
+    request.close_connection = True
+    request.send_response(200)
+    request.send_header('Content-Type', 'text/event-stream')
+    request.send_header('Cache-Control', 'no-cache')
+    request.send_header('Access-Control-Allow-Origin', '*')
+    request.send_header('X-Accel-Buffering', 'no')
+    request.end_headers()
+
+
+def stream_events(request, channel):
+    """Relay a broadcaster channel to one client as Server-Sent Events"""
+    request.connection.settimeout(SSE_WRITE_TIMEOUT_SECONDS)
+    send_stream_headers(request)
+
+    subscription = channel.subscribe()
+    try:
+        request.wfile.write(b'retry: 3000\n\n')
+        request.wfile.flush()
+        while True:
+            try:
+                payload = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                chunk = f"data: {payload}\n\n"
+            except queue.Empty:
+                chunk = ": heartbeat\n\n"
+            request.wfile.write(chunk.encode('utf-8'))
+            request.wfile.flush()
+    except OSError:
+        pass
+    finally:
+        channel.unsubscribe(subscription)
+
+
+@route('/tps/stream', stream=True)
+def tps_stream_endpoint(request):
+    """Push each TPS sample, with per-shard transaction counts"""
+    stream_events(request, tps_channel)
+
+
+@route('/transactions/stream', stream=True)
+def transactions_stream_endpoint(request):
+    """Push new transactions as deltas, after a resync with the current feed.
+
+    A client that falls behind gets another resync in place of the deltas
+    it missed; clients de-duplicate by hash.
+    """
+    stream_events(request, transactions_channel)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        handler = _routes.get(urlsplit(self.path).path)
+        if handler is None:
+            send_response(self, 404, b'Not Found')
+            return
+        try:
+            handler(self)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            logging.error(f"Error serving {self.path}: {e}")
+            send_response(self, 500, b'Internal Server Error')
+
+    def do_HEAD(self):
+        """Status and headers only; a stream route must not start streaming"""
+        if urlsplit(self.path).path in _stream_routes:
+            send_stream_headers(self)
+            return
+        # send_response leaves out the body of HEAD requests
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        """Silence the default per-request stderr logging"""
+        pass
+
+
+def start_api_server(host=API_HOST, port=API_PORT):
+    """Start the side-car HTTP server once per process.
+
+    Success and failure are both recorded once: after a failed bind (the
+    port is usually held by another process) later calls return None
+    without retrying.
+    """
+    global _server, _server_error
+    with _server_lock:
+        if _server is not None or _server_error is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            _server_error = e
+            logging.warning(f"API server not started on {host}:{port}: {e}")
+            return None
+        _server.daemon_threads = True
+        thread = threading.Thread(target=_server.serve_forever, name='api-server', daemon=True)
+        thread.start()
+        logging.info(f"API server listening on {host}:{port}")
+        return _server
@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from services.transfers import TransferSeries
+
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join('data', 'archive'))
+
+SCHEMA = pa.schema([
+    ('timestamp', pa.int64()),
+    ('amount', pa.float64()),
+    ('direction', pa.int8()),
+    # address_key() of the other party; null in files written before it was archived
+    ('counterparty', pa.int64()),
+])
+PARTITIONING = ds.partitioning(pa.schema([('month', pa.string())]), flavor='hive')
+# Passing the full schema lets older files without a column be read alongside new ones
+DATASET_SCHEMA = SCHEMA.append(pa.field('month', pa.string()))
+
+ROW_GROUP_SIZE = 64 * 1024
+# Months with more part files than this are merged into one file
+MAX_PARTS_PER_MONTH = 32
+
+
+def _month(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m')
+
+
+class TransferArchive:
+    """Append-only Parquet archive of exchange wallet transfers.
+
+    Layout: <root>/<wallet>/month=YYYY-MM/part-<first>-<last>.parquet plus a
+    _high_water.json per wallet recording the newest archived transfer.
+    Each refresh appends only transfers past the high-water mark, so the
+    archive grows beyond the 30 days the dashboard keeps in memory.
+    Reads go through a memory-mapped dataset: only the requested columns
+    are materialised, and month partitions and row groups outside the
+    time range are pruned.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self._filesystem = fs.LocalFileSystem(use_mmap=True)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, wallet):
+        with self._locks_lock:
+            return self._locks.setdefault(wallet, threading.Lock())
+
+    def _wallet_dir(self, wallet):
+        return os.path.join(self.root, wallet)
+
+    def _high_water_path(self, wallet):
+        return os.path.join(self._wallet_dir(wallet), '_high_water.json')
+
+    def _read_high_water(self, wallet):
+        try:
+            with open(self._high_water_path(wallet)) as f:
+                mark = json.load(f)
+            return mark['timestamp'], mark['count']
+        except FileNotFoundError:
+            return None, 0
+
+    def _write_high_water(self, wallet, timestamp, count):
+        path = self._high_water_path(wallet)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'timestamp': timestamp, 'count': count}, f)
+        os.replace(tmp_path, path)
+
+    def append(self, wallet, series):
+        """Archive the transfers in `series` newer than what is already stored"""
+        with self._lock(wallet):
+            last, count_at_last = self._read_high_water(wallet)
+            start = 0
+            if last is not None:
+                start = min(series.index_of(last) + count_at_last, series.index_of(last + 1))
+            new = series.timestamps[start:]
+            if not len(new):
+                return 0
+
+            table = pa.table({
+                'timestamp': series.timestamps[start:],
+                'amount': series.amounts[start:],
+                'direction': series.directions[start:],
+                'counterparty': series.counterparties[start:],
+            }, schema=SCHEMA)
+
+            months = new.astype('datetime64[s]').astype('datetime64[M]').astype(str)
+            for month in np.unique(months):
+                rows = table.filter(pa.array(months == month))
+                month_dir = os.path.join(self._wallet_dir(wallet), f'month={month}')
+                os.makedirs(month_dir, exist_ok=True)
+                first, newest = rows['timestamp'][0].as_py(), rows['timestamp'][-1].as_py()
+                path = os.path.join(month_dir, f'part-{first}-{newest}-{time.time_ns()}.parquet')
+                pq.write_table(rows, path, row_group_size=ROW_GROUP_SIZE, compression='zstd')
+                self._compact_month(month_dir)
+
+            newest = int(new[-1])
+            ties = int(np.count_nonzero(new == newest))
+            if newest == last:
+                ties += count_at_last
+            self._write_high_water(wallet, newest, ties)
+            return len(new)
+
+    def _compact_month(self, month_dir):
+        """Merge a month's part files once there are too many of them"""
+        parts = sorted(name for name in os.listdir(month_dir) if name.startswith('part-'))
+        if len(parts) <= MAX_PARTS_PER_MONTH:
+            return
+        paths = [os.path.join(month_dir, name) for name in parts]
+        merged = pa.concat_tables(pq.read_table(path, schema=SCHEMA) for path in paths)
+        merged = merged.sort_by('timestamp')
+        first, newest = merged['timestamp'][0].as_py(), merged['timestamp'][-1].as_py()
+        target = os.path.join(month_dir, f'part-{first}-{newest}-{time.time_ns()}.parquet')
+        pq.write_table(merged, target, row_group_size=ROW_GROUP_SIZE, compression='zstd')
+        for path in paths:
+            os.remove(path)
+
+    def read(self, wallet, start=None, end=None, columns=('timestamp', 'amount', 'direction')):
+        """Return a pyarrow Table of transfers with start <= timestamp < end"""
+        wallet_dir = self._wallet_dir(wallet)
+        if not os.path.isdir(wallet_dir):
+            return SCHEMA.empty_table().select(list(columns))
+
+        dataset = ds.dataset(
+            wallet_dir,
+            format='parquet',
+            filesystem=self._filesystem,
+            partitioning=PARTITIONING,
+            schema=DATASET_SCHEMA
+        )
+        condition = None
+        if start is not None:
+            condition = (ds.field('month') >= _month(start)) & (ds.field('timestamp') >= start)
+        if end is not None:
+            upper = (ds.field('month') <= _month(end)) & (ds.field('timestamp') < end)
+            condition = upper if condition is None else condition & upper
+        try:
+            table = dataset.to_table(columns=list(columns), filter=condition)
+        except pa.ArrowInvalid as e:
+            logging.error(f"Error reading archive for {wallet}: {e}")
+            return SCHEMA.empty_table().select(list(columns))
+        # Fragments are scanned in parallel, so restore time order when it is selected
+        return table.sort_by('timestamp') if 'timestamp' in columns else table
+
+    def read_series(self, wallet, start=None, end=None):
+        """Load a time range as a TransferSeries for window and daily queries"""
+        table = self.read(wallet, start, end, columns=('timestamp', 'amount', 'direction', 'counterparty'))
+        return TransferSeries(
+            table['timestamp'].to_numpy(),
+            table['amount'].to_numpy(),
+            table['direction'].to_numpy(),
+            table['counterparty'].fill_null(0).to_numpy()
+        )
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Return the process-wide archive rooted at ARCHIVE_DIR"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = TransferArchive()
+        return _archive
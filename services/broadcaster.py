@@ -0,0 +1,103 @@
+import json
+import queue
+import threading
+
+from utils import metrics
+
+dropped_messages_total = metrics.REGISTRY.counter(
+    'mvx_push_dropped_messages_total',
+    'Push messages dropped because a subscriber fell behind',
+    ('channel',)
+)
+subscribers_total = metrics.REGISTRY.counter(
+    'mvx_push_subscriptions_total',
+    'Push channel subscriptions opened',
+    ('channel',)
+)
+
+
+class Broadcaster:
+    """Fan-out of one message stream to many subscribers.
+
+    Each message is encoded once. Every subscriber owns a small bounded
+    queue; when a slow consumer's queue is full the oldest message is
+    dropped, so it always catches up to the newest value instead of
+    stalling the publisher or the other subscribers.
+
+    That suits channels whose messages each carry the whole value. A
+    channel of deltas passes `state`, a callable returning a message
+    with the full current state: new subscribers are primed with it, and
+    a subscriber that falls behind has its queue replaced by it, so no
+    delta is lost silently.
+    """
+
+    def __init__(self, name, queue_size=4, state=None):
+        self.name = name
+        self.queue_size = queue_size
+        self.state = state
+        self._subscribers = set()
+        self._last = None
+        self._lock = threading.Lock()
+
+    def _encode(self, message):
+        return json.dumps(message, separators=(',', ':'))
+
+    def subscribe(self):
+        """Return a queue primed with the current state, or the latest message"""
+        subscription = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            primer = self._encode(self.state()) if self.state is not None else self._last
+            if primer is not None:
+                subscription.put_nowait(primer)
+            self._subscribers.add(subscription)
+        subscribers_total.inc(channel=self.name)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, message):
+        """Encode once and hand the payload to every subscriber"""
+        payload = self._encode(message)
+        with self._lock:
+            self._last = payload
+            subscriptions = list(self._subscribers)
+
+        resync = None
+        for subscription in subscriptions:
+            while True:
+                try:
+                    subscription.put_nowait(payload)
+                    break
+                except queue.Full:
+                    if self.state is None:
+                        try:
+                            subscription.get_nowait()
+                            dropped_messages_total.inc(channel=self.name)
+                        except queue.Empty:
+                            pass
+                        continue
+                    # The state already includes this message
+                    if resync is None:
+                        resync = self._encode(self.state())
+                    dropped_messages_total.inc(self._drain(subscription), channel=self.name)
+                    subscription.put_nowait(resync)
+                    break
+
+    def _drain(self, subscription):
+        dropped = 0
+        while True:
+            try:
+                subscription.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                return dropped
+
+
+tps_channel = Broadcaster('tps')
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import requests
+
+from utils import metrics
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+circuit_opened_total = metrics.REGISTRY.counter(
+    'mvx_circuit_opened_total',
+    'Times an endpoint circuit breaker tripped open',
+    ('endpoint',)
+)
+circuit_rejected_total = metrics.REGISTRY.counter(
+    'mvx_circuit_rejected_total',
+    'Calls short-circuited by an open breaker',
+    ('endpoint',)
+)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe.
+
+    While open, calls fail immediately. Once the reset timeout elapses a
+    single probe is let through; success closes the breaker, failure
+    re-opens it with a doubled timeout (capped at max_reset_timeout).
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=15, max_reset_timeout=300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may proceed now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+        circuit_rejected_total.inc(endpoint=self.name)
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+            self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._trip()
+            elif self.state == CLOSED and self._failures >= self.failure_threshold:
+                self._trip()
+
+    def _trip(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        circuit_opened_total.inc(endpoint=self.name)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(host, endpoint):
+    """Return the shared breaker for one endpoint of one host"""
+    key = f"{host}{endpoint}"
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(key)
+        return breaker
+
+
+def breaker_states():
+    """Return {endpoint: state} for diagnostics"""
+    with _breakers_lock:
+        return {key: breaker.state for key, breaker in _breakers.items()}
@@ -1,10 +1,12 @@
-import requests
 import os
+import threading
 from datetime import datetime, timedelta
 import random  # For generating sample data
 from dotenv import load_dotenv
 import logging
 
+from services import http_client
+
 # At the start of the file
 load_dotenv()  # This will load environment variables from .env file
 
@@ -14,28 +16,25 @@ class CoinMarketCapService:
         self.base_url = "https://pro-api.coinmarketcap.com/v1"
         self.egld_id = "6892"  # MultiversX ID on CMC
         
-        # Load and verify API key
+        # A missing key must not break the page: market calls fail and the
+        # caller shows its default instead
         self.api_key = os.getenv('COINMARKETCAP_API_KEY')
-        print(f"API Key loaded: {'Yes' if self.api_key else 'No'}")  # Debug print
-        
         if not self.api_key:
-            logging.error("CoinMarketCap API key not found. Please set COINMARKETCAP_API_KEY environment variable.")
-            raise ValueError("COINMARKETCAP_API_KEY environment variable is required")
+            logging.warning("CoinMarketCap API key not found. Set COINMARKETCAP_API_KEY to enable market data.")
 
-        # Set up headers with API key
         self.headers = {
-            'X-CMC_PRO_API_KEY': self.api_key,
+            'X-CMC_PRO_API_KEY': self.api_key or '',
             'Accept': 'application/json'
         }
-        
-        # Verify headers
-        print(f"Headers configured: {self.headers}")  # Debug print
 
     def get_market_data(self):
         """Fetch current market data for EGLD"""
+        if not self.api_key:
+            raise ValueError("COINMARKETCAP_API_KEY environment variable is required")
         try:
-            response = requests.get(
+            response = http_client.get(
                 f"{self.base_url}/cryptocurrency/quotes/latest",
+                endpoint='/cryptocurrency/quotes/latest',
                 params={'id': self.egld_id},
                 headers=self.headers
             )
@@ -57,14 +56,15 @@ class CoinMarketCapService:
             }
         except Exception as e:
             print(f"Error making API request: {str(e)}")
-            return self._get_default_market_data()
+            raise
 
     def get_historical_data(self, days=30):
         """Fetch historical price data using available endpoints"""
         try:
             # Use quotes/latest endpoint which is available in basic plan
-            response = requests.get(
+            response = http_client.get(
                 f"{self.base_url}/cryptocurrency/quotes/latest",
+                endpoint='/cryptocurrency/quotes/latest',
                 params={
                     'id': self.egld_id,
                     'convert': 'USD'
@@ -121,8 +121,9 @@ class CoinMarketCapService:
         """Fetch exchange volume data for EGLD."""
         try:
             # Try to get data from quotes endpoint instead
-            response = requests.get(
+            response = http_client.get(
                 f"{self.base_url}/cryptocurrency/quotes/latest",
+                endpoint='/cryptocurrency/quotes/latest',
                 params={
                     'id': self.egld_id,
                     'convert': 'USD'
@@ -180,14 +181,14 @@ class CoinMarketCapService:
             logging.error(f"Error fetching exchange volumes: {str(e)}")
             return []
 
-    def _get_default_market_data(self):
-        """Return sample market data for development"""
+    def default_market_data(self):
+        """Placeholder shown until the first successful quote; all zeros so the page warns"""
         return {
-            'price': 23.65,  # Updated EGLD price
-            'volume_24h': 15000000,
-            'market_cap': 900000000,
-            'percent_change_24h': 2.5,
-            'circulating_supply': 25000000
+            'price': 0,
+            'volume_24h': 0,
+            'market_cap': 0,
+            'percent_change_24h': 0,
+            'circulating_supply': 0
         }
 
     def _get_sample_historical_data(self):
@@ -234,4 +235,17 @@ class CoinMarketCapService:
                 'quote': {'USD': {'volume_24h': volume}}
             })
 
-        return data
\ No newline at end of file
+        return data
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_coinmarketcap_service():
+    """Return the process-wide service, built on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CoinMarketCapService()
+        return _service
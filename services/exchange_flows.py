@@ -0,0 +1,146 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from services.address_book import WALLETS, get_address_book
+from services.transfers import OUTGOING, address_key
+
+DAY = 86400
+
+
+class ExchangeFlowMatrix:
+    """Exchange-to-exchange net flows per day across the collected wallets.
+
+    Ingestion only keeps a reference to each wallet's latest series, so it
+    costs nothing on the refresh path. The matrix is built on the first
+    read after a change, in one vectorized pass per wallet: the address
+    book classifies every counterparty key, and transfers to another
+    exchange are bucketed by (UTC day, from, to) with one bincount.
+
+    A transfer between two collected wallets appears in both histories.
+    It is counted once, from the sender's side; the receiver only counts
+    incoming transfers from addresses that are not collected themselves.
+    Moves between wallets of the same exchange are left out.
+    """
+
+    def __init__(self, address_book=None):
+        self.address_book = address_book
+        self._series = {}
+        self._version = 0
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def update(self, key, series):
+        """Record the latest TransferSeries for a wallet key ('binance_wallet')"""
+        with self._lock:
+            self._series[key] = series
+            self._version += 1
+
+    def _gross(self, days, now):
+        """Sparse gross flows: (day index, from code, to code, amount) arrays"""
+        book = self.address_book or get_address_book()
+        first_day = int(now // DAY) - days + 1
+        with self._lock:
+            wallets = list(self._series.items())
+        collected = np.array(
+            sorted(address_key(WALLETS[key[:-len('_wallet')]]) for key, _ in wallets
+                   if key[:-len('_wallet')] in WALLETS),
+            dtype=np.int64
+        )
+
+        parts = []
+        for key, series in wallets:
+            address = WALLETS.get(key[:-len('_wallet')])
+            if address is None:
+                continue
+            owner = book.exchange_code(address)
+            recent = series.since(first_day * DAY)
+            codes = book.classify(recent.counterparties)
+            outgoing = recent.directions == OUTGOING
+            counted = (codes >= 0) & (codes != owner) & (outgoing | ~np.isin(recent.counterparties, collected))
+            if not counted.any():
+                continue
+            parts.append((
+                recent.timestamps[counted] // DAY - first_day,
+                np.where(outgoing, owner, codes)[counted],
+                np.where(outgoing, codes, owner)[counted],
+                recent.amounts[counted]
+            ))
+
+        exchanges = list(book.exchanges)
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return exchanges, first_day, empty, empty, empty, np.empty(0)
+
+        day, src, dst, amount = (np.concatenate(column) for column in zip(*parts))
+        size = len(exchanges)
+        cells, inverse = np.unique((day * size + src) * size + dst, return_inverse=True)
+        totals = np.bincount(inverse, weights=amount)
+        day, rest = np.divmod(cells, size * size)
+        src, dst = np.divmod(rest, size)
+        return exchanges, first_day, day, src, dst, totals
+
+    def daily_net(self, days=30, now=None):
+        """Net flow rows {'date', 'from', 'to', 'amount'} with amount > 0, oldest first"""
+        now = time.time() if now is None else now
+        cache_key = (self._version, days, int(now // DAY))
+        cached = self._cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        exchanges, first_day, day, src, dst, totals = self._gross(days, now)
+        # Fold each pair onto (low code, high code) so opposite directions cancel
+        size = len(exchanges)
+        low, high = np.minimum(src, dst), np.maximum(src, dst)
+        signed = np.where(src < dst, totals, -totals)
+        cells, inverse = np.unique((day * size + low) * size + high, return_inverse=True)
+        net = np.bincount(inverse, weights=signed, minlength=len(cells))
+        day, rest = np.divmod(cells, size * size)
+        low, high = np.divmod(rest, size)
+
+        dates = [
+            datetime.fromtimestamp((first_day + d) * DAY, tz=timezone.utc).strftime('%Y-%m-%d')
+            for d in range(days)
+        ]
+        rows = []
+        for d, s, t, amount in zip(day.tolist(), low.tolist(), high.tolist(), net.tolist()):
+            if amount == 0:
+                continue
+            if amount < 0:
+                s, t, amount = t, s, -amount
+            rows.append({'date': dates[d], 'from': exchanges[s], 'to': exchanges[t], 'amount': amount})
+        self._cache = (cache_key, rows)
+        return rows
+
+    def net_matrix(self, days=30, now=None):
+        """(exchanges, matrix) of net flow over the window; matrix[i][j] > 0 means i sent to j.
+
+        Only exchanges with inter-exchange flows are included.
+        """
+        totals = {}
+        for row in self.daily_net(days, now):
+            totals[(row['from'], row['to'])] = totals.get((row['from'], row['to']), 0.0) + row['amount']
+        exchanges = sorted({name for pair in totals for name in pair})
+        index = {name: i for i, name in enumerate(exchanges)}
+        matrix = np.zeros((len(exchanges), len(exchanges)))
+        for (source, target), amount in totals.items():
+            matrix[index[source], index[target]] += amount
+            matrix[index[target], index[source]] -= amount
+        return exchanges, matrix
+
+
+MATRIX = ExchangeFlowMatrix()
+
+
+def update(key, series):
+    MATRIX.update(key, series)
+
+
+def daily_net(days=30, now=None):
+    return MATRIX.daily_net(days, now)
+
+
+def net_matrix(days=30, now=None):
+    return MATRIX.net_matrix(days, now)
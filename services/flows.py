@@ -0,0 +1,180 @@
+import threading
+import time
+
+from services import exchange_flows, large_transfers
+from services.transfers import TransferSeries, INCOMING
+
+DAY = 86400
+
+# Window name -> length in seconds. 48h only exists to derive "previous 24h".
+WINDOWS = {
+    '24h': DAY,
+    '48h': 2 * DAY,
+    '7d': 7 * DAY,
+    '30d': 30 * DAY,
+}
+
+
+class RollingFlows:
+    """Sliding-window inflow/outflow sums for one wallet.
+
+    Transfers are kept in timestamp order for the longest window only.
+    Each window holds a start pointer and running sums: a new transfer is
+    added to every sum, and advance() moves each pointer past transfers
+    that fell out of its window, subtracting them. Both are amortised O(1)
+    per transfer, and reading a summary never rescans the history.
+    """
+
+    def __init__(self):
+        self._timestamps = []
+        self._values = []
+        self._incoming = []
+        self._start = {name: 0 for name in WINDOWS}
+        self._inflow = {name: 0.0 for name in WINDOWS}
+        self._outflow = {name: 0.0 for name in WINDOWS}
+        self.last_timestamp = None
+        self.count_at_last = 0
+
+    def add(self, timestamp, value, incoming):
+        """Add one transfer (epoch seconds). Out-of-order arrivals trigger a rebuild."""
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            self._insert_out_of_order(timestamp, value, incoming)
+            return
+
+        self._timestamps.append(timestamp)
+        self._values.append(value)
+        self._incoming.append(incoming)
+        sums = self._inflow if incoming else self._outflow
+        for name in WINDOWS:
+            sums[name] += value
+
+        if timestamp == self.last_timestamp:
+            self.count_at_last += 1
+        else:
+            self.last_timestamp = timestamp
+            self.count_at_last = 1
+
+    def _insert_out_of_order(self, timestamp, value, incoming):
+        rows = list(zip(self._timestamps, self._values, self._incoming))
+        rows.append((timestamp, value, incoming))
+        rows.sort(key=lambda row: row[0])
+        self.__init__()
+        for row in rows:
+            self.add(*row)
+
+    def advance(self, now=None):
+        """Expire transfers that left each window"""
+        now = time.time() if now is None else now
+        for name, length in WINDOWS.items():
+            cutoff = now - length
+            index = self._start[name]
+            inflow = self._inflow[name]
+            outflow = self._outflow[name]
+            while index < len(self._timestamps) and self._timestamps[index] < cutoff:
+                if self._incoming[index]:
+                    inflow -= self._values[index]
+                else:
+                    outflow -= self._values[index]
+                index += 1
+            if index == len(self._timestamps):
+                # Reset accumulated float error once a window empties
+                inflow = outflow = 0.0
+            self._start[name] = index
+            self._inflow[name] = inflow
+            self._outflow[name] = outflow
+        self._compact()
+
+    def _compact(self):
+        """Drop transfers older than the longest window once they dominate"""
+        oldest = self._start['30d']
+        if oldest < 1024 or oldest * 2 < len(self._timestamps):
+            return
+        del self._timestamps[:oldest]
+        del self._values[:oldest]
+        del self._incoming[:oldest]
+        for name in WINDOWS:
+            self._start[name] -= oldest
+
+    def summary(self, now=None):
+        """Inflow, outflow and net for 24h, previous 24h, 7d and 30d"""
+        self.advance(now)
+        result = {}
+        for name in ('24h', '7d', '30d'):
+            result[f'inflow_{name}'] = self._inflow[name]
+            result[f'outflow_{name}'] = self._outflow[name]
+            result[f'net_{name}'] = self._inflow[name] - self._outflow[name]
+        result['inflow_prev_24h'] = self._inflow['48h'] - self._inflow['24h']
+        result['outflow_prev_24h'] = self._outflow['48h'] - self._outflow['24h']
+        result['net_prev_24h'] = result['inflow_prev_24h'] - result['outflow_prev_24h']
+        return result
+
+
+class FlowAggregator:
+    """Rolling flows per wallet key, fed from the wallet ingestion path"""
+
+    def __init__(self):
+        self._wallets = {}
+        self._lock = threading.Lock()
+
+    def ingest(self, key, transfers):
+        """Add the transfers not seen yet for this wallet.
+
+        `transfers` is the wallet's TransferSeries (legacy dict lists are
+        converted). The first unseen transfer is found by binary search, so
+        a refresh costs O(log n + new transfers). Returns the new transfers
+        as (timestamp, amount, direction) tuples, oldest first.
+        """
+        series = TransferSeries.from_records(transfers)
+        with self._lock:
+            flows = self._wallets.get(key)
+            if flows is None:
+                flows = self._wallets[key] = RollingFlows()
+
+            start = 0
+            if flows.last_timestamp is not None:
+                # Skip ties at the high-water mark that were already ingested
+                start = min(
+                    series.index_of(flows.last_timestamp) + flows.count_at_last,
+                    series.index_of(flows.last_timestamp + 1)
+                )
+            new = list(zip(
+                series.timestamps[start:].tolist(),
+                series.amounts[start:].tolist(),
+                series.directions[start:].tolist()
+            ))
+            for timestamp, amount, direction in new:
+                flows.add(timestamp, amount, direction == INCOMING)
+        return new
+
+    def summary(self, key, now=None):
+        with self._lock:
+            flows = self._wallets.get(key)
+            if flows is None:
+                return RollingFlows().summary(now)
+            return flows.summary(now)
+
+    def total(self, keys, now=None):
+        """Sum of the wallet summaries for the given keys"""
+        totals = {}
+        for key in keys:
+            for name, value in self.summary(key, now).items():
+                totals[name] = totals.get(name, 0.0) + value
+        return totals
+
+
+AGGREGATOR = FlowAggregator()
+
+
+def ingest(key, transfers):
+    """Update the rolling flows, the exchange flow matrix and the large-transfer detector"""
+    series = TransferSeries.from_records(transfers)
+    large_transfers.observe_many(key, AGGREGATOR.ingest(key, series))
+    exchange_flows.update(key, series)
+
+
+def summary(key, now=None):
+    return AGGREGATOR.summary(key, now)
+
+
+def total(keys, now=None):
+    return AGGREGATOR.total(keys, now)
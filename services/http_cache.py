@@ -0,0 +1,162 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join('data', 'http_cache'))
+# Total size of stored bodies; least recently used entries are evicted beyond it
+MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Response headers kept with a body and replayed on cached responses
+_KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+def cache_key(url, params=None):
+    """Canonical request URL; params are sorted so their order does not matter"""
+    if isinstance(params, dict):
+        params = sorted(params.items())
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+class CacheEntry:
+    def __init__(self, url, headers, body, stored_at, expires_at=0.0):
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+    @property
+    def validators(self):
+        """Conditional request headers for revalidating this entry"""
+        conditional = {}
+        if self.headers.get('ETag'):
+            conditional['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            conditional['If-Modified-Since'] = self.headers['Last-Modified']
+        return conditional
+
+    def to_response(self):
+        """A 200 response carrying the stored body"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        # Read through the public raw stream like a downloaded body
+        response.raw = io.BytesIO(self.body)
+        response.from_cache = True
+        response.streamed = False
+        return response
+
+
+class HTTPCache:
+    """Response bodies on disk, one file per request URL.
+
+    Each file holds a JSON metadata line (URL, kept headers, expiry)
+    followed by the raw body, and is replaced atomically, so several
+    processes can share the directory and entries survive restarts.
+    A file's mtime is its last use: reads touch it, and stores evict
+    the oldest files once the directory is over max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Unreadable HTTP cache entry for {key}: {e}")
+            return None
+        if meta.get('url') != key:
+            return None
+        return CacheEntry(key, meta['headers'], body, meta['stored_at'], meta.get('expires_at', 0.0))
+
+    def put(self, key, response):
+        """Store a 200 response's body; returns the entry"""
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+        return self._store(key, headers, response.content)
+
+    def refresh(self, key, entry, response):
+        """Store an entry again after a 304, with any updated validators and expiry"""
+        headers = dict(entry.headers)
+        headers.update({
+            name: response.headers[name]
+            for name in _KEPT_HEADERS if name in response.headers and name != 'Content-Type'
+        })
+        return self._store(key, headers, entry.body)
+
+    def _store(self, key, headers, body):
+        now = time.time()
+        cache_control = headers.get('Cache-Control', '')
+        max_age = _MAX_AGE.search(cache_control)
+        entry = CacheEntry(key, headers, body, now, now + int(max_age.group(1)) if max_age else 0.0)
+        if 'no-store' in cache_control or len(body) > self.max_bytes:
+            return entry
+
+        path = self._path(key)
+        meta = {'url': key, 'headers': headers, 'stored_at': now, 'expires_at': entry.expires_at}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(meta).encode() + b'\n')
+                f.write(body)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError as e:
+            logging.warning(f"Could not store HTTP cache entry for {key}: {e}")
+        return entry
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            for item in os.scandir(self.directory):
+                if item.is_file() and not item.name.endswith('.tmp'):
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Return the process-wide HTTP cache, built on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache()
+        return _cache
@@ -0,0 +1,134 @@
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    import ijson
+except ImportError:  # optional: without it large responses are parsed whole
+    ijson = None
+
+from services import rate_limit
+from services.circuit_breaker import CircuitOpenError, breaker_for
+from services.http_cache import cache_key, get_http_cache
+from utils import metrics
+
+DEFAULT_TIMEOUT = 15  # seconds
+THROTTLE_STATUSES = (429, 503)
+
+http_cache_total = metrics.REGISTRY.counter(
+    'mvx_http_cache_total',
+    'Cached GETs by outcome: fresh, revalidated (304), changed or miss',
+    ('endpoint', 'result')
+)
+
+
+def get(url, endpoint, cache=False, **kwargs):
+    """Instrumented, rate-limited GET against an upstream API.
+
+    `endpoint` is a low-cardinality label such as '/accounts/{address}' so
+    that per-address URLs aggregate into one metric series. Every call
+    first takes a token from the host's shared budget, and is refused
+    outright while the endpoint's circuit breaker is open.
+
+    With cache=True the body is kept in the on-disk HTTP cache, keyed by
+    URL and params. A stored body is served without a request while its
+    Cache-Control max-age lasts, and is otherwise revalidated with
+    If-None-Match / If-Modified-Since; a 304 is returned to the caller as
+    the cached 200. Meant for slow-moving endpoints read whole, not
+    streamed ones.
+
+    A successful stream=True response is only counted by the breaker once
+    iter_json_array has read its body, so a body that breaks off counts
+    as a failure of the endpoint; such responses must be read with it.
+    """
+    if cache:
+        return _cached_get(url, endpoint, **kwargs)
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    host = urlsplit(url).hostname or ''
+    breaker = breaker_for(host, endpoint)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit open for {host}{endpoint}")
+
+    budget = rate_limit.budget_for(host)
+    budget.acquire()
+
+    status = 'error'
+    start = time.perf_counter()
+    try:
+        response = requests.get(url, **kwargs)
+        status = str(response.status_code)
+        # Our own marker for iter_json_array: the body is still to be downloaded
+        response.streamed = bool(kwargs.get('stream'))
+    except requests.exceptions.RequestException:
+        breaker.record_failure()
+        raise
+    finally:
+        metrics.observe_request(host, endpoint, status, time.perf_counter() - start)
+
+    if response.status_code in THROTTLE_STATUSES:
+        budget.penalize(rate_limit.parse_retry_after(response.headers.get('Retry-After')))
+    else:
+        budget.reward()
+
+    if response.status_code >= 500 or response.status_code == 429:
+        breaker.record_failure()
+    elif response.streamed and response.ok:
+        response.breaker = breaker
+    else:
+        breaker.record_success()
+    return response
+
+
+def _cached_get(url, endpoint, **kwargs):
+    http_cache = get_http_cache()
+    key = cache_key(url, kwargs.get('params'))
+    entry = http_cache.get(key)
+    if entry is not None and entry.fresh:
+        http_cache_total.inc(endpoint=endpoint, result='fresh')
+        return entry.to_response()
+
+    if entry is not None:
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), **entry.validators}
+    response = get(url, endpoint, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        http_cache_total.inc(endpoint=endpoint, result='revalidated')
+        return http_cache.refresh(key, entry, response).to_response()
+    http_cache_total.inc(endpoint=endpoint, result='miss' if entry is None else 'changed')
+    if response.status_code == 200:
+        http_cache.put(key, response)
+    return response
+
+
+def iter_json_array(response):
+    """Yield the elements of a JSON array response one at a time.
+
+    With ijson installed and a response requested with stream=True, the
+    body is parsed incrementally as it downloads, so memory holds one
+    element at a time instead of the whole document. Otherwise this falls
+    back to response.json().
+
+    For a streamed response from get(), the endpoint's breaker records a
+    success once the body has been read, or a failure if reading or
+    parsing it raises (a reset connection, truncated JSON).
+    """
+    breaker = getattr(response, 'breaker', None)
+    try:
+        if ijson is None or not getattr(response, 'streamed', False):
+            yield from response.json()
+        else:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, 'item', use_float=True)
+    except GeneratorExit:
+        # The caller stopped early; what was read arrived intact
+        if breaker is not None:
+            breaker.record_success()
+        raise
+    except Exception:
+        if breaker is not None:
+            breaker.record_failure()
+        raise
+    if breaker is not None:
+        breaker.record_success()
+
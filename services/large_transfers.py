@@ -0,0 +1,130 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+
+from services.transfers import INCOMING
+from utils.metrics import REGISTRY
+
+# A transfer is large if it reaches the absolute threshold (EGLD) or
+# MULTIPLE times the median of the wallet's last MEDIAN_WINDOW transfers
+DEFAULT_ABSOLUTE = 50000
+DEFAULT_MULTIPLE = 25
+# Per-wallet (absolute, multiple) overrides, keyed like the cache ('binance_wallet')
+WALLET_THRESHOLDS = {
+    'binance_wallet': (100000, 25),
+    'binance_cold_wallet': (250000, 10),
+    'coinbase_cold_wallet': (250000, 10),
+    'kucoin_cold_wallet': (250000, 10),
+}
+
+MEDIAN_WINDOW = 255
+# The relative rule needs this much history to mean anything
+MIN_HISTORY = 32
+# Transfers older than this when first ingested update the median but are not reported
+MAX_EVENT_AGE = 24 * 3600
+EVENT_LOG_SIZE = 200
+
+large_transfers_total = REGISTRY.counter(
+    'mvx_large_transfers_total',
+    'Large transfers detected by wallet and rule',
+    ('wallet', 'reason')
+)
+
+
+class RollingMedian:
+    """Exact median of the last `size` values.
+
+    The window is kept both in arrival order and sorted; each update is a
+    bounded bisect and list shift, so the cost per value is constant.
+    """
+
+    def __init__(self, size=MEDIAN_WINDOW):
+        self._window = deque(maxlen=size)
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._window)
+
+    def add(self, value):
+        if len(self._window) == self._window.maxlen:
+            del self._sorted[bisect_left(self._sorted, self._window[0])]
+        self._window.append(value)
+        insort(self._sorted, value)
+
+    @property
+    def median(self):
+        count = len(self._sorted)
+        if not count:
+            return 0.0
+        middle = count // 2
+        if count % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
+
+
+class LargeTransferDetector:
+    """Flags large transfers as they are ingested and keeps the latest events.
+
+    Each new transfer is compared with its wallet's thresholds before it
+    is added to that wallet's rolling median, so a whale does not raise
+    the bar for itself.
+    """
+
+    def __init__(self, log_size=EVENT_LOG_SIZE):
+        self._medians = {}
+        self._events = deque(maxlen=log_size)
+        self._lock = threading.Lock()
+
+    def observe(self, key, timestamp, amount, direction, now=None):
+        """Check one transfer; returns the event dict if it was large"""
+        now = time.time() if now is None else now
+        absolute, multiple = WALLET_THRESHOLDS.get(key, (DEFAULT_ABSOLUTE, DEFAULT_MULTIPLE))
+        with self._lock:
+            median = self._medians.get(key)
+            if median is None:
+                median = self._medians[key] = RollingMedian()
+            typical = median.median
+            relative = len(median) >= MIN_HISTORY and typical > 0 and amount >= multiple * typical
+            median.add(amount)
+
+            if now - timestamp > MAX_EVENT_AGE or not (amount >= absolute or relative):
+                return None
+            event = {
+                'wallet': key,
+                'timestamp': timestamp,
+                'amount': amount,
+                'direction': 'incoming' if direction == INCOMING else 'outgoing',
+                'median': typical,
+                'reason': 'absolute' if amount >= absolute else 'relative'
+            }
+            self._events.append(event)
+        large_transfers_total.inc(wallet=key, reason=event['reason'])
+        return event
+
+    def observe_many(self, key, transfers, now=None):
+        """Check (timestamp, amount, direction) tuples, oldest first"""
+        events = []
+        for timestamp, amount, direction in transfers:
+            event = self.observe(key, timestamp, amount, direction, now)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def events(self, limit=50, now=None):
+        """Latest events of the past MAX_EVENT_AGE seconds, newest first"""
+        cutoff = (time.time() if now is None else now) - MAX_EVENT_AGE
+        with self._lock:
+            recent = [event for event in reversed(self._events) if event['timestamp'] >= cutoff]
+        return recent[:limit]
+
+
+DETECTOR = LargeTransferDetector()
+
+
+def observe_many(key, transfers):
+    return DETECTOR.observe_many(key, transfers)
+
+
+def events(limit=50):
+    return DETECTOR.events(limit)
@@ -0,0 +1,81 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+
+from services.storage import get_backend
+from utils.metrics import REGISTRY
+
+# Lease lifetime on SQLite; Postgres advisory locks end with the session instead
+LEASE_TTL = 30
+RENEW_INTERVAL = 10
+# LEADER_ELECTION=0 makes every process collect, as before multi-replica support
+ELECTION_ENABLED = os.getenv('LEADER_ELECTION', '1') != '0'
+
+leader_transitions_total = REGISTRY.counter(
+    'mvx_leader_transitions_total',
+    'Collector leadership changes in this process',
+    ('state',)
+)
+
+
+class LeaderElection:
+    """Keep at most one process running the background collectors.
+
+    A thread tries to take or renew the named lease every RENEW_INTERVAL
+    seconds and calls on_elected / on_demoted when the outcome changes.
+    If the database cannot be reached the process steps down, because it
+    can no longer prove that nobody else has taken over.
+    """
+
+    def __init__(self, name, on_elected, on_demoted):
+        self.name = name
+        self.identity = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _try_acquire(self):
+        if not ELECTION_ENABLED:
+            return True
+        try:
+            return get_backend().acquire_lease(self.name, self.identity, LEASE_TTL)
+        except Exception as e:
+            logging.warning(f"Leader election for {self.name} failed: {e}")
+            return False
+
+    def _set_leader(self, leader):
+        if leader == self.is_leader:
+            return
+        self.is_leader = leader
+        leader_transitions_total.inc(state='leader' if leader else 'follower')
+        logging.info(f"{self.identity} is now {'leader' if leader else 'follower'} for {self.name}")
+        try:
+            (self.on_elected if leader else self.on_demoted)()
+        except Exception as e:
+            logging.error(f"Leadership callback for {self.name} failed: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._set_leader(self._try_acquire())
+            self._stop.wait(RENEW_INTERVAL)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f'leader-{self.name}', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Step down and release the lease so another process can take over"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._set_leader(False)
+        if ELECTION_ENABLED:
+            try:
+                get_backend().release_lease(self.name, self.identity)
+            except Exception as e:
+                logging.warning(f"Could not release lease {self.name}: {e}")
@@ -1,8 +1,19 @@
 import requests
 from datetime import datetime, timedelta
 import logging
-import time
-import streamlit as st
+import threading
+
+from services import http_client, stake_concentration
+from services.transfers import TransferSeries, INCOMING, OUTGOING, address_key
+from utils import denomination
+
+# Transaction fields get_wallet_history reads; everything else is left on the server
+WALLET_TRANSACTION_FIELDS = 'timestamp,value,sender,receiver'
+# Transactions fetched per wallet refresh
+WALLET_HISTORY_SIZE = 9000
+# One projection for every /identities read, so they share a cached response
+IDENTITY_FIELDS = 'identity,stake,locked,providers,distribution'
+PROVIDER_FIELDS = 'provider,identity,locked'
 
 class MultiversXService:
     def __init__(self):
@@ -15,17 +26,18 @@ class MultiversXService:
         """Fetch network statistics from MultiversX API"""
         try:
             # Get network stats
-            stats_response = requests.get(
+            stats_response = http_client.get(
                 f"{self.base_url}/stats",
+                endpoint='/stats',
                 headers=self.headers
             )
             stats_response.raise_for_status()
             stats = stats_response.json()
 
-            # Get TPS from the updater if it exists in session state
-            tps = 0
-            if 'tps_updater' in st.session_state:
-                tps = st.session_state.tps_updater.current_tps
+            # TPS comes from the process-wide sampler; session state is not
+            # available when this runs on a scheduler thread
+            from services.tps_updater import get_tps_updater
+            tps = get_tps_updater().current_tps
 
             return {
                 'transactions': stats.get('transactions', 0),
@@ -38,182 +50,214 @@ class MultiversXService:
             }
         except requests.exceptions.RequestException as e:
             logging.error(f"Error fetching network stats: {str(e)}")
-            return {
-                'transactions': 0,
-                'active_addresses': 0,
-                'tps': 0,
-                'shards': {
-                    'regular': [0, 1, 2],
-                    'meta': 4294967295
-                }
+            raise
+
+    def default_network_stats(self):
+        """Placeholder shown until the first successful network stats fetch"""
+        return {
+            'transactions': 0,
+            'active_addresses': 0,
+            'tps': 0,
+            'shards': {
+                'regular': [0, 1, 2],
+                'meta': 4294967295
             }
+        }
 
     def get_staking_stats(self):
         """Fetch staking and economics statistics from MultiversX API"""
         try:
-            stake_response = requests.get("https://api.multiversx.com/stake")
+            stake_response = http_client.get("https://api.multiversx.com/stake", endpoint='/stake', cache=True)
+            stake_response.raise_for_status()
             stake_data = stake_response.json()
             
-            econ_response = requests.get(f"{self.base_url}/economics")
+            econ_response = http_client.get(f"{self.base_url}/economics", endpoint='/economics', cache=True)
+            econ_response.raise_for_status()
             econ_data = econ_response.json()
             
-            delegation_response = requests.get("https://api.multiversx.com/delegation-legacy")
+            delegation_response = http_client.get(
+                "https://api.multiversx.com/delegation-legacy", endpoint='/delegation-legacy', cache=True
+            )
+            delegation_response.raise_for_status()
             delegation_data = delegation_response.json()
-            
+
+            # Concentration is computed from the stake of every operator and
+            # only recomputed when /identities or /providers changed
+            identities_response = http_client.get(
+                f"{self.base_url}/identities", endpoint='/identities',
+                params={'fields': IDENTITY_FIELDS}, headers=self.headers, cache=True
+            )
+            identities_response.raise_for_status()
+            providers_response = http_client.get(
+                f"{self.base_url}/providers", endpoint='/providers',
+                params={'fields': PROVIDER_FIELDS}, headers=self.headers, cache=True
+            )
+            providers_response.raise_for_status()
+            concentration = stake_concentration.update(identities_response.content, providers_response.content)
+
             return {
                 'total_validators': stake_data.get('totalValidators', 0),
                 'active_validators': stake_data.get('activeValidators', 0),
                 'total_observers': stake_data.get('totalObservers', 0),
-                'nakamoto_coefficient': stake_data.get('nakamotoCoefficient', 9),
+                'nakamoto_coefficient': concentration['nakamoto_33'],
+                'nakamoto_coefficient_66': concentration['nakamoto_66'],
+                'stake_gini': concentration['gini'],
+                'stake_hhi': concentration['hhi'],
+                'stake_entities': concentration['entities'],
                 'eligible_validators': stake_data.get('eligibleValidators', 0),
                 'waiting_validators': stake_data.get('waitingValidators', 0),
                 'total_staked': float(econ_data.get('staked', 0)),
                 'staking_apr': float(econ_data.get('apr', 0)) * 100,
-                'total_active_stake': float(delegation_data.get('totalActiveStake', '0')) / 1e18,
-                'total_waiting_stake': float(delegation_data.get('totalWaitingStake', '0')) / 1e18,
-                'total_unstaked': float(delegation_data.get('totalUnstakedStake', '0')) / 1e18,
-                'total_deferred': float(delegation_data.get('totalDeferredPaymentStake', '0')) / 1e18,
-                'total_withdraw': float(delegation_data.get('totalWithdrawOnlyStake', '0')) / 1e18,
+                'total_active_stake': denomination.to_float(delegation_data.get('totalActiveStake')),
+                'total_waiting_stake': denomination.to_float(delegation_data.get('totalWaitingStake')),
+                'total_unstaked': denomination.to_float(delegation_data.get('totalUnstakedStake')),
+                'total_deferred': denomination.to_float(delegation_data.get('totalDeferredPaymentStake')),
+                'total_withdraw': denomination.to_float(delegation_data.get('totalWithdrawOnlyStake')),
                 'staking_users': int(delegation_data.get('numUsers', 0))
             }
         except Exception as e:
             print(f"Error fetching staking/economics stats: {str(e)}")
-            return {
-                'total_validators': 0,
-                'active_validators': 0,
-                'total_observers': 0,
-                'total_staked': 0,
-                'nakamoto_coefficient': 0,
-                'staking_apr': 0,
-                'total_supply': 0,
-                'circulating_supply': 0,
-                'market_cap': 0,
-                'total_active_stake': 0,
-                'total_waiting_stake': 0,
-                'total_unstaked': 0,
-                'total_deferred': 0,
-                'total_withdraw': 0,
-                'staking_users': 0
-            }
+            raise
 
-    def get_recent_transactions(self):
-        """Fetch recent transactions from MultiversX API"""
-        try:
-            response = requests.get(f"{self.base_url}/transactions?size=10")
-            print(f"Recent transactions response status: {response.status_code}")
-            response.raise_for_status()
-            data = response.json()
+    def default_staking_stats(self):
+        """Placeholder shown until the first successful staking stats fetch"""
+        return {
+            'total_validators': 0,
+            'active_validators': 0,
+            'total_observers': 0,
+            'total_staked': 0,
+            'nakamoto_coefficient': 0,
+            'nakamoto_coefficient_66': 0,
+            'stake_gini': 0.0,
+            'stake_hhi': 0.0,
+            'stake_entities': 0,
+            'eligible_validators': 0,
+            'waiting_validators': 0,
+            'staking_apr': 0,
+            'total_supply': 0,
+            'circulating_supply': 0,
+            'market_cap': 0,
+            'total_active_stake': 0,
+            'total_waiting_stake': 0,
+            'total_unstaked': 0,
+            'total_deferred': 0,
+            'total_withdraw': 0,
+            'staking_users': 0
+        }
+
+    def get_transactions(self, after=None, offset=0, size=50, order='desc'):
+        """Fetch one page of network transactions, projected to the feed's fields.
 
-            transactions = []
-            for tx in data:
-                try:
-                    transactions.append({
-                        'hash': tx.get('txHash', ''),
-                        'from': tx.get('sender', ''),
-                        'to': tx.get('receiver', ''),
-                        'amount': float(tx.get('value', 0)) / 1e18,
-                        'timestamp': datetime.fromtimestamp(
-                            int(tx.get('timestamp', 0))
-                        ).strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                except (ValueError, TypeError) as e:
-                    print(f"Error processing transaction: {str(e)}")
-                    continue
+        Returns (transactions, response size in bytes).
+        """
+        params = {
+            'from': offset,
+            'size': size,
+            'order': order,
+            'fields': 'txHash,sender,receiver,value,timestamp'
+        }
+        if after is not None:
+            params['after'] = after
+        response = http_client.get(
+            f"{self.base_url}/transactions",
+            endpoint='/transactions',
+            params=params,
+            headers=self.headers
+        )
+        response.raise_for_status()
+        return response.json(), len(response.content)
 
-            return transactions
+    def get_recent_transactions(self, size=10):
+        """Newest transactions from the live feed, newest first"""
+        from services.tx_feed import get_transaction_feed
+        feed = get_transaction_feed()
+        try:
+            feed.poll()
         except requests.exceptions.RequestException as e:
             print(f"Error fetching transactions: {str(e)}")
-            return []
+        return feed.latest(size)
 
     def get_wallet_balance(self, address):
         """Get wallet balance and transaction history for the last 30 days."""
+        return self.summarize_wallet(self.get_wallet_history(address))
+
+    def summarize_wallet(self, history, days=30):
+        """Trim a full wallet history to the dashboard window and bucket it by day"""
+        cutoff_date = datetime.now() - timedelta(days=days)
+        transfers = history['transfers'].since(cutoff_date.timestamp())
+        return {
+            'balance': history['balance'],
+            'balance_atomic': history['balance_atomic'],
+            'transfers': transfers,
+            'daily_flows': transfers.daily_flows()
+        }
+
+    def get_wallet_history(self, address):
+        """Get wallet balance and every transfer the API returns, oldest first."""
         try:
             # Get current balance
-            balance_response = requests.get(
+            balance_response = http_client.get(
                 f"{self.base_url}/accounts/{address}",
+                endpoint='/accounts/{address}',
                 headers=self.headers
             )
             balance_response.raise_for_status()
             balance_data = balance_response.json()
             
-            balance = float(balance_data.get('balance', 0)) / 10**18
+            # Keep the exact atomic balance for reconciliation; the float is for display
+            balance_atomic = denomination.to_atomic(balance_data.get('balance'))
 
-            # Get transfers for last 30 days
-            cutoff_date = datetime.now() - timedelta(days=30)
-            
-            # Fetch transfers with order=desc to get most recent first
-            response = requests.get(
-                f"{self.base_url}/accounts/{address}/transactions?size=9000&order=desc",
-                headers=self.headers
+            # Most recent first, projected to the fields used below; the body is
+            # parsed as it streams instead of being loaded whole
+            response = http_client.get(
+                f"{self.base_url}/accounts/{address}/transactions",
+                endpoint='/accounts/{address}/transactions',
+                params={'size': WALLET_HISTORY_SIZE, 'order': 'desc', 'fields': WALLET_TRANSACTION_FIELDS},
+                headers=self.headers,
+                stream=True
             )
-            
-            response.raise_for_status()
-            transactions = response.json()
-            
-            # Process transactions
-            transfers = []
-            for tx in transactions:
-                timestamp = datetime.fromtimestamp(int(tx.get('timestamp', 0)))
-                if timestamp < cutoff_date:
-                    continue
-                    
-                value = float(tx.get('value', 0)) / 10**18
-                transfers.append({
-                    'timestamp': timestamp,
-                    'value': value,
-                    'action': 'outgoing' if tx.get('sender') == address else 'incoming'
-                })
-
-            # Sort transfers by timestamp
-            transfers.sort(key=lambda x: x['timestamp'])
-
-            # Calculate daily flows
-            daily_flows = {}
-            for transfer in transfers:
-                date_key = transfer['timestamp'].strftime('%Y-%m-%d')
-                if date_key not in daily_flows:
-                    daily_flows[date_key] = {
-                        'date': transfer['timestamp'].replace(hour=0, minute=0, second=0, microsecond=0),
-                        'inflow': 0,
-                        'outflow': 0,
-                        'net_flow': 0
-                    }
-                
-                if transfer['action'] == 'incoming':
-                    daily_flows[date_key]['inflow'] += transfer['value']
-                else:
-                    daily_flows[date_key]['outflow'] += transfer['value']
-                
-                daily_flows[date_key]['net_flow'] = (
-                    daily_flows[date_key]['inflow'] - daily_flows[date_key]['outflow']
-                )
+            with response:
+                response.raise_for_status()
+                timestamps, values, directions, counterparties = [], [], [], []
+                for tx in http_client.iter_json_array(response):
+                    sender = tx.get('sender')
+                    outgoing = sender == address
+                    timestamps.append(int(tx.get('timestamp', 0)))
+                    values.append(tx.get('value', '0'))
+                    directions.append(OUTGOING if outgoing else INCOMING)
+                    # The other side, hashed so exchange-to-exchange flows can be classified
+                    counterparties.append(address_key(tx.get('receiver') if outgoing else sender))
 
-            # Convert daily flows to list and sort by date
-            daily_flows_list = sorted(
-                daily_flows.values(),
-                key=lambda x: x['date']
-            )
+            amounts = denomination.to_float_array(values)
 
             return {
-                'balance': balance,
-                'transfers': transfers,
-                'daily_flows': daily_flows_list
+                'balance': denomination.to_float(balance_atomic),
+                'balance_atomic': balance_atomic,
+                'transfers': TransferSeries.from_arrays(timestamps, amounts, directions, counterparties)
             }
 
         except Exception as e:
             logging.error(f"Error fetching wallet data: {str(e)}")
-            return {
-                'balance': 0,
-                'transfers': [],
-                'daily_flows': []
-            }
+            raise
+
+    def default_wallet_data(self):
+        """Placeholder shown until the first successful wallet fetch"""
+        return {
+            'balance': 0,
+            'balance_atomic': 0,
+            'transfers': TransferSeries.empty(),
+            'daily_flows': []
+        }
 
     def get_staking_identities(self):
         """Fetch and categorize staking identities"""
         try:
-            response = requests.get(
+            response = http_client.get(
                 f"{self.base_url}/identities",
-                headers=self.headers
+                endpoint='/identities',
+                params={'fields': IDENTITY_FIELDS},
+                headers=self.headers,
+                cache=True
             )
             response.raise_for_status()
             identities = response.json()
@@ -223,8 +267,8 @@ class MultiversXService:
             standalone_nodes = 0
 
             for identity in identities:
-                stake = float(identity.get('stake', '0'))
-                locked = float(identity.get('locked', '0'))
+                stake = denomination.to_atomic(identity.get('stake'))
+                locked = denomination.to_atomic(identity.get('locked'))
                 
                 # Check if it's a staking provider
                 is_provider = ('providers' in identity or (
@@ -248,9 +292,26 @@ class MultiversXService:
             }
         except Exception as e:
             print(f"Error fetching staking identities: {e}")
-            return {
-                'staking_providers': 0,
-                'inactive_providers': 0,
-                'standalone_nodes': 0,
-                'total_nodes': 0
-            }
\ No newline at end of file
+            raise
+
+    def default_staking_identities(self):
+        """Placeholder shown until the first successful identities fetch"""
+        return {
+            'staking_providers': 0,
+            'inactive_providers': 0,
+            'standalone_nodes': 0,
+            'total_nodes': 0
+        }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_multiversx_service():
+    """Return the process-wide service, built on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = MultiversXService()
+        return _service
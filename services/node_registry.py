@@ -0,0 +1,400 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from services import http_client
+from services.shard_stats import shard_label
+from utils import denomination
+from utils.metrics import REGISTRY
+
+BASE_URL = "https://multiversx-api.blastapi.io/6016bb9c-17f6-43f4-aff4-890334b7f628"
+REGISTRY_FILE = os.getenv('NODE_REGISTRY_FILE', os.path.join('data', 'nodes.npz'))
+
+# Nodes per /nodes page; pages are fetched concurrently under the host budget
+PAGE_SIZE = 500
+WORKERS = 4
+NODE_FIELDS = 'bls,shard,status,provider,identity,stake,rating'
+# Node statuses as stored; anything else is kept as 'unknown'
+STATUSES = ('unknown', 'new', 'queued', 'waiting', 'eligible', 'jailed', 'leaving', 'inactive')
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+JAILED = _STATUS_CODES['jailed']
+# Epoch transitions whose diffs are kept
+EPOCH_HISTORY = 30
+# Within an epoch the node list is refetched once it is this old, so jailed
+# statuses and ratings lag by at most this much
+MAX_TABLE_AGE = 3600  # seconds
+# Saved in place of a missing epoch; np.int64 has no None
+NO_EPOCH = -1
+# BLS keys listed per diff in summaries; the counts are always complete
+SUMMARY_KEYS = 20
+
+node_refreshes_total = REGISTRY.counter(
+    'mvx_node_registry_refreshes_total',
+    'Node registry refreshes by kind: full (first load), epoch (new epoch, list diffed), '
+    'aged (same epoch, table older than MAX_TABLE_AGE) or unchanged (no fetch)',
+    ('kind',)
+)
+
+_COLUMNS = ('keys', 'shards', 'statuses', 'providers', 'stakes', 'ratings')
+
+
+class NodeTable:
+    """Validator nodes as parallel columns sorted by BLS key.
+
+    BLS keys are kept as raw 96-byte strings, providers as indexes into
+    the registry's interned provider list (-1 for none), stake in EGLD.
+    """
+
+    __slots__ = _COLUMNS
+
+    def __init__(self, keys, shards, statuses, providers, stakes, ratings):
+        self.keys = keys
+        self.shards = shards
+        self.statuses = statuses
+        self.providers = providers
+        self.stakes = stakes
+        self.ratings = ratings
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            np.empty(0, dtype='S96'), np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.int8),
+            np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float32)
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in _COLUMNS)
+
+
+def _bls_bytes(bls):
+    try:
+        return bytes.fromhex(bls)
+    except (TypeError, ValueError):
+        return (bls or '').encode()[:96]
+
+
+class NodeRegistry:
+    """Columnar registry of the network's validator nodes.
+
+    The node list is fetched when the epoch changes, and again within an
+    epoch once the table is MAX_TABLE_AGE old (see refresh() below). Each
+    fetch replaces the table whole. The first table of each epoch is kept
+    as its base; at the next epoch the new table is diffed against it and
+    the joined, left and newly jailed keys are kept as that epoch's
+    changes. Tables, diffs and the fetch time are saved to REGISTRY_FILE,
+    so a restart within the same epoch fetches nothing until the table
+    ages out.
+    """
+
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self.table = None
+        # Table at the epoch's first fetch; the next epoch is diffed against it
+        self.base = None
+        self.epoch = None
+        self.fetched_at = None
+        self.provider_names = []
+        self._provider_index = {}
+        self.epoch_diffs = deque(maxlen=EPOCH_HISTORY)
+        self._lock = threading.Lock()
+
+    @property
+    def age(self):
+        """Seconds since the table was fetched; infinite if it never was"""
+        if self.fetched_at is None:
+            return float('inf')
+        return time.time() - self.fetched_at
+
+    def _provider(self, name):
+        if not name:
+            return -1
+        index = self._provider_index.get(name)
+        if index is None:
+            index = self._provider_index[name] = len(self.provider_names)
+            self.provider_names.append(name)
+        return index
+
+    def build_table(self, nodes):
+        """Columns for API node dicts, sorted by key, duplicates dropped"""
+        if not nodes:
+            return NodeTable.empty()
+        keys = np.array([_bls_bytes(node.get('bls')) for node in nodes], dtype='S96')
+        keys, first = np.unique(keys, return_index=True)
+        nodes = [nodes[i] for i in first]
+        return NodeTable(
+            keys,
+            np.fromiter((node.get('shard') or 0 for node in nodes), dtype=np.uint32, count=len(nodes)),
+            np.fromiter((_STATUS_CODES.get(node.get('status'), 0) for node in nodes), dtype=np.int8, count=len(nodes)),
+            # Nodes outside a staking provider are grouped by their identity
+            np.fromiter(
+                (self._provider(node.get('provider') or node.get('identity')) for node in nodes),
+                dtype=np.int32, count=len(nodes)
+            ),
+            denomination.to_float_array([node.get('stake') for node in nodes]),
+            np.fromiter((node.get('rating') or 0 for node in nodes), dtype=np.float32, count=len(nodes)),
+        )
+
+    @staticmethod
+    def diff(old, new):
+        """What changed from table `old` to table `new`.
+
+        Returns row positions of joined (in `new`), left (in `old`) and
+        newly jailed (in `new`) nodes, and the number of kept nodes with
+        any changed column. Membership and changed columns are whole-array
+        comparisons over the key-sorted columns, with no per-node Python
+        work.
+        """
+        in_old = np.isin(new.keys, old.keys, assume_unique=True)
+        in_new = np.isin(old.keys, new.keys, assume_unique=True)
+        kept_old = np.flatnonzero(in_new)
+        kept_new = np.flatnonzero(in_old)
+        changed = np.zeros(len(kept_new), dtype=bool)
+        for name in _COLUMNS[1:]:
+            changed |= getattr(old, name)[kept_old] != getattr(new, name)[kept_new]
+        newly_jailed = (new.statuses[kept_new] == JAILED) & (old.statuses[kept_old] != JAILED)
+        return {
+            'joined': np.flatnonzero(~in_old),
+            'left': np.flatnonzero(~in_new),
+            'jailed': kept_new[newly_jailed],
+            'changed': int(changed.sum()),
+        }
+
+    def _describe(self, old, new, change):
+        def hex_keys(table, rows):
+            # NumPy drops trailing zero bytes of 'S' values; BLS keys are 96 bytes
+            return [key.hex().ljust(192, '0') for key in table.keys[rows]]
+        return {
+            'joined': hex_keys(new, change['joined']),
+            'left': hex_keys(old, change['left']),
+            'jailed': hex_keys(new, change['jailed']),
+            'changed': change['changed'],
+        }
+
+    def refresh(self, nodes, epoch):
+        """Replace the table with a freshly fetched node list.
+
+        A new epoch is diffed against the previous epoch's base table and
+        the diff recorded as its changes; that diff is returned. A refetch
+        within the same epoch, or the first load, returns None.
+        """
+        with self._lock:
+            new = self.build_table(nodes)
+            base, previous_epoch = self.base, self.epoch
+            self.table, self.fetched_at = new, time.time()
+            if base is None:
+                self.base, self.epoch = new, epoch
+                node_refreshes_total.inc(kind='full')
+                return None
+            if epoch == previous_epoch:
+                node_refreshes_total.inc(kind='aged')
+                return None
+            self.base, self.epoch = new, epoch
+            node_refreshes_total.inc(kind='epoch')
+            diff = {
+                'epoch': epoch,
+                'previous_epoch': previous_epoch,
+                'at': int(self.fetched_at),
+                **self._describe(base, new, self.diff(base, new))
+            }
+            self.epoch_diffs.append(diff)
+            return diff
+
+    def per_shard(self):
+        """Node counts by status, stake and average rating per shard"""
+        with self._lock:
+            table = self.table
+        if not table:
+            return {}
+        shards, index = np.unique(table.shards, return_inverse=True)
+        count = len(shards)
+        nodes = np.bincount(index, minlength=count)
+        stake = np.bincount(index, weights=table.stakes, minlength=count)
+        rating = np.bincount(index, weights=table.ratings, minlength=count)
+        by_status = np.zeros((count, len(STATUSES)), dtype=np.int64)
+        np.add.at(by_status, (index, table.statuses), 1)
+        return {
+            shard_label(int(shard)): {
+                'nodes': int(nodes[i]),
+                **{status: int(by_status[i, code]) for code, status in enumerate(STATUSES) if by_status[i, code]},
+                'stake': float(stake[i]),
+                'avg_rating': float(rating[i] / nodes[i]),
+            }
+            for i, shard in enumerate(shards)
+        }
+
+    def per_provider(self, limit=None):
+        """Nodes, stake, jailed nodes and average rating per provider, largest stake first"""
+        with self._lock:
+            table = self.table
+            names = list(self.provider_names)
+        if not table:
+            return []
+        # Shift by one so nodes without a provider (-1) get bucket 0
+        index = table.providers.astype(np.int64) + 1
+        count = len(names) + 1
+        nodes = np.bincount(index, minlength=count)
+        stake = np.bincount(index, weights=table.stakes, minlength=count)
+        rating = np.bincount(index, weights=table.ratings, minlength=count)
+        jailed = np.bincount(index, weights=table.statuses == JAILED, minlength=count)
+        order = [i for i in np.argsort(-stake, kind='stable') if nodes[i]][:limit]
+        return [
+            {
+                'provider': names[i - 1] if i else None,
+                'nodes': int(nodes[i]),
+                'stake': float(stake[i]),
+                'jailed': int(jailed[i]),
+                'avg_rating': float(rating[i] / nodes[i]),
+            }
+            for i in order
+        ]
+
+    def summary(self, providers=20):
+        """Snapshot-sized view: totals, aggregates and the latest diffs"""
+        def trimmed(diff):
+            if diff is None:
+                return None
+            return {
+                **diff,
+                **{name: diff[name][:SUMMARY_KEYS] for name in ('joined', 'left', 'jailed')},
+                **{f'{name}_count': len(diff[name]) for name in ('joined', 'left', 'jailed')},
+            }
+
+        with self._lock:
+            epochs = list(self.epoch_diffs)
+            nodes = len(self.table) if self.table is not None else 0
+            fetched_at = self.fetched_at
+        return {
+            'epoch': self.epoch,
+            # Epoch seconds of the fetch behind every figure below
+            'fetched_at': int(fetched_at) if fetched_at is not None else None,
+            'nodes': nodes,
+            'shards': self.per_shard(),
+            'providers': self.per_provider(providers),
+            'epochs': [trimmed(diff) for diff in reversed(epochs)],
+        }
+
+    def save(self):
+        """Write the table atomically; the lock keeps writers in one process apart"""
+        with self._lock:
+            if self.table is None:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Per-writer temp name, so processes sharing the file never collide
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+            # The base is only stored when an in-epoch refetch replaced the table
+            base = {} if self.base is self.table else {f'base_{name}': getattr(self.base, name) for name in _COLUMNS}
+            np.savez(
+                tmp_path,
+                epoch=np.int64(NO_EPOCH if self.epoch is None else self.epoch),
+                fetched_at=np.float64(self.fetched_at or 0),
+                provider_names=np.array(self.provider_names, dtype=str),
+                epoch_diffs=np.array(json.dumps(list(self.epoch_diffs))),
+                **{name: getattr(self.table, name) for name in _COLUMNS},
+                **base
+            )
+            os.replace(tmp_path, self.path)
+
+    def load(self):
+        """Start from the saved table, if any; returns whether one was loaded"""
+        try:
+            with np.load(self.path) as saved:
+                table = NodeTable(*(saved[name] for name in _COLUMNS))
+                base = table
+                if 'base_keys' in saved.files:
+                    base = NodeTable(*(saved[f'base_{name}'] for name in _COLUMNS))
+                names = saved['provider_names'].tolist()
+                epoch = int(saved['epoch'])
+                # Files saved before these were kept: refetch on the next refresh
+                fetched_at = float(saved['fetched_at']) if 'fetched_at' in saved.files else 0.0
+                diffs = json.loads(str(saved['epoch_diffs'])) if 'epoch_diffs' in saved.files else []
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable node registry {self.path}: {e}")
+            return False
+        with self._lock:
+            self.provider_names = names
+            self._provider_index = {name: i for i, name in enumerate(names)}
+            self.table, self.base, self.epoch = table, base, None if epoch == NO_EPOCH else epoch
+            self.fetched_at = fetched_at or None
+            self.epoch_diffs = deque(diffs, maxlen=EPOCH_HISTORY)
+        return True
+
+
+def fetch_epoch():
+    """Current epoch, or None if /stats does not report one"""
+    response = http_client.get(f"{BASE_URL}/stats", endpoint='/stats', params={'fields': 'epoch'})
+    response.raise_for_status()
+    return response.json().get('epoch')
+
+
+def fetch_nodes():
+    """Every validator node, paging /nodes concurrently"""
+    count_response = http_client.get(f"{BASE_URL}/nodes/count", endpoint='/nodes/count', params={'type': 'validator'})
+    count_response.raise_for_status()
+    total = int(count_response.json())
+
+    def page(offset):
+        response = http_client.get(
+            f"{BASE_URL}/nodes",
+            endpoint='/nodes',
+            params={'type': 'validator', 'from': offset, 'size': PAGE_SIZE, 'fields': NODE_FIELDS}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='node-pages') as pool:
+        pages = list(pool.map(page, range(0, total, PAGE_SIZE)))
+    return [node for nodes in pages for node in nodes]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_node_registry():
+    """Return the process-wide node registry, loaded from disk on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = NodeRegistry()
+            _registry.load()
+        return _registry
+
+
+def refresh():
+    """Refetch the node list if the epoch changed or the table aged out; returns the summary.
+
+    Only the collector scheduler calls this. Membership only changes
+    between epochs, so within one the loaded table is reused, and the
+    refresh costs a single /stats call, until it is MAX_TABLE_AGE old;
+    that bounds how stale jailed statuses and ratings get. An unknown
+    epoch always refetches.
+    """
+    registry = get_node_registry()
+    epoch = fetch_epoch()
+    if (registry.table is not None and epoch is not None and epoch == registry.epoch
+            and registry.age < MAX_TABLE_AGE):
+        node_refreshes_total.inc(kind='unchanged')
+    else:
+        registry.refresh(fetch_nodes(), epoch)
+        registry.save()
+    return registry.summary()
+
+
+def summary():
+    """Summary of the registry as last saved, or None before the first refresh"""
+    registry = get_node_registry()
+    if registry.table is None:
+        return None
+    return registry.summary()
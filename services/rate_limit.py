@@ -0,0 +1,108 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from utils import metrics
+
+# Sustained requests per second and burst size per upstream host
+HOST_BUDGETS = {
+    'multiversx-api.blastapi.io': (10.0, 20),
+    'api.multiversx.com': (2.0, 4),
+    'pro-api.coinmarketcap.com': (0.5, 5),  # basic plan: 30 calls per minute
+}
+DEFAULT_BUDGET = (2.0, 4)
+
+# Adaptive backoff bounds when a host answers 429 without Retry-After
+MIN_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 300.0
+
+throttled_total = metrics.REGISTRY.counter(
+    'mvx_http_throttled_total',
+    'Responses that asked us to slow down (429 or Retry-After)',
+    ('host',)
+)
+
+
+def parse_retry_after(value):
+    """Return Retry-After in seconds from either delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostBudget:
+    """Token bucket for one upstream host with adaptive slow-down.
+
+    A throttling response halves the refill rate and blocks the host for
+    Retry-After (or an exponential backoff); each successful response
+    recovers a little of the configured rate.
+    """
+
+    def __init__(self, host, rate, burst):
+        self.host = host
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._backoff = MIN_BACKOFF_SECONDS
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request to this host is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, retry_after=None):
+        """Back off after a 429/503 from this host"""
+        throttled_total.inc(host=self.host)
+        with self._lock:
+            if retry_after is None:
+                retry_after = self._backoff
+                self._backoff = min(self._backoff * 2, MAX_BACKOFF_SECONDS)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+            self._tokens = 0.0
+
+    def reward(self):
+        """Recover the rate gradually after a successful response"""
+        with self._lock:
+            self._backoff = MIN_BACKOFF_SECONDS
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+def budget_for(host):
+    """Return the shared budget for a host"""
+    with _budgets_lock:
+        budget = _budgets.get(host)
+        if budget is None:
+            rate, burst = HOST_BUDGETS.get(host, DEFAULT_BUDGET)
+            budget = _budgets[host] = HostBudget(host, rate, burst)
+        return budget
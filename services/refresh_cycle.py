@@ -0,0 +1,81 @@
+import threading
+from datetime import datetime
+
+from services.database import Database
+
+# Samples kept per table while writes fail; the oldest are dropped beyond it
+MAX_PENDING_SAMPLES = 1000
+
+
+class RefreshCycle:
+    """Collector results waiting to be stored together.
+
+    Jobs add what they fetched as they finish; flush() writes everything
+    pending with one Database.write_cycle call, so a cycle costs one
+    transaction however many jobs contributed to it. Samples are stamped
+    when they are added, not when they are written. If the write fails
+    the rows are kept for the next flush, newer wallet snapshots and
+    datasets winning.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wallets = {}
+        self._datasets = {}
+        self._samples = {'market': [], 'network': [], 'tps': []}
+
+    def add_wallet(self, key, data):
+        with self._lock:
+            self._wallets[key] = data
+
+    def add_dataset(self, name, data):
+        """Queue the latest value of a dashboard dataset; a newer one replaces it"""
+        with self._lock:
+            self._datasets[name] = data
+
+    def add_sample(self, kind, sample):
+        """Queue a market, network or tps sample row"""
+        sample = {**sample, 'last_updated': sample.get('last_updated') or datetime.now()}
+        with self._lock:
+            samples = self._samples[kind]
+            samples.append(sample)
+            del samples[:-MAX_PENDING_SAMPLES]
+
+    def flush(self):
+        """Write everything pending in one transaction; returns the rows written"""
+        with self._lock:
+            wallets, named, samples = self._wallets, self._datasets, self._samples
+            self._wallets = {}
+            self._datasets = {}
+            self._samples = {kind: [] for kind in samples}
+        if not wallets and not named and not any(samples.values()):
+            return 0
+        try:
+            return Database().write_cycle(wallets=wallets, datasets=named, **samples)
+        except Exception:
+            with self._lock:
+                self._wallets = {**wallets, **self._wallets}
+                self._datasets = {**named, **self._datasets}
+                for kind, pending in samples.items():
+                    self._samples[kind][:0] = pending
+                    del self._samples[kind][:-MAX_PENDING_SAMPLES]
+            raise
+
+
+CYCLE = RefreshCycle()
+
+
+def add_wallet(key, data):
+    CYCLE.add_wallet(key, data)
+
+
+def add_dataset(name, data):
+    CYCLE.add_dataset(name, data)
+
+
+def add_sample(kind, sample):
+    CYCLE.add_sample(kind, sample)
+
+
+def flush():
+    return CYCLE.flush()
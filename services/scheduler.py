@@ -0,0 +1,142 @@
+import heapq
+import itertools
+import logging
+import queue
+import random
+import threading
+import time
+
+from utils import metrics
+
+PRIORITY_HIGH = 0    # cheap, fast-moving data: TPS, quotes, network stats
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10    # slow data: identities, 30-day wallet histories
+
+# Failing jobs back off exponentially up to this multiple of their interval
+MAX_FAILURE_BACKOFF = 8
+
+job_failures_total = metrics.REGISTRY.counter(
+    'mvx_job_failures_total',
+    'Scheduled job runs that raised',
+    ('job',)
+)
+
+
+class Job:
+    def __init__(self, name, func, interval, priority, jitter):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.priority = priority
+        self.jitter = jitter
+        self.failures = 0
+        self.running = False
+        self.last_run = None
+        self.next_run = None
+
+    def delay(self):
+        """Seconds until the next run, spread by jitter and failure backoff"""
+        backoff = min(2 ** self.failures, MAX_FAILURE_BACKOFF)
+        spread = 1 + random.uniform(-self.jitter, self.jitter)
+        return self.interval * backoff * spread
+
+
+class Scheduler:
+    """Timer wheel plus a priority-ordered worker pool.
+
+    A single timer thread sleeps until the earliest job is due, then hands
+    due jobs to a priority queue. Workers always take the most important
+    ready job first, so a backlog of slow wallet refreshes never delays a
+    price quote. Upstream pacing is enforced separately by the per-host
+    budgets in services.rate_limit.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._jobs = {}
+        self._timers = []
+        self._ready = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition()
+        self._threads = []
+        self.running = False
+
+    def add_job(self, name, func, interval, priority=PRIORITY_NORMAL, jitter=0.1, initial_delay=None):
+        """Run func every `interval` seconds.
+
+        Without an initial_delay the first run is spread randomly over the
+        first interval so jobs added together do not fire in one burst.
+        """
+        job = Job(name, func, interval, priority, jitter)
+        if initial_delay is None:
+            initial_delay = random.uniform(0, interval * jitter)
+        with self._wakeup:
+            self._jobs[name] = job
+            self._schedule(job, time.monotonic() + initial_delay)
+        return job
+
+    def run_now(self, name):
+        """Queue a job for immediate execution"""
+        with self._wakeup:
+            self._schedule(self._jobs[name], time.monotonic())
+
+    def _schedule(self, job, when):
+        job.next_run = when
+        heapq.heappush(self._timers, (when, job.priority, next(self._sequence), job))
+        self._wakeup.notify()
+
+    def _timer_loop(self):
+        while self.running:
+            with self._wakeup:
+                now = time.monotonic()
+                while self._timers and self._timers[0][0] <= now:
+                    when, priority, _, job = heapq.heappop(self._timers)
+                    if when != job.next_run or job.running:
+                        continue  # superseded entry, or still running from last time
+                    job.running = True
+                    self._ready.put((job.priority, next(self._sequence), job))
+                timeout = self._timers[0][0] - now if self._timers else None
+                self._wakeup.wait(timeout)
+
+    def _worker_loop(self):
+        while self.running:
+            _, _, job = self._ready.get()
+            if job is None:
+                break
+            try:
+                with metrics.timed(metrics.job_duration_seconds, job=job.name):
+                    job.func()
+                job.failures = 0
+            except Exception as e:
+                job.failures += 1
+                job_failures_total.inc(job=job.name)
+                logging.error(f"Scheduled job {job.name} failed: {e}")
+            finally:
+                job.last_run = time.time()
+                with self._wakeup:
+                    job.running = False
+                    self._schedule(job, time.monotonic() + job.delay())
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._threads = [threading.Thread(target=self._timer_loop, name='scheduler-timer', daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._worker_loop, name=f'scheduler-worker-{i}', daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for _ in range(self.max_workers):
+            self._ready.put((-1, next(self._sequence), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
@@ -0,0 +1,137 @@
+import bisect
+import math
+import threading
+
+import numpy as np
+
+# Protocol id of the metachain; only used to label it, shards come from the blocks
+METACHAIN_ID = 4294967295
+# Nominal round length, used until the window has observed one
+ROUND_SECONDS = 6
+# Blocks kept per shard (~20 minutes at one block per round)
+WINDOW_BLOCKS = 200
+
+# Block fields kept per block; missing ones are NaN
+_FIELDS = ('nonce', 'round', 'timestamp', 'txCount', 'size', 'gasConsumed', 'maxGasLimit')
+_NONCE, _ROUND, _TIMESTAMP, _TX_COUNT, _SIZE, _GAS_USED, _GAS_LIMIT = range(len(_FIELDS))
+# Fields stats() needs as numbers; blocks missing any of them are skipped
+_REQUIRED = (_NONCE, _ROUND, _TIMESTAMP, _TX_COUNT)
+# fields= projection for /blocks requests feeding the window
+BLOCK_FIELDS = ','.join(('shard',) + _FIELDS)
+
+
+def shard_label(shard):
+    return 'meta' if shard == METACHAIN_ID else str(shard)
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def _nanmean(values):
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+class BlockWindow:
+    """Rolling window of the latest blocks of every shard.
+
+    Each shard's window is a list of rows kept in nonce order, with a
+    parallel list of nonces to bisect, so a block that arrives late is
+    inserted where it belongs and a repeated nonce from overlapping polls
+    is ignored. Past `size` blocks the lowest nonces are dropped. stats()
+    turns each shard's window into a 2-D array and computes everything
+    with vectorized operations; shards are whatever ids appear in the
+    blocks.
+    """
+
+    def __init__(self, size=WINDOW_BLOCKS):
+        self.size = size
+        self._blocks = {}
+        self._nonces = {}
+        self._lock = threading.Lock()
+
+    def add(self, blocks):
+        """Add API block dicts; returns how many were new.
+
+        Incomplete blocks (no shard, nonce, round, timestamp or txCount)
+        are skipped, so the window only holds rows stats() can use.
+        """
+        rows = []
+        for block in blocks:
+            shard = block.get('shard')
+            if not isinstance(shard, int) or isinstance(shard, bool):
+                continue
+            row = tuple(_number(block.get(field)) for field in _FIELDS)
+            if not any(math.isnan(row[i]) for i in _REQUIRED):
+                rows.append((shard, row))
+        added = 0
+        with self._lock:
+            for shard, row in rows:
+                window = self._blocks.setdefault(shard, [])
+                nonces = self._nonces.setdefault(shard, [])
+                index = bisect.bisect_left(nonces, row[_NONCE])
+                if index < len(nonces) and nonces[index] == row[_NONCE]:
+                    continue
+                if len(window) >= self.size:
+                    if index == 0:
+                        # Older than everything in a full window
+                        continue
+                    del window[0], nonces[0]
+                    index -= 1
+                window.insert(index, row)
+                nonces.insert(index, row[_NONCE])
+                added += 1
+        return added
+
+    def stats(self):
+        """Per-shard analytics, keyed by shard label ('0', '1', ..., 'meta')"""
+        with self._lock:
+            windows = {shard: np.array(window) for shard, window in self._blocks.items() if window}
+        if not windows:
+            return {}
+
+        newest_round = max(blocks[-1, _ROUND] for blocks in windows.values())
+        result = {}
+        for shard, blocks in sorted(windows.items()):
+            tx_counts = blocks[:, _TX_COUNT]
+            timestamps = blocks[:, _TIMESTAMP]
+            rounds = blocks[:, _ROUND]
+
+            # Only pairs of blocks with consecutive nonces say something about
+            # rounds; a nonce gap just means a block was not fetched
+            consecutive = np.diff(blocks[:, _NONCE]) == 1
+            round_steps = np.diff(rounds)[consecutive]
+            time_steps = np.diff(timestamps)[consecutive]
+            rounds_covered = round_steps.sum()
+            missed_rounds = int((round_steps - 1).sum())
+
+            span = timestamps[-1] - timestamps[0]
+            round_time = float(time_steps.sum() / rounds_covered) if rounds_covered > 0 else None
+            gas_utilization = blocks[:, _GAS_USED] / blocks[:, _GAS_LIMIT]
+
+            result[shard_label(shard)] = {
+                'blocks': len(blocks),
+                'latest_tx_count': int(tx_counts[-1]),
+                'tx_per_block': float(tx_counts.mean()),
+                # The first block's transactions were produced before the span started
+                'tps': float(tx_counts[1:].sum() / span) if span > 0 else None,
+                'round_time': round_time,
+                'block_interval': float(np.diff(timestamps).mean()) if len(blocks) > 1 else None,
+                'missed_rounds': missed_rounds,
+                'missed_ratio': missed_rounds / rounds_covered if rounds_covered > 0 else 0.0,
+                'empty_blocks': int(np.count_nonzero(tx_counts == 0)),
+                'empty_ratio': float(np.count_nonzero(tx_counts == 0) / len(blocks)),
+                'avg_size': _nanmean(blocks[:, _SIZE]),
+                'avg_gas_used': _nanmean(blocks[:, _GAS_USED]),
+                'gas_utilization': _nanmean(gas_utilization[np.isfinite(gas_utilization)]),
+                'last_round': int(rounds[-1]),
+                'rounds_behind': int(newest_round - rounds[-1]),
+            }
+        return result
+
+
+def observed_round_time(stats):
+    """Median round time across shards, or ROUND_SECONDS before there is one"""
+    times = [shard['round_time'] for shard in stats.values() if shard['round_time']]
+    return float(np.median(times)) if times else ROUND_SECONDS
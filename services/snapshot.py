@@ -0,0 +1,80 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+
+
+def _json_default(value):
+    """Encode datetimes as epoch seconds, everything else via str()"""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return str(value)
+
+
+class SnapshotStore:
+    """Process-wide dashboard snapshot served to browser widgets as JSON.
+
+    Sections are published by the page and the background collectors. The
+    compact JSON body and its ETag are encoded once per change, so repeated
+    polls of an unchanged snapshot cost a dict lookup.
+    """
+
+    def __init__(self):
+        self._sections = {}
+        self._updated = {}
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def publish(self, section, data):
+        """Replace a section; unchanged data keeps the current ETag"""
+        with self._lock:
+            if self._sections.get(section) == data:
+                return
+            self._sections[section] = copy.deepcopy(data)
+            self._touch(section)
+
+    def merge(self, section, **fields):
+        """Update individual fields of a dict section"""
+        with self._lock:
+            current = self._sections.get(section) or {}
+            if all(current.get(name) == value for name, value in fields.items()):
+                return
+            self._sections[section] = {**current, **fields}
+            self._touch(section)
+
+    def _touch(self, section):
+        self._updated[section] = int(time.time())
+        self._encoded.pop(section, None)
+        self._encoded.pop(None, None)
+
+    def get(self, section=None):
+        """Return (body, etag) for one section, or the whole snapshot"""
+        with self._lock:
+            cached = self._encoded.get(section)
+            if cached is not None:
+                return cached
+
+            if section is None:
+                payload = {'sections': self._sections, 'updated': self._updated}
+            elif section in self._sections:
+                payload = self._sections[section]
+            else:
+                return None
+
+            body = json.dumps(payload, separators=(',', ':'), default=_json_default).encode('utf-8')
+            etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            self._encoded[section] = (body, etag)
+            return body, etag
+
+
+STORE = SnapshotStore()
+
+
+def publish(section, data):
+    STORE.publish(section, data)
+
+
+def merge(section, **fields):
+    STORE.merge(section, **fields)
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+
+import numpy as np
+
+from utils import denomination
+
+# Shares of total stake an attacker needs: 1/3 stalls consensus, 2/3 controls it
+NAKAMOTO_THRESHOLDS = (1 / 3, 2 / 3)
+
+
+def stake_by_entity(identities, providers=()):
+    """Stake in EGLD of every independent operator.
+
+    Identities already cover the providers that declare them; providers
+    without an identity are operators of their own. 'locked' (stake plus
+    top-up) is used, falling back to 'stake'.
+    """
+    amounts = [identity.get('locked') or identity.get('stake') for identity in identities]
+    known = {
+        provider
+        for identity in identities
+        for provider in identity.get('providers') or ()
+    }
+    amounts += [
+        provider.get('locked')
+        for provider in providers
+        if not provider.get('identity') and provider.get('provider') not in known
+    ]
+    stakes = denomination.to_float_array(amounts)
+    return stakes[stakes > 0]
+
+
+def nakamoto_coefficient(sorted_stakes, total, threshold):
+    """Fewest entities, largest first, whose stake exceeds `threshold` of the total"""
+    if not total:
+        return 0
+    cumulative = np.cumsum(sorted_stakes)
+    return min(int(np.searchsorted(cumulative, threshold * total, side='right')) + 1, len(sorted_stakes))
+
+
+def concentration(stakes):
+    """Nakamoto coefficients, Gini and HHI of a stake distribution"""
+    stakes = np.sort(np.asarray(stakes, dtype=np.float64))[::-1]
+    count = len(stakes)
+    total = float(stakes.sum())
+    if not count or total <= 0:
+        return {'entities': 0, 'nakamoto_33': 0, 'nakamoto_66': 0, 'gini': 0.0, 'hhi': 0.0}
+
+    shares = stakes / total
+    # Gini from the ascending order: sum((2i - n - 1) * x_i) / (n * sum(x))
+    ranks = np.arange(1, count + 1)
+    gini = float(((2 * ranks - count - 1) * shares[::-1]).sum() / count)
+    return {
+        'entities': count,
+        'nakamoto_33': nakamoto_coefficient(stakes, total, NAKAMOTO_THRESHOLDS[0]),
+        'nakamoto_66': nakamoto_coefficient(stakes, total, NAKAMOTO_THRESHOLDS[1]),
+        'gini': gini,
+        # Herfindahl-Hirschman index on the 0-10,000 scale
+        'hhi': float((shares * 100) @ (shares * 100)),
+    }
+
+
+class StakeConcentration:
+    """Concentration of the latest identity and provider stake.
+
+    Keyed by a digest of the raw response bodies, so the bodies are only
+    parsed and the distribution recomputed when the stake data changed.
+    """
+
+    def __init__(self):
+        self._digest = None
+        self._result = None
+        self._lock = threading.Lock()
+
+    def update(self, identities_body, providers_body):
+        """Concentration for the given /identities and /providers JSON bodies"""
+        digest = hashlib.blake2b(identities_body, digest_size=16)
+        digest.update(providers_body)
+        digest = digest.digest()
+        with self._lock:
+            if digest == self._digest:
+                return self._result
+
+        result = concentration(stake_by_entity(json.loads(identities_body), json.loads(providers_body)))
+        with self._lock:
+            self._digest, self._result = digest, result
+        return result
+
+
+CONCENTRATION = StakeConcentration()
+
+
+def update(identities_body, providers_body):
+    return CONCENTRATION.update(identities_body, providers_body)
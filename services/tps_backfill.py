@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+from services import http_client
+from services.shard_stats import shard_label
+from utils.metrics import REGISTRY
+
+BASE_URL = "https://multiversx-api.blastapi.io/6016bb9c-17f6-43f4-aff4-890334b7f628"
+CHECKPOINT_DIR = os.getenv('BACKFILL_DIR', os.path.join('data', 'backfill'))
+
+HOUR = 3600
+MINUTE = 60
+# Furthest back a backfill may reach; the daily prune keeps samples longer
+# (updater.TPS_RETENTION_DAYS), so backfilled hours are not eroded
+BACKFILL_HORIZON_DAYS = 30
+# One chunk is one shard for one hour (~600 blocks), fetched in pages
+PAGE_SIZE = 1000
+# Requests still go through the host's token bucket; this only bounds concurrency
+WORKERS = 8
+# Save the checkpoint after this many finished chunks
+CHECKPOINT_EVERY = 20
+BLOCK_FIELDS = 'shard,nonce,timestamp,txCount'
+
+backfill_chunks_total = REGISTRY.counter(
+    'mvx_tps_backfill_chunks_total',
+    'Historical TPS backfill chunks by result',
+    ('result',)
+)
+
+
+def discover_shards():
+    """Shard ids present in the latest blocks"""
+    response = http_client.get(
+        f"{BASE_URL}/blocks", endpoint='/blocks', params={'size': 100, 'fields': 'shard'}
+    )
+    response.raise_for_status()
+    return sorted({block.get('shard', 0) for block in response.json()})
+
+
+def fetch_chunk(shard, start):
+    """Per-minute transaction and block counts of one shard for the hour starting at `start`.
+
+    Blocks are paged by timestamp; nonces de-duplicate page overlaps and
+    show whether the hour came back complete. Blocks the API does not
+    return are counted in 'missing' rather than failing the chunk, since
+    refetching would not bring them back.
+    """
+    end = start + HOUR
+    blocks = {}
+    offset = 0
+    while True:
+        response = http_client.get(
+            f"{BASE_URL}/blocks",
+            endpoint='/blocks',
+            params={
+                'shard': shard, 'after': start - 1, 'before': end, 'from': offset,
+                'size': PAGE_SIZE, 'fields': BLOCK_FIELDS
+            }
+        )
+        response.raise_for_status()
+        page = response.json()
+        for block in page:
+            if start <= block.get('timestamp', 0) < end:
+                blocks[block['nonce']] = block
+        if len(page) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+
+    tx = np.zeros(HOUR // MINUTE, dtype=np.int64)
+    counts = np.zeros(HOUR // MINUTE, dtype=np.int64)
+    missing = 0
+    if blocks:
+        nonces = np.fromiter(blocks, dtype=np.int64, count=len(blocks))
+        minutes = np.fromiter((b['timestamp'] for b in blocks.values()), dtype=np.int64, count=len(blocks))
+        minutes = (minutes - start) // MINUTE
+        tx_counts = np.fromiter((b.get('txCount', 0) for b in blocks.values()), dtype=np.int64, count=len(blocks))
+        np.add.at(tx, minutes, tx_counts)
+        np.add.at(counts, minutes, 1)
+        missing = int(nonces.max() - nonces.min() + 1 - len(nonces))
+    return {'tx': tx.tolist(), 'blocks': counts.tolist(), 'missing': missing}
+
+
+class TPSBackfill:
+    """Rebuild per-minute TPS history for [start, end) from historical blocks.
+
+    The range is cut into one-hour chunks per shard and fetched by a
+    thread pool; every request takes a token from the shared host budget
+    in http_client, so the backfill cannot exceed the upstream rate limit.
+    Each finished chunk is kept in a JSON checkpoint. Once every shard of
+    an hour is in, its 60 per-minute samples are written to tps_samples,
+    the table live sampling uses, and the hour is marked written, with
+    the number of blocks missing from it under 'gaps' if it was not
+    complete. A rerun with the same range only fetches what is missing.
+    """
+
+    def __init__(self, start, end, shards=None, workers=WORKERS, checkpoint_dir=CHECKPOINT_DIR):
+        self.start = int(start) // HOUR * HOUR
+        self.end = int(end) // HOUR * HOUR
+        self.shards = shards
+        self.workers = workers
+        self.path = os.path.join(checkpoint_dir, f'tps-{self.start}-{self.end}.json')
+        self._state = {'chunks': {}, 'written': [], 'gaps': {}}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                self._state = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._state, f)
+        os.replace(tmp_path, self.path)
+
+    def _write_hour(self, hour):
+        """Store an hour's per-minute samples once every shard has been fetched"""
+        from services.database import Database
+
+        with self._lock:
+            chunks = {shard: self._state['chunks'].get(f'{shard}:{hour}') for shard in self.shards}
+        if any(chunk is None for chunk in chunks.values()):
+            return False
+
+        tx = np.sum([chunk['tx'] for chunk in chunks.values()], axis=0)
+        samples = []
+        for minute in range(HOUR // MINUTE):
+            shards = {
+                # Average transactions per block, comparable with the live latest-block counts
+                shard_label(shard): round(chunk['tx'][minute] / chunk['blocks'][minute], 2)
+                for shard, chunk in chunks.items() if chunk['blocks'][minute]
+            }
+            samples.append({
+                'tps': round(float(tx[minute]) / MINUTE, 2),
+                'shards': shards,
+                'last_updated': datetime.fromtimestamp(hour + minute * MINUTE)
+            })
+        Database().write_cycle(tps=samples)
+
+        missing = sum(chunk.get('missing', 0) for chunk in chunks.values())
+        with self._lock:
+            for shard in self.shards:
+                del self._state['chunks'][f'{shard}:{hour}']
+            self._state['written'].append(hour)
+            if missing:
+                self._state.setdefault('gaps', {})[str(hour)] = missing
+        return True
+
+    def run(self):
+        """Fetch and store everything missing; returns the number of hours written"""
+        self._load()
+        if self.shards is None:
+            self.shards = self._state.get('shards') or discover_shards()
+        self._state['shards'] = self.shards
+
+        written = set(self._state['written'])
+        hours = [hour for hour in range(self.start, self.end, HOUR) if hour not in written]
+        # Hours fetched completely before an interruption are written first
+        hours_written = sum(self._write_hour(hour) for hour in hours)
+        written = set(self._state['written'])
+        pending = [
+            (shard, hour)
+            for hour in hours if hour not in written
+            for shard in self.shards if f'{shard}:{hour}' not in self._state['chunks']
+        ]
+        logging.info(f"TPS backfill: {len(pending)} chunks to fetch for {len(hours)} hours")
+
+        finished = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(fetch_chunk, shard, hour): (shard, hour) for shard, hour in pending}
+            for future in as_completed(futures):
+                shard, hour = futures[future]
+                try:
+                    chunk = future.result()
+                except Exception as e:
+                    backfill_chunks_total.inc(result='failed')
+                    logging.warning(f"TPS backfill chunk {shard}:{hour} failed, will retry on the next run: {e}")
+                    continue
+                if chunk['missing']:
+                    backfill_chunks_total.inc(result='incomplete')
+                    logging.warning(f"TPS backfill chunk {shard}:{hour}: {chunk['missing']} blocks missing between nonces")
+                else:
+                    backfill_chunks_total.inc(result='fetched')
+                with self._lock:
+                    self._state['chunks'][f'{shard}:{hour}'] = chunk
+                hours_written += self._write_hour(hour)
+                finished += 1
+                if finished % CHECKPOINT_EVERY == 0:
+                    self._save()
+                    logging.info(f"TPS backfill: {finished}/{len(pending)} chunks")
+        self._save()
+        return hours_written
+
+    @property
+    def complete(self):
+        return len(self._state['written']) == (self.end - self.start) // HOUR
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # python -m services.tps_backfill --days 30
+    parser = argparse.ArgumentParser(description='Backfill per-minute TPS history into tps_samples')
+    parser.add_argument(
+        '--days', type=float, default=1.0, help=f'how far back from now, at most {BACKFILL_HORIZON_DAYS}'
+    )
+    parser.add_argument('--end', type=float, default=None, help='end of the range, epoch seconds')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    now = time.time()
+    end = args.end or now
+    if end - args.days * 86400 < now - BACKFILL_HORIZON_DAYS * 86400:
+        parser.error(f"the range must start within the last {BACKFILL_HORIZON_DAYS} days")
+    backfill = TPSBackfill(end - args.days * 86400, end, workers=args.workers)
+    t0 = time.perf_counter()
+    hours = backfill.run()
+    state = 'complete' if backfill.complete else 'incomplete, rerun to resume'
+    print(f"Wrote {hours} hours in {time.perf_counter() - t0:.0f} s ({state}); checkpoint {backfill.path}")
@@ -1,8 +1,16 @@
+import logging
 import threading
 import time
-import requests
 from datetime import datetime
-import streamlit as st
+
+from services import http_client, snapshot
+from services.broadcaster import tps_channel
+from services.shard_stats import BLOCK_FIELDS, BlockWindow, observed_round_time
+
+# Seconds between samples
+SAMPLE_INTERVAL = 6
+# A stored sample older than this means the leader stopped sampling
+STALE_AFTER = 5 * SAMPLE_INTERVAL
 
 class TPSUpdater:
     def __init__(self):
@@ -11,8 +19,17 @@ class TPSUpdater:
             'Accept': 'application/json'
         }
         self.running = False
+        # Only the collector leader samples the API; other replicas read its samples
+        self.collecting = False
         self.thread = None
         self._current_tps = 0
+        # Epoch seconds of the sample behind current_tps, and whether the
+        # latest attempt to replace it failed
+        self._last_updated = None
+        self._stale = False
+        self._shard_tx_counts = {}
+        self._shard_stats = {}
+        self.blocks = BlockWindow()
         self._lock = threading.Lock()
 
     @property
@@ -20,56 +37,124 @@ class TPSUpdater:
         with self._lock:
             return self._current_tps
 
+    @property
+    def last_updated(self):
+        with self._lock:
+            return self._last_updated
+
+    @property
+    def stale(self):
+        """True while current_tps is the last good value of a failing sampler"""
+        with self._lock:
+            return self._stale
+
+    @property
+    def shard_tx_counts(self):
+        """Transaction count of the latest block per shard"""
+        with self._lock:
+            return dict(self._shard_tx_counts)
+
+    @property
+    def shard_stats(self):
+        """Per-shard analytics over the recent block window"""
+        with self._lock:
+            return dict(self._shard_stats)
+
     def calculate_tps(self):
-        try:
-            blocks_response = requests.get(
-                f"{self.base_url}/blocks?size=100",
-                headers=self.headers
-            )
-            blocks_response.raise_for_status()
-            blocks = blocks_response.json()
-
-            if not blocks:
-                return 0
-
-            latest_blocks = {}
-            for block in blocks:
-                shard = block.get('shard', 0)
-                if shard not in latest_blocks:
-                    latest_blocks[shard] = block
-                elif block.get('round', 0) > latest_blocks[shard].get('round', 0):
-                    latest_blocks[shard] = block
-
-            total_tx_count = 0
-            total_time = 6  # seconds per round
-
-            # Process regular shards (0,1,2)
-            for shard in [0, 1, 2]:
-                if shard in latest_blocks:
-                    tx_count = latest_blocks[shard].get('txCount', 0)
-                    total_tx_count += tx_count
-
-            # Process metachain (4294967295)
-            if 4294967295 in latest_blocks:
-                meta_tx_count = latest_blocks[4294967295].get('txCount', 0)
-                total_tx_count += meta_tx_count
-
-            tps = total_tx_count / total_time if total_time > 0 else 0
-            return round(tps, 2)
+        """Headline TPS from each shard's latest block, plus per-shard window analytics.
+
+        Raises when the blocks cannot be fetched; there is no TPS to report then.
+        """
+        blocks_response = http_client.get(
+            f"{self.base_url}/blocks",
+            endpoint='/blocks',
+            params={'size': 100, 'fields': BLOCK_FIELDS},
+            headers=self.headers
+        )
+        blocks_response.raise_for_status()
+        blocks = blocks_response.json()
+        if not blocks:
+            raise ValueError("/blocks returned no blocks")
 
+        self.blocks.add(blocks)
+        shard_stats = self.blocks.stats()
+        shard_tx_counts = {label: stats['latest_tx_count'] for label, stats in shard_stats.items()}
+
+        with self._lock:
+            self._shard_tx_counts = shard_tx_counts
+            self._shard_stats = shard_stats
+
+        tps = sum(shard_tx_counts.values()) / observed_round_time(shard_stats)
+        return round(tps, 2)
+
+    def set_collecting(self, collecting):
+        self.collecting = collecting
+
+    def _store_sample(self, tps, shards, shard_stats):
+        """Queue the sample for the collectors' next refresh cycle write"""
+        from services import refresh_cycle
+        refresh_cycle.add_sample('tps', {'tps': tps, 'shards': shards, 'shard_stats': shard_stats})
+
+    def _collect(self):
+        """Sample the API and queue the sample for storage; None if sampling failed"""
+        try:
+            tps = self.calculate_tps()
         except Exception:
-            return 0
+            logging.exception("TPS sampling failed; keeping the last good value")
+            return None
+        shards, shard_stats = self.shard_tx_counts, self.shard_stats
+        self._store_sample(tps, shards, shard_stats)
+        return tps, shards, shard_stats, int(time.time())
+
+    def _read_sample(self):
+        """Latest sample stored by the collector leader, or None if there is no fresh one"""
+        from services.database import Database
+        try:
+            sample = Database().get_latest_tps_sample()
+        except Exception as e:
+            logging.warning(f"Could not read TPS sample: {e}")
+            return None
+        if sample is None:
+            return None
+        last_updated = sample['last_updated']
+        if isinstance(last_updated, str):
+            # text() reads return SQLite timestamps unparsed
+            last_updated = datetime.fromisoformat(last_updated)
+        last_updated = int(last_updated.timestamp())
+        if time.time() - last_updated > STALE_AFTER:
+            return None
+        return sample['tps'], sample['shards'], sample['shard_stats'], last_updated
+
+    def _publish(self, tps, shards, shard_stats, last_updated):
+        with self._lock:
+            self._current_tps = tps
+            self._shard_tx_counts = shards
+            self._shard_stats = shard_stats
+            self._last_updated = last_updated
+            self._stale = False
+        # Its own section: the page and collector republish network_stats whole
+        snapshot.publish('tps', {'tps': tps, 'shards': shards, 'stale': False, 'last_updated': last_updated})
+        snapshot.publish('shard_stats', shard_stats)
+        tps_channel.publish({
+            'tps': tps,
+            'shards': shards,
+            'timestamp': last_updated
+        })
 
     def update_tps(self):
         while self.running:
             try:
-                tps = self.calculate_tps()
-                with self._lock:
-                    self._current_tps = tps
-                time.sleep(6)
+                sample = self._collect() if self.collecting else self._read_sample()
+                if sample is not None:
+                    self._publish(*sample)
+                else:
+                    # Nothing new: viewers keep the last good value, flagged as stale
+                    with self._lock:
+                        self._stale = True
+                    snapshot.merge('tps', stale=True)
             except Exception as e:
                 print(f"Error updating TPS: {e}")
-                time.sleep(6)
+            time.sleep(SAMPLE_INTERVAL)
 
     def start(self):
         if not self.running:
@@ -81,4 +166,23 @@ class TPSUpdater:
         if self.running:
             self.running = False
             if self.thread:
-                self.thread.join() 
\ No newline at end of file
+                self.thread.join()
+
+
+_tps_updater = None
+_tps_updater_lock = threading.Lock()
+
+
+def get_tps_updater():
+    """Return the process-wide TPS sampler, starting it on first use.
+
+    One sampler feeds every session and every /tps/stream subscriber, so
+    upstream load does not grow with the number of viewers. It reads the
+    stored samples until the collector election makes it sample the API.
+    """
+    global _tps_updater
+    with _tps_updater_lock:
+        if _tps_updater is None:
+            _tps_updater = TPSUpdater()
+            _tps_updater.start()
+        return _tps_updater
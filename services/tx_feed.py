@@ -0,0 +1,150 @@
+import logging
+import threading
+from collections import deque
+
+from services.broadcaster import Broadcaster
+from services.multiversx import get_multiversx_service
+from utils import denomination
+from utils.metrics import REGISTRY
+
+FEED_SIZE = 500
+PAGE_SIZE = 100
+# Catch-up limit per poll; beyond it the gap is logged and counted
+MAX_PAGES = 50
+# Every poll re-reads this many seconds before the newest timestamp seen,
+# so transactions indexed late with an earlier timestamp are still picked up
+LOOKBACK_SECONDS = 30
+# Entries sent to a new or lagging subscriber in place of the deltas it missed
+RESYNC_SIZE = 50
+
+
+def _resync():
+    """Current feed state for transactions_channel subscribers"""
+    transactions = _feed.latest(RESYNC_SIZE) if _feed is not None else []
+    return {'type': 'resync', 'transactions': transactions[::-1]}
+
+
+transactions_channel = Broadcaster('transactions', queue_size=16, state=_resync)
+
+feed_transactions_total = REGISTRY.counter(
+    'mvx_tx_feed_transactions_total',
+    'Transactions fetched by the live feed, by result',
+    ('result',)
+)
+feed_bytes_total = REGISTRY.counter(
+    'mvx_tx_feed_bytes_total',
+    'Response bytes downloaded by the live feed',
+    ()
+)
+feed_truncated_total = REGISTRY.counter(
+    'mvx_tx_feed_truncated_polls_total',
+    'Polls that hit MAX_PAGES before catching up',
+    ()
+)
+
+
+def _record(tx):
+    """Feed entry; timestamps stay epoch seconds and are formatted by the viewer"""
+    return {
+        'hash': tx.get('txHash', ''),
+        'from': tx.get('sender', ''),
+        'to': tx.get('receiver', ''),
+        'value': tx.get('value', '0'),
+        'amount': denomination.to_float(tx.get('value')),
+        'timestamp': int(tx.get('timestamp', 0))
+    }
+
+
+class TransactionFeed:
+    """Gap-free stream of the newest network transactions.
+
+    The first poll seeds the feed with the latest page. After that each
+    poll asks for everything from LOOKBACK_SECONDS before the newest
+    timestamp seen, oldest first, and pages forward until a short page
+    shows it has caught up. The re-read window catches transactions the
+    API indexes late; repeats are dropped by hash. Seen hashes are kept
+    for as long as they can come back in that window, independently of
+    the bounded deque of entries shown to viewers. Each poll's new
+    transactions are published to transactions_channel as one delta.
+    """
+
+    def __init__(self, service=None, maxlen=FEED_SIZE):
+        self.service = service or get_multiversx_service()
+        self._recent = deque(maxlen=maxlen)
+        # hash -> timestamp for everything inside the lookback window
+        self._seen = {}
+        self._cursor = None
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def _add(self, transactions):
+        """Append unseen transactions (oldest first) and return them"""
+        added = []
+        with self._lock:
+            for tx in transactions:
+                tx_hash = tx.get('txHash')
+                if not tx_hash or tx_hash in self._seen:
+                    feed_transactions_total.inc(result='duplicate')
+                    continue
+                record = _record(tx)
+                self._recent.append(record)
+                self._seen[tx_hash] = record['timestamp']
+                if self._cursor is None or record['timestamp'] > self._cursor:
+                    self._cursor = record['timestamp']
+                added.append(record)
+            self._forget()
+        feed_transactions_total.inc(len(added), result='new')
+        return added
+
+    def _forget(self):
+        """Drop hashes too old to be returned by the next lookback query"""
+        if self._cursor is None:
+            return
+        horizon = self._cursor - LOOKBACK_SECONDS
+        for tx_hash in [tx_hash for tx_hash, timestamp in self._seen.items() if timestamp < horizon]:
+            del self._seen[tx_hash]
+
+    def _fetch(self, **kwargs):
+        transactions, size = self.service.get_transactions(size=PAGE_SIZE, **kwargs)
+        feed_bytes_total.inc(size)
+        return transactions
+
+    def poll(self):
+        """Fetch transactions since the last poll; returns the new ones, oldest first"""
+        with self._poll_lock:
+            if self._cursor is None:
+                new = self._add(reversed(self._fetch(order='desc')))
+            else:
+                after = self._cursor - LOOKBACK_SECONDS
+                new = []
+                for page in range(MAX_PAGES):
+                    transactions = self._fetch(after=after, order='asc', offset=page * PAGE_SIZE)
+                    new += self._add(transactions)
+                    if len(transactions) < PAGE_SIZE:
+                        break
+                else:
+                    feed_truncated_total.inc()
+                    logging.warning(f"Transaction feed fell more than {MAX_PAGES * PAGE_SIZE} transactions behind")
+
+        if new:
+            transactions_channel.publish({'type': 'delta', 'transactions': new})
+        return new
+
+    def latest(self, count=10):
+        """Most recently added `count` entries, newest first"""
+        with self._lock:
+            count = min(count, len(self._recent))
+            return [self._recent[-i] for i in range(1, count + 1)]
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_transaction_feed():
+    """Return the process-wide feed"""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = TransactionFeed()
+        return _feed
@@ -1,57 +1,197 @@
-import schedule
-import time
-from threading import Thread
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from services.database import Database
-from services.multiversx import MultiversXService
-from services.coinmarketcap import CoinMarketCapService
+from services.multiversx import get_multiversx_service
+from services.coinmarketcap import get_coinmarketcap_service
+from services import node_registry, refresh_cycle, snapshot
+from services.address_book import WALLETS
+from services.leader import LeaderElection
+from services.tps_backfill import BACKFILL_HORIZON_DAYS
+from services.tps_updater import get_tps_updater
+from services.tx_feed import get_transaction_feed
+from services.scheduler import Scheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+from utils import metrics
 
-def update_all_data():
-    """Update all data in database"""
+# Stored TPS samples older than this are pruned daily; kept past the
+# backfill horizon so a full backfill is not pruned away as it ages
+TPS_RETENTION_DAYS = BACKFILL_HORIZON_DAYS + 7
+# Newest feed transactions stored for the page's transactions table
+RECENT_TRANSACTIONS = 10
+# Results collected within this window are written in one transaction;
+# matches the TPS sample period so followers see each sample promptly
+CYCLE_SECONDS = 6
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_election = None
+_election_lock = threading.Lock()
+
+def collect_wallet(name, address):
+    """Fetch, archive and summarize one exchange wallet"""
+    # pyarrow is only needed once a collector runs, so keep it off the import path
+    from services.archive import get_archive
+
+    mx = get_multiversx_service()
+    history = mx.get_wallet_history(address)
+    # The archive keeps everything fetched, beyond the dashboard's 30 days
+    get_archive().append(name, history['transfers'])
+    return mx.summarize_wallet(history)
+
+def refresh_wallet(name, address):
+    """Refresh one exchange wallet into the pending refresh cycle"""
+    data = collect_wallet(name, address)
+    refresh_cycle.add_wallet(f'{name}_wallet', data)
+    return data
+
+def _store(name, data):
+    """Publish a dataset locally and queue it for the shared store followers read"""
+    snapshot.publish(name, data)
+    refresh_cycle.add_dataset(name, data)
+    return data
+
+def refresh_market_data():
+    market_data = _store('market_data', get_coinmarketcap_service().get_market_data())
+    refresh_cycle.add_sample('market', market_data)
+    return market_data
+
+def refresh_network_stats():
+    network_stats = _store('network_stats', get_multiversx_service().get_network_stats())
+    refresh_cycle.add_sample('network', network_stats)
+    return network_stats
+
+def refresh_volume_data():
+    return _store('volume_data', get_coinmarketcap_service().get_exchange_volumes())
+
+def write_cycle():
+    """Store everything the collectors gathered since the last write, in one transaction"""
+    refresh_cycle.flush()
+
+def refresh_transactions():
+    feed = get_transaction_feed()
+    feed.poll()
+    return _store('recent_transactions', feed.latest(RECENT_TRANSACTIONS))
+
+def refresh_staking_stats():
+    return _store('staking_stats', get_multiversx_service().get_staking_stats())
+
+def refresh_staking_identities():
+    return _store('staking_identities', get_multiversx_service().get_staking_identities())
+
+def refresh_node_registry():
+    summary = node_registry.refresh()
+    snapshot.publish('nodes', summary)
+    refresh_cycle.add_dataset('node_registry', summary)
+    return summary
+
+def prune_tps_samples():
     db = Database()
-    mx = MultiversXService()
-    cmc = CoinMarketCapService()
-    
     try:
-        # Update wallet data
-        wallets = {
-            'binance': 'erd1sdslvlxvfnnflzj42l8czrcngq3xjjzkjp3rgul4ttk6hntr4qdsv6sets',
-            'binance_cold': 'erd1v4ms58e22zjcp08suzqgm9ajmumwxcy4hfkdc23gvynnegjdflmsj6gmaq',
-            'upbit': 'erd1hqamcl7hacu28q0l2kh7jt0vs6tjfhq4vp2tv7hufkx3phu0jn5ql3qw7x',
-            'bybit': 'erd1vj3efd5czwearu0gr3vjct8ef53lvtl7vs42vts2kh2qn3cucrnsj7ymqx',
-            'gateio': 'erd1p4vy5n9mlkdys7xczegj398xtyvw2nawz00nnfh4yr7fpjh297cqtsu7lw',
-            'bitfinex': 'erd1a56dkgcpwwx6grmcvw9w5vpf9zeq53w3w7n6dmxcpxjry3l7uh2s3h9dtr',
-            'cryptocom': 'erd1hzccjg25yqaqnr732x2ka7pj5glx72pfqzf05jj9hxqn3lxkramq5zu8h4',
-            'kraken': 'erd1nmtkpqzhkla5yreu2dlyzm9fm8v902wjhvzu7xjjkd8ppefmtlws7qvx2a',
-            'bitget': 'erd1w547kw69kpd60vlpr9pe0pn9nnqeljrcaz73znenjpgt0h3qlqqqm3szxj',
-            'mexc': 'erd1ezp86jwmcp4fmmu2mfqz0438py392z5wp6kzuqsjldgd68nwt89qshfs0y',
-            'coinbase': 'erd16jruked88jgtsar78ej85hjp3qsd9jkjcw4swsn7k0teqh3wgcqqgyrupq'
-        }
-        
-        for name, address in wallets.items():
-            data = mx.get_wallet_balance(address)
-            db.update_wallet_data(f'{name}_wallet', data)
-            time.sleep(1)  # Prevent rate limiting
-            
-        # Update other data types...
-            
+        db.prune_tps_samples(TPS_RETENTION_DAYS)
     finally:
         db.close()
 
-def run_scheduler():
-    """Run the scheduler in a separate thread"""
-    schedule.every(10).minutes.do(update_all_data)
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+def _result_or_none(future, what):
+    try:
+        return future.result()
+    except Exception as e:
+        logging.error(f"Refresh cycle: {what} failed: {e}")
+        return None
+
+def update_all_data():
+    """Refresh every wallet plus a market and network sample, then store them together.
+
+    Fetches run in parallel under the host budgets and add their results
+    to the pending refresh cycle, which is then written in one
+    transaction. A failed fetch is left out of the cycle instead of
+    aborting it.
+    """
+    with metrics.timed(metrics.job_duration_seconds, job='update_all_data'):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = {
+                f'{name}_wallet': pool.submit(refresh_wallet, name, address)
+                for name, address in WALLETS.items()
+            }
+            futures['market data'] = pool.submit(refresh_market_data)
+            futures['network stats'] = pool.submit(refresh_network_stats)
+            for what, future in futures.items():
+                _result_or_none(future, what)
+        refresh_cycle.flush()
+
+def build_scheduler():
+    """Register every collector with its refresh interval and priority"""
+    scheduler = Scheduler(max_workers=4)
+    # Collectors only fetch; this job stores what they gathered, one transaction per cycle
+    scheduler.add_job('write_cycle', write_cycle, interval=CYCLE_SECONDS, priority=PRIORITY_HIGH)
+    scheduler.add_job('market_data', refresh_market_data, interval=60, priority=PRIORITY_HIGH)
+    scheduler.add_job('network_stats', refresh_network_stats, interval=30, priority=PRIORITY_HIGH)
+    scheduler.add_job('transactions', refresh_transactions, interval=6, priority=PRIORITY_HIGH)
+    scheduler.add_job('staking_stats', refresh_staking_stats, interval=5 * 60, priority=PRIORITY_NORMAL)
+    scheduler.add_job('volume_data', refresh_volume_data, interval=5 * 60, priority=PRIORITY_NORMAL)
+    scheduler.add_job('staking_identities', refresh_staking_identities, interval=30 * 60, priority=PRIORITY_LOW)
+    scheduler.add_job('node_registry', refresh_node_registry, interval=10 * 60, priority=PRIORITY_LOW)
+    scheduler.add_job('prune_tps_samples', prune_tps_samples, interval=24 * 3600, priority=PRIORITY_LOW)
+    for name, address in WALLETS.items():
+        # Wallet histories are independent; jitter spreads them over the interval
+        scheduler.add_job(
+            f'wallet:{name}',
+            lambda name=name, address=address: refresh_wallet(name, address),
+            interval=10 * 60,
+            priority=PRIORITY_LOW,
+            jitter=0.2
+        )
+    return scheduler
+
+def _start_collectors():
+    """Leadership acquired: run the scheduler and sample TPS from the API"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = build_scheduler()
+            _scheduler.start()
+    get_tps_updater().set_collecting(True)
+
+def _stop_collectors():
+    """Leadership lost: stop calling upstream and read what the leader stores"""
+    global _scheduler
+    get_tps_updater().set_collecting(False)
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.stop()
+    # What was collected while leading is still worth keeping
+    try:
+        refresh_cycle.flush()
+    except Exception as e:
+        logging.error(f"Could not store the last refresh cycle: {e}")
 
 def start_updater():
-    """Start the background updater thread"""
-    thread = Thread(target=run_scheduler, daemon=True)
-    thread.start()
+    """Join the collector election once per process.
+
+    Across replicas only the elected leader runs the scheduler and the TPS
+    sampler, so upstream load does not grow with the number of replicas.
+    """
+    global _election
+    with _election_lock:
+        if _election is None:
+            _election = LeaderElection('collectors', _start_collectors, _stop_collectors)
+            _election.start()
+        return _election
+
+def collector_role():
+    """'leader', 'follower' or None before start_updater()"""
+    if _election is None:
+        return None
+    return 'leader' if _election.is_leader else 'follower'
 
 def manual_update():
-    """Manually trigger data update"""
+    """Manually trigger data update; only the collector leader calls upstream.
+
+    Returns False on a follower, which keeps reading what the leader stores.
+    """
+    if collector_role() == 'follower':
+        return False
     print("Starting manual data update...")
     update_all_data()
-    print("Manual update completed!") 
\ No newline at end of file
+    print("Manual update completed!")
+    return True
@@ -1,7 +1,12 @@
 import streamlit as st
 from datetime import datetime
 import time
-import threading
+
+from utils.metrics import RenderTimer
+
+# Time to first paint: everything up to the page header is the 'startup' section
+render_timer = RenderTimer()
+render_timer.lap('startup')
 
 # REFRESH LOGIC - MUST BE AT THE VERY TOP
 if 'last_refresh' not in st.session_state:
@@ -12,31 +17,29 @@ if (datetime.now() - st.session_state.last_refresh).seconds >= 6:
     st.session_state.last_refresh = datetime.now()
     st.rerun()
 
-import plotly.graph_objects as go
-import pandas as pd
-import logging
-import plotly.express as px
-from streamlit.runtime.scriptrunner import get_script_run_ctx
-
-from services.multiversx import MultiversXService
-from services.coinmarketcap import CoinMarketCapService
-from components.charts import create_price_chart, create_volume_chart, create_wallet_chart, create_tps_gauge
-from components.metrics import display_metrics
+# Plotting, pandas, the analytics modules and the diagnostics panel are
+# imported in the sections that use them, so the header paints before those
+# modules load
+from services.multiversx import get_multiversx_service
+from services.address_book import WALLETS
+from services.coinmarketcap import get_coinmarketcap_service
+from components.metrics import display_freshness
 from utils.cache import get_cached_data
 from services.database import Database
 from services.updater import start_updater, manual_update
-from services.tps_updater import TPSUpdater
+from services.tps_updater import get_tps_updater
 from components.tps_component import tps_gauge_component
 from components.tps_display import tps_display
+from services.api_server import start_api_server
+from services import snapshot
 
 # Initialize session state
 if 'tps_key' not in st.session_state:
     st.session_state['tps_key'] = 0
 
-# Initialize TPS updater if not already done
+# One TPS sampler per process feeds every session and the /tps/stream channel
 if 'tps_updater' not in st.session_state:
-    st.session_state.tps_updater = TPSUpdater()
-    st.session_state.tps_updater.start()
+    st.session_state.tps_updater = get_tps_updater()
 
 def update_tps_gauge():
     """Callback to update only the TPS gauge"""
@@ -65,39 +68,36 @@ st.markdown(f"""
     </script>
     """, unsafe_allow_html=True)
 
-# Initialize services
-mx_service = MultiversXService()
-cmc_service = CoinMarketCapService()
+# Services are built once per process, on first use
+mx_service = get_multiversx_service()
+cmc_service = get_coinmarketcap_service()
 
-# Initialize database and start updater
-db = Database()
-start_updater()  # This starts the background task to update data every 10 minutes
+start_updater()  # Joins the collector election; the leader refreshes data in the background
+start_api_server()  # Serves /metrics and the JSON snapshot next to the app
 
 # At the top of main.py, after imports
 if 'tps_container' not in st.session_state:
     st.session_state.tps_container = st.empty()
 
-# At the top of main.py, after imports
-st.markdown("""
-    <script>
-        function refreshTPS() {
-            const tpsGauge = document.getElementById('tps-gauge');
-            if (tpsGauge) {
-                tpsGauge.contentWindow.location.reload();
-            }
-        }
-        setInterval(refreshTPS, 6000);
-    </script>
-""", unsafe_allow_html=True)
-
 # Main content
 st.title("MultiversX Network Overview")
 st.markdown("Real-time insights into the MultiversX blockchain ecosystem")
 
 # Network and Staking Statistics
+render_timer.lap('network_overview')
 st.markdown("### 🌐 Network & Staking Overview")
-network_stats = get_cached_data('network_stats', mx_service.get_network_stats, ttl_minutes=5)
-staking_stats = get_cached_data('staking_stats', mx_service.get_staking_stats, ttl_minutes=5)
+network_stats = get_cached_data(
+    'network_stats', mx_service.get_network_stats, ttl_minutes=5,
+    default=mx_service.default_network_stats()
+)
+staking_stats = get_cached_data(
+    'staking_stats', mx_service.get_staking_stats, ttl_minutes=5,
+    default=mx_service.default_staking_stats()
+)
+display_freshness('network_stats')
+display_freshness('staking_stats')
+snapshot.publish('network_stats', network_stats)
+snapshot.publish('staking_stats', staking_stats)
 
 # Create TPS container at the top level
 if 'tps_container' not in st.session_state:
@@ -112,58 +112,17 @@ with col1:
     st.metric("Total Transactions", f"{network_stats['transactions']:,}")
     st.metric("Total Accounts", f"{network_stats['active_addresses']:,}")
     
-    # Create a placeholder for TPS gauge
-    if 'tps_placeholder' not in st.session_state:
-        st.session_state.tps_placeholder = st.empty()
-    
-    # Get current TPS
+    # Both update in the browser: the readout revalidates /network_stats,
+    # the gauge follows the /tps/stream push channel
     current_tps = st.session_state.tps_updater.current_tps
-    
-    # Create gauge figure
-    gauge_fig = go.Figure(go.Indicator(
-        mode = "gauge+number",
-        value = current_tps,
-        number = {'suffix': " TPS", 'font': {'size': 24}},
-        gauge = {
-            'axis': {'range': [None, 100], 'tickwidth': 1},
-            'bar': {'color': "darkblue"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 10], 'color': 'lightgray'},
-                {'range': [10, 30], 'color': 'gray'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 30
-            }
-        }
-    ))
-    
-    # Update layout
-    gauge_fig.update_layout(
-        height=150,
-        margin=dict(l=10, r=10, t=30, b=10),
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'color': "#808495"}
-    )
-    
-    # Display gauge
-    st.session_state.tps_placeholder.plotly_chart(
-        gauge_fig, 
-        use_container_width=True, 
-        config={'displayModeBar': False}
-    )
-    
-    # Force update every 6 seconds for just this component
-    if 'last_tps_update' not in st.session_state:
-        st.session_state.last_tps_update = time.time()
-    
-    if time.time() - st.session_state.last_tps_update >= 6:
-        st.session_state.last_tps_update = time.time()
-        st.session_state.tps_placeholder.empty()
+    tps_display(current_tps)
+    tps_gauge_component(current_tps)
+    if st.session_state.tps_updater.stale:
+        last_updated = st.session_state.tps_updater.last_updated
+        st.caption(
+            f"⚠️ TPS from {datetime.fromtimestamp(last_updated).strftime('%H:%M:%S')}; sampling is failing"
+            if last_updated else "⚠️ Waiting for the first TPS sample"
+        )
 
 with col2:
     st.markdown("#### Validator Statistics")
@@ -172,7 +131,10 @@ with col2:
     st.metric("Eligible Validators", f"{staking_stats['eligible_validators']:,}")
     st.metric("Waiting Validators", f"{staking_stats['waiting_validators']:,}")
     st.metric("Total Observers", f"{staking_stats['total_observers']:,}")
-    st.metric("Nakamoto Coefficient", f"{staking_stats['nakamoto_coefficient']}")
+    st.metric(
+        "Nakamoto Coefficient", f"{staking_stats['nakamoto_coefficient']}",
+        help=f"{staking_stats.get('nakamoto_coefficient_66', 0)} operators hold over 2/3 of the stake"
+    )
 
 with col3:
     st.markdown("#### Staking Metrics")
@@ -197,12 +159,120 @@ with col4:
         that would need to collude to control the network. A higher number 
         indicates better decentralization.
         """)
+        st.markdown(
+            f"Computed from the stake of {staking_stats.get('stake_entities', 0):,} operators "
+            f"(identities, and providers without one): "
+            f"**{staking_stats['nakamoto_coefficient']}** can halt consensus (over 1/3 of the stake), "
+            f"**{staking_stats.get('nakamoto_coefficient_66', 0)}** can control it (over 2/3). "
+            f"Stake Gini {staking_stats.get('stake_gini', 0):.3f}, "
+            f"HHI {staking_stats.get('stake_hhi', 0):,.0f} (out of 10,000)."
+        )
+
+# Per-shard analytics over the sampler's rolling block window
+render_timer.lap('shard_health')
+shard_stats = st.session_state.tps_updater.shard_stats
+if shard_stats:
+    with st.expander("🧩 Shard Health (recent blocks)"):
+        st.dataframe(
+            [
+                {
+                    'Shard': label,
+                    'Blocks': stats['blocks'],
+                    'Tx/Block': round(stats['tx_per_block'], 1),
+                    'TPS': round(stats['tps'], 2) if stats['tps'] is not None else None,
+                    'Round Time (s)': round(stats['round_time'], 2) if stats['round_time'] else None,
+                    'Missed Rounds': f"{stats['missed_rounds']} ({stats['missed_ratio']:.1%})",
+                    'Empty Blocks': f"{stats['empty_ratio']:.0%}",
+                    'Avg Size (B)': round(stats['avg_size']) if stats['avg_size'] is not None else None,
+                    'Gas Used': f"{stats['gas_utilization']:.0%}" if stats['gas_utilization'] is not None else None,
+                    'Rounds Behind': stats['rounds_behind']
+                }
+                for label, stats in shard_stats.items()
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+
+# Validator nodes from the columnar registry; the collector scheduler refreshes it
+# each epoch, and within one once the table is an hour old
+render_timer.lap('node_registry')
+from services import node_registry
+nodes = get_cached_data('node_registry', node_registry.summary, ttl_minutes=10)
+if nodes and nodes['nodes']:
+    with st.expander(f"🖥️ Validator Nodes ({nodes['nodes']:,}, epoch {nodes['epoch']})"):
+        if nodes.get('fetched_at'):
+            st.caption(f"Node list fetched {(time.time() - nodes['fetched_at']) / 60:.0f} min ago")
+        st.dataframe(
+            [
+                {
+                    'Shard': label,
+                    'Nodes': shard['nodes'],
+                    'Eligible': shard.get('eligible', 0),
+                    'Waiting': shard.get('waiting', 0),
+                    'Jailed': shard.get('jailed', 0),
+                    'Stake (EGLD)': round(shard['stake']),
+                    'Avg Rating': round(shard['avg_rating'], 1)
+                }
+                for label, shard in nodes['shards'].items()
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        st.dataframe(
+            [
+                {
+                    'Provider': provider['provider'] or 'No provider',
+                    'Nodes': provider['nodes'],
+                    'Stake (EGLD)': round(provider['stake']),
+                    'Jailed': provider['jailed'],
+                    'Avg Rating': round(provider['avg_rating'], 1)
+                }
+                for provider in nodes['providers']
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        for diff in nodes['epochs'][:5]:
+            st.caption(
+                f"Epoch {diff['previous_epoch']} → {diff['epoch']}: {diff['joined_count']} joined, "
+                f"{diff['left_count']} left, {diff['jailed_count']} jailed"
+            )
+
+# Newest network transactions from the live feed the collector leader polls
+render_timer.lap('recent_transactions')
+st.markdown("### 🔄 Recent Transactions")
+recent_transactions = get_cached_data(
+    'recent_transactions', mx_service.get_recent_transactions, ttl_minutes=0.1, default=[]
+)
+if recent_transactions:
+    st.dataframe(
+        [
+            {
+                'Time': datetime.fromtimestamp(tx['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+                'Hash': f"{tx['hash'][:10]}…{tx['hash'][-6:]}",
+                'From': f"{tx['from'][:10]}…{tx['from'][-6:]}",
+                'To': f"{tx['to'][:10]}…{tx['to'][-6:]}",
+                'Amount (EGLD)': f"{tx['amount']:,.4f}"
+            }
+            for tx in recent_transactions
+        ],
+        hide_index=True,
+        use_container_width=True
+    )
+else:
+    st.caption("No transactions received yet")
 
 # Market metrics
+render_timer.lap('market_overview')
 with st.container():
     st.markdown("### 📈 Market Overview")
     col1, col2, col3, col4, col5 = st.columns(5)  # Added one more column
-    market_data = get_cached_data('market_data', cmc_service.get_market_data, ttl_minutes=1)
+    market_data = get_cached_data(
+        'market_data', cmc_service.get_market_data, ttl_minutes=1,
+        default=cmc_service.default_market_data()
+    )
+    display_freshness('market_data')
+    snapshot.publish('market_data', market_data)
 
     if all(v == 0 for v in market_data.values()):
         st.warning("⚠️ Unable to fetch market data. Please check back later.")
@@ -285,6 +355,7 @@ with st.container():
         """, unsafe_allow_html=True)
 
 # Replace the current price chart section with TradingView widget
+render_timer.lap('price_chart')
 st.markdown("### 📈 Price Chart")
 
 # Add TradingView widget
@@ -330,8 +401,11 @@ with st.expander("💡 About This Chart"):
     """)
 
 # Charts section
+render_timer.lap('market_analysis')
 st.markdown("### 📊 Market Analysis")
 
+from components.charts import create_volume_chart, create_wallet_chart
+
 # Volume Distribution Chart
 volume_data = get_cached_data('volume_data',
                              lambda: cmc_service.get_exchange_volumes(),
@@ -352,113 +426,61 @@ else:
     st.error("Unable to fetch volume distribution data")
 
 # Exchange Wallets Monitor Section
+render_timer.lap('exchange_wallets')
 st.markdown("### 💰 Exchange Wallets Monitor")
 
-# Exchange wallet addresses and data fetching
-binance_address = "erd1sdslvlxvfnnflzj42l8czrcngq3xjjzkjp3rgul4ttk6hntr4qdsv6sets"
-binance_data = get_cached_data(
-    'binance_wallet',
-    lambda: mx_service.get_wallet_balance(binance_address),
-    ttl_minutes=5
-)
-
-bybit_address = "erd1vj3efd5czwearu0gr3vjct8ef53lvtl7vs42vts2kh2qn3cucrnsj7ymqx"
-bybit_data = get_cached_data(
-    'bybit_wallet',
-    lambda: mx_service.get_wallet_balance(bybit_address),
-    ttl_minutes=5
-)
-
-upbit_address = "erd1hqamcl7hacu28q0l2kh7jt0vs6tjfhq4vp2tv7hufkx3phu0jn5ql3qw7x"
-upbit_data = get_cached_data(
-    'upbit_wallet',
-    lambda: mx_service.get_wallet_balance(upbit_address),
-    ttl_minutes=5
-)
-
-gateio_address = "erd1p4vy5n9mlkdys7xczegj398xtyvw2nawz00nnfh4yr7fpjh297cqtsu7lw"
-gateio_data = get_cached_data(
-    'gateio_wallet',
-    lambda: mx_service.get_wallet_balance(gateio_address),
-    ttl_minutes=5
-)
-
-bitfinex_address = "erd1a56dkgcpwwx6grmcvw9w5vpf9zeq53w3w7n6dmxcpxjry3l7uh2s3h9dtr"
-bitfinex_data = get_cached_data(
-    'bitfinex_wallet',
-    lambda: mx_service.get_wallet_balance(bitfinex_address),
-    ttl_minutes=5
-)
-
-cryptocom_address = "erd1hzccjg25yqaqnr732x2ka7pj5glx72pfqzf05jj9hxqn3lxkramq5zu8h4"
-cryptocom_data = get_cached_data(
-    'cryptocom_wallet',
-    lambda: mx_service.get_wallet_balance(cryptocom_address),
-    ttl_minutes=5
-)
-
-kraken_address = "erd1nmtkpqzhkla5yreu2dlyzm9fm8v902wjhvzu7xjjkd8ppefmtlws7qvx2a"
-kraken_data = get_cached_data(
-    'kraken_wallet',
-    lambda: mx_service.get_wallet_balance(kraken_address),
-    ttl_minutes=5
-)
-
-bitget_address = "erd1w547kw69kpd60vlpr9pe0pn9nnqeljrcaz73znenjpgt0h3qlqqqm3szxj"
-bitget_data = get_cached_data(
-    'bitget_wallet',
-    lambda: mx_service.get_wallet_balance(bitget_address),
-    ttl_minutes=5
-)
-
-mexc_address = "erd1ezp86jwmcp4fmmu2mfqz0438py392z5wp6kzuqsjldgd68nwt89qshfs0y"
-mexc_data = get_cached_data(
-    'mexc_wallet',
-    lambda: mx_service.get_wallet_balance(mexc_address),
-    ttl_minutes=5
-)
-
-kucoin_address = "erd1ty4pvmjtl3mnsjvnsxgcpedd08fsn83f05tu0v5j23wnfce9p86snlkdyy"
-kucoin_data = get_cached_data(
-    'kucoin_wallet',
-    lambda: mx_service.get_wallet_balance(kucoin_address),
-    ttl_minutes=5
-)
-
-kucoin_cold_address = "erd1vtlpm6sxxvmgt43ldsrpswjrfcsudmradylpxn9jkp66ra3rkz4qruzvfw"
-kucoin_cold_data = get_cached_data(
-    'kucoin_cold_wallet',
-    lambda: mx_service.get_wallet_balance(kucoin_cold_address),
-    ttl_minutes=5
-)
-
-# Add Coinbase cold wallet fetch
-coinbase_cold_address = "erd16xta8867juxzm0sqmfevpa5karkd3l5k9cspns6zj28auv7nugqqpph374"
-coinbase_cold_data = get_cached_data(
-    'coinbase_cold_wallet',
-    lambda: mx_service.get_wallet_balance(coinbase_cold_address),
-    ttl_minutes=5
-)
+# Every collected wallet is loaded, including ones without a section below,
+# so the flow matrix and rolling flows are fed from the same stored data on
+# the collector leader and on followers
+wallet_data = {
+    name: get_cached_data(
+        f'{name}_wallet',
+        lambda address=address: mx_service.get_wallet_balance(address),
+        ttl_minutes=5,
+        default=mx_service.default_wallet_data()
+    )
+    for name, address in WALLETS.items()
+}
 
 # Update exchanges_data dictionary
 exchanges_data = {
-    'Binance Hot': binance_data,
-    'Binance Cold': coinbase_cold_data,
-    'ByBit': bybit_data,
-    'Upbit': upbit_data,
-    'Gate.io': gateio_data,
-    'Bitfinex': bitfinex_data,
-    'Crypto.com': cryptocom_data,
-    'Kraken': kraken_data,
-    'KuCoin Hot': kucoin_data,
-    'KuCoin Cold': kucoin_cold_data,
-    'Bitget': bitget_data,
-    'MEXC': mexc_data,
-    'Coinbase Hot': binance_data,
-    'Coinbase Cold': coinbase_cold_data
+    'Binance Hot': wallet_data['binance'],
+    'Binance Cold': wallet_data['coinbase_cold'],
+    'ByBit': wallet_data['bybit'],
+    'Upbit': wallet_data['upbit'],
+    'Gate.io': wallet_data['gateio'],
+    'Bitfinex': wallet_data['bitfinex'],
+    'Crypto.com': wallet_data['cryptocom'],
+    'Kraken': wallet_data['kraken'],
+    'KuCoin Hot': wallet_data['kucoin'],
+    'KuCoin Cold': wallet_data['kucoin_cold'],
+    'Bitget': wallet_data['bitget'],
+    'MEXC': wallet_data['mexc'],
+    'Coinbase Hot': wallet_data['binance'],
+    'Coinbase Cold': wallet_data['coinbase_cold']
+}
+
+# Cache key behind each entry above, used to read its rolling flow aggregates
+exchange_wallet_keys = {
+    'Binance Hot': 'binance_wallet',
+    'Binance Cold': 'coinbase_cold_wallet',
+    'ByBit': 'bybit_wallet',
+    'Upbit': 'upbit_wallet',
+    'Gate.io': 'gateio_wallet',
+    'Bitfinex': 'bitfinex_wallet',
+    'Crypto.com': 'cryptocom_wallet',
+    'Kraken': 'kraken_wallet',
+    'KuCoin Hot': 'kucoin_wallet',
+    'KuCoin Cold': 'kucoin_cold_wallet',
+    'Bitget': 'bitget_wallet',
+    'MEXC': 'mexc_wallet',
+    'Coinbase Hot': 'binance_wallet',
+    'Coinbase Cold': 'coinbase_cold_wallet'
 }
 
 # Now create the summary section first
+render_timer.lap('exchanges_summary')
+from services import flows
 st.markdown("#### 📊 Exchanges Summary")
 
 # Calculate total metrics across all exchanges
@@ -470,24 +492,20 @@ col1, col2, col3 = st.columns(3)
 with col1:
     st.metric("Total Exchange Balance", f"{total_balance:,.2f} EGLD")
 
-# Calculate 24h flows across all exchanges
-total_inflow = 0
-total_outflow = 0
-for data in exchanges_data.values():
-    recent_transfers = [
-        tx for tx in data['transfers'] 
-        if (datetime.now() - tx['timestamp']).days < 1
-    ]
-    
-    total_inflow += sum(
-        tx['value'] for tx in recent_transfers 
-        if tx['action'] == 'incoming'
-    )
-    
-    total_outflow += sum(
-        tx['value'] for tx in recent_transfers 
-        if tx['action'] == 'outgoing'
-    )
+# 24h flows across all exchanges, maintained incrementally as transfers are ingested
+all_flows = flows.total(exchange_wallet_keys.values())
+total_inflow = all_flows['inflow_24h']
+total_outflow = all_flows['outflow_24h']
+
+snapshot.publish('wallets', {
+    'total_balance': total_balance,
+    'inflow_24h': total_inflow,
+    'outflow_24h': total_outflow,
+    'exchanges': {
+        name: {'balance': data['balance'], **flows.summary(exchange_wallet_keys[name])}
+        for name, data in exchanges_data.items()
+    }
+})
 
 with col2:
     st.metric(
@@ -504,8 +522,13 @@ with col3:
     )
 
 # Add exchange distribution table
+render_timer.lap('exchange_distribution')
 st.markdown("#### Exchange Distribution")
 
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
 # Add custom CSS for table styling
 st.markdown("""
     <style>
@@ -608,26 +631,88 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True, key="exchange_distribution_pie")
 
+# Large transfers flagged by the detector as wallet refreshes are ingested
+render_timer.lap('large_transfers')
+from services import large_transfers
+st.markdown("#### 🐋 Large Transfers")
+
+large_transfer_events = large_transfers.events(limit=25)
+if large_transfer_events:
+    wallet_labels = {}
+    for label, key in exchange_wallet_keys.items():
+        wallet_labels.setdefault(key, label)
+    st.dataframe(
+        pd.DataFrame([
+            {
+                'Time': datetime.fromtimestamp(event['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+                'Exchange': wallet_labels.get(event['wallet'], event['wallet']),
+                'Direction': event['direction'].capitalize(),
+                'Amount (EGLD)': f"{event['amount']:,.2f}",
+                'vs Median': f"{event['amount'] / event['median']:,.0f}×" if event['median'] else "N/A",
+                'Rule': event['reason'].capitalize()
+            }
+            for event in large_transfer_events
+        ]),
+        hide_index=True,
+        use_container_width=True
+    )
+else:
+    st.caption("No large transfers in the last 24 hours")
+
+# Net flows between exchanges, from the counterparties of every collected wallet
+render_timer.lap('inter_exchange_flows')
+from services import exchange_flows
+st.markdown("#### 🔁 Inter-Exchange Flows (30d)")
+
+flow_exchanges, flow_matrix = exchange_flows.net_matrix(days=30)
+if flow_exchanges:
+    fig = px.imshow(
+        flow_matrix,
+        x=flow_exchanges,
+        y=flow_exchanges,
+        color_continuous_scale='RdBu_r',
+        color_continuous_midpoint=0,
+        labels=dict(x="To", y="From", color="Net EGLD"),
+        aspect='auto'
+    )
+    fig.update_layout(
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)"
+    )
+    st.plotly_chart(fig, use_container_width=True, key="inter_exchange_flows")
+    with st.expander("Daily net flows"):
+        st.dataframe(
+            pd.DataFrame(exchange_flows.daily_net(days=30)[::-1]).rename(columns={
+                'date': 'Date (UTC)', 'from': 'From', 'to': 'To', 'amount': 'Net EGLD'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+else:
+    st.caption("No transfers between tracked exchanges in the last 30 days")
+
 # Now display individual wallet sections
+render_timer.lap('individual_wallets')
 st.markdown("#### Individual Exchange Wallets")
 
 # Add unique keys to all wallet charts
 exchange_sections = {
-    'Binance Hot Wallet': ('binance_chart', binance_data),
-    'ByBit Hot Wallet': ('bybit_chart', bybit_data),
-    'Upbit Hot Wallet': ('upbit_chart', upbit_data),
-    'Gate.io Hot Wallet': ('gateio_chart', gateio_data),
-    'Bitfinex Hot Wallet': ('bitfinex_chart', bitfinex_data),
-    'Crypto.com Hot Wallet': ('cryptocom_chart', cryptocom_data),
-    'Kraken Hot Wallet': ('kraken_chart', kraken_data),
-    'KuCoin Hot Wallet': ('kucoin_chart', kucoin_data),
-    'Bitget Hot Wallet': ('bitget_chart', bitget_data),
-    'MEXC Hot Wallet': ('mexc_chart', mexc_data),
-    'Coinbase Hot Wallet': ('coinbase_chart', binance_data)
+    'Binance Hot Wallet': ('binance_chart', wallet_data['binance'], 'binance_wallet'),
+    'ByBit Hot Wallet': ('bybit_chart', wallet_data['bybit'], 'bybit_wallet'),
+    'Upbit Hot Wallet': ('upbit_chart', wallet_data['upbit'], 'upbit_wallet'),
+    'Gate.io Hot Wallet': ('gateio_chart', wallet_data['gateio'], 'gateio_wallet'),
+    'Bitfinex Hot Wallet': ('bitfinex_chart', wallet_data['bitfinex'], 'bitfinex_wallet'),
+    'Crypto.com Hot Wallet': ('cryptocom_chart', wallet_data['cryptocom'], 'cryptocom_wallet'),
+    'Kraken Hot Wallet': ('kraken_chart', wallet_data['kraken'], 'kraken_wallet'),
+    'KuCoin Hot Wallet': ('kucoin_chart', wallet_data['kucoin'], 'kucoin_wallet'),
+    'Bitget Hot Wallet': ('bitget_chart', wallet_data['bitget'], 'bitget_wallet'),
+    'MEXC Hot Wallet': ('mexc_chart', wallet_data['mexc'], 'mexc_wallet'),
+    'Coinbase Hot Wallet': ('coinbase_chart', wallet_data['binance'], 'binance_wallet')
 }
 
 # Display individual wallet sections
-for title, (chart_key, data) in exchange_sections.items():
+for title, (chart_key, data, wallet_key) in exchange_sections.items():
     st.markdown(f"#### {title}")
     col1, col2 = st.columns([3, 1])
 
@@ -641,37 +726,12 @@ for title, (chart_key, data) in exchange_sections.items():
             f"{data['balance']:,.2f} EGLD"
         )
         
-        # Calculate 24h flows
-        recent_transfers = [
-            tx for tx in data['transfers'] 
-            if (datetime.now() - tx['timestamp']).days < 1
-        ]
-        
-        # Calculate previous day flows
-        prev_day_transfers = [
-            tx for tx in data['transfers'] 
-            if 1 <= (datetime.now() - tx['timestamp']).days < 2
-        ]
-        
-        # Current day flows
-        inflow_24h = sum(
-            tx['value'] for tx in recent_transfers 
-            if tx['action'] == 'incoming'
-        )
-        outflow_24h = sum(
-            tx['value'] for tx in recent_transfers 
-            if tx['action'] == 'outgoing'
-        )
-        
-        # Previous day flows
-        inflow_prev = sum(
-            tx['value'] for tx in prev_day_transfers 
-            if tx['action'] == 'incoming'
-        ) or 1  # Avoid division by zero
-        outflow_prev = sum(
-            tx['value'] for tx in prev_day_transfers 
-            if tx['action'] == 'outgoing'
-        ) or 1  # Avoid division by zero
+        # Current and previous day flows from the rolling aggregates
+        wallet_flows = flows.summary(wallet_key)
+        inflow_24h = wallet_flows['inflow_24h']
+        outflow_24h = wallet_flows['outflow_24h']
+        inflow_prev = wallet_flows['inflow_prev_24h'] or 1  # Avoid division by zero
+        outflow_prev = wallet_flows['outflow_prev_24h'] or 1  # Avoid division by zero
         
         # Calculate percentage changes
         inflow_change = ((inflow_24h - inflow_prev) / inflow_prev) * 100
@@ -709,6 +769,8 @@ for title, (chart_key, data) in exchange_sections.items():
             [View on Explorer](https://explorer.multiversx.com/accounts/{address})
             """)
 
+render_timer.finish()
+
 # Add this temporarily to check database status
 if st.sidebar.button("Check Database"):
     db = Database()
@@ -722,8 +784,14 @@ if st.sidebar.button("Check Database"):
     db.close()
 
 if st.sidebar.button("Update Data Now"):
-    manual_update()
-    st.sidebar.success("Data updated successfully!")
+    if manual_update():
+        st.sidebar.success("Data updated successfully!")
+    else:
+        st.sidebar.info("Another replica collects the data; it will show up with its next refresh.")
+
+with st.sidebar.expander("Diagnostics"):
+    from components.diagnostics import display_diagnostics
+    display_diagnostics()
 
 # Add a placeholder for auto-refresh indicator
 placeholder = st.empty()
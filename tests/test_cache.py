@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.database import Database
+from services.storage import datasets
+from utils import cache
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'cache.db'}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    return Database(url)
+
+
+def _age_datasets(db, seconds):
+    stamp = datetime.now() - timedelta(seconds=seconds)
+    db.backend.write(lambda conn: conn.execute(datasets.update().values(last_updated=stamp)))
+
+
+def _fail():
+    raise RuntimeError('upstream down')
+
+
+def test_follower_of_an_active_leader_reads_the_store(db):
+    db.write_cycle(datasets={'market_data': {'price': 1}})
+
+    assert cache._load('market_data', _fail) == {'price': 1}
+    with pytest.raises(LookupError):
+        cache._load('volume_data', _fail)
+
+
+def test_fetches_when_no_leader_is_writing(db):
+    assert cache._load('market_data', lambda: {'price': 2}) == {'price': 2}
+
+    db.write_cycle(datasets={'market_data': {'price': 1}})
+    _age_datasets(db, cache.LEADER_SILENT_AFTER + 1)
+    assert db.last_write_at() < datetime.now() - timedelta(seconds=cache.LEADER_SILENT_AFTER)
+    assert cache._load('market_data', lambda: {'price': 2}) == {'price': 2}
+    # A failed fetch keeps the last value the leader stored
+    assert cache._load('market_data', _fail) == {'price': 1}
+
+
+def test_fetches_when_the_store_is_unavailable(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'missing' / 'cache.db'}")
+
+    assert cache._load('market_data', lambda: {'price': 3}) == {'price': 3}
+    with pytest.raises(RuntimeError):
+        cache._load('market_data', _fail)
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+import requests
+
+from services import http_client
+from services.circuit_breaker import CLOSED, OPEN, CircuitBreaker
+from services.http_cache import HTTPCache
+
+
+def test_cached_response_reads_like_a_downloaded_one(tmp_path):
+    cache = HTTPCache(directory=str(tmp_path))
+    entry = cache._store('https://api.example/nodes', {'Content-Type': 'application/json'}, b'[1,{"a":2}]')
+
+    response = entry.to_response()
+    assert response.from_cache
+    assert list(http_client.iter_json_array(response)) == [1, {'a': 2}]
+    assert entry.to_response().json() == [1, {'a': 2}]
+    assert entry.to_response().content == b'[1,{"a":2}]'
+
+
+def _streamed(body, breaker):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    response.streamed = True
+    response.breaker = breaker
+    return response
+
+
+def test_body_that_breaks_off_counts_against_the_breaker():
+    breaker = CircuitBreaker('test', failure_threshold=2)
+    for _ in range(2):
+        # ijson's IncompleteJSONError, or a JSONDecodeError without ijson
+        with pytest.raises(Exception):
+            list(http_client.iter_json_array(_streamed(b'[{"a":1},{"a":', breaker)))
+    assert breaker.state == OPEN
+
+
+def test_complete_body_counts_as_a_success():
+    breaker = CircuitBreaker('test', failure_threshold=2)
+    breaker.record_failure()
+    assert list(http_client.iter_json_array(_streamed(b'[{"a":1},{"a":2}]', breaker))) == [{'a': 1}, {'a': 2}]
+    breaker.record_failure()
+    assert breaker.state == CLOSED
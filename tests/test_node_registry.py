@@ -0,0 +1,39 @@
+from services.node_registry import NodeRegistry
+
+
+def _node(i, status='eligible', rating=90.0):
+    return {'bls': f'{i:0192x}', 'shard': i % 3, 'status': status, 'provider': 'erd1p',
+            'stake': '2500000000000000000000', 'rating': rating}
+
+
+def test_refetch_within_an_epoch_keeps_the_epoch_base(tmp_path):
+    registry = NodeRegistry(path=str(tmp_path / 'nodes.npz'))
+    assert registry.refresh([_node(i) for i in range(10)], 100) is None
+
+    # Jailed mid-epoch: the table shows it now, the epoch diff still records it
+    jailed = [_node(i, 'jailed' if i == 3 else 'eligible', rating=50.0) for i in range(10)]
+    assert registry.refresh(jailed, 100) is None
+    assert registry.per_provider()[0]['jailed'] == 1
+    assert registry.summary()['fetched_at'] is not None
+
+    registry.save()
+    restored = NodeRegistry(path=registry.path)
+    assert restored.load()
+    assert restored.age < 60
+    change = restored.refresh(jailed[1:] + [_node(10)], 101)
+
+    assert change['previous_epoch'] == 100
+    assert len(change['joined']) == len(change['left']) == len(change['jailed']) == 1
+    assert change['changed'] == 9
+
+
+def test_files_without_a_fetch_time_age_out(tmp_path):
+    registry = NodeRegistry(path=str(tmp_path / 'nodes.npz'))
+    registry.refresh([_node(i) for i in range(3)], 100)
+    registry.fetched_at = None
+    registry.save()
+
+    restored = NodeRegistry(path=registry.path)
+    assert restored.load()
+    assert restored.base is restored.table
+    assert restored.age == float('inf')
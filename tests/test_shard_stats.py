@@ -0,0 +1,38 @@
+from services.shard_stats import METACHAIN_ID, BlockWindow
+
+NOW = 1_700_000_000
+
+
+def _block(nonce, shard=0, tx_count=10):
+    return {'shard': shard, 'nonce': nonce, 'round': nonce, 'timestamp': NOW + nonce * 6, 'txCount': tx_count}
+
+
+def test_late_blocks_are_inserted_in_nonce_order():
+    window = BlockWindow()
+    assert window.add([_block(1), _block(2), _block(4)]) == 3
+    assert window.add([_block(3), _block(2)]) == 1
+
+    stats = window.stats()['0']
+    assert stats['blocks'] == 4
+    assert stats['missed_rounds'] == 0
+    assert stats['round_time'] == 6.0
+
+
+def test_blocks_without_a_shard_are_skipped():
+    window = BlockWindow()
+    shardless = _block(1)
+    del shardless['shard']
+    assert window.add([shardless, _block(1, shard=None), _block(1, shard=METACHAIN_ID)]) == 1
+    assert list(window.stats()) == ['meta']
+
+
+def test_full_window_drops_the_lowest_nonces():
+    window = BlockWindow(size=3)
+    window.add([_block(nonce) for nonce in (1, 2, 3)])
+    assert window.add([_block(5), _block(0)]) == 1
+    assert window.add([_block(4, tx_count=0)]) == 1
+
+    stats = window.stats()['0']
+    assert stats['blocks'] == 3
+    assert stats['last_round'] == 5
+    assert stats['empty_blocks'] == 1
@@ -0,0 +1,44 @@
+import json
+
+from services import snapshot
+from services.snapshot import SnapshotStore
+from services.tps_updater import TPSUpdater
+
+
+def _section(store, section):
+    body, _ = store.get(section)
+    return json.loads(body)
+
+
+def test_publish_replaces_and_merge_updates_fields():
+    store = SnapshotStore()
+    store.publish('network_stats', {'epoch': 1, 'shards': 3})
+    store.merge('network_stats', epoch=2)
+
+    assert _section(store, 'network_stats') == {'epoch': 2, 'shards': 3}
+    store.publish('network_stats', {'epoch': 3})
+    assert _section(store, 'network_stats') == {'epoch': 3}
+
+
+def test_unchanged_publish_keeps_the_etag():
+    store = SnapshotStore()
+    store.publish('market_data', {'price': 1.0})
+    _, etag = store.get('market_data')
+    store.publish('market_data', {'price': 1.0})
+
+    assert store.get('market_data')[1] == etag
+    assert store.get('missing') is None
+
+
+def test_republished_network_stats_keep_the_sampled_tps():
+    updater = TPSUpdater()
+    snapshot.publish('network_stats', {'epoch': 1})
+    updater._publish(12.5, {'0': 40}, {}, 1_700_000_000)
+    # The page and the collector publish network_stats whole on every run
+    snapshot.publish('network_stats', {'epoch': 2})
+    snapshot.merge('tps', stale=True)
+
+    assert _section(snapshot.STORE, 'network_stats') == {'epoch': 2}
+    assert _section(snapshot.STORE, 'tps') == {
+        'tps': 12.5, 'shards': {'0': 40}, 'stale': True, 'last_updated': 1_700_000_000
+    }
@@ -0,0 +1,132 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect, select
+
+from services.database import Database
+from services.storage import (
+    MIGRATIONS, PostgresBackend, SqliteBackend, create_backend, datasets, get_backend,
+    market_data, schema_migrations, tps_samples, wallet_data
+)
+from services.transfers import INCOMING, TransferSeries
+
+# Postgres runs only against a database you point it at; tests use their own rows
+POSTGRES_URL = os.getenv('TEST_DATABASE_URL')
+
+
+@pytest.fixture(params=[
+    SqliteBackend,
+    pytest.param(PostgresBackend, marks=pytest.mark.skipif(not POSTGRES_URL, reason='TEST_DATABASE_URL not set')),
+])
+def url(request, tmp_path):
+    if request.param is SqliteBackend:
+        return f"sqlite:///{tmp_path / 'test.db'}"
+    return POSTGRES_URL
+
+
+def _wallet(balance):
+    transfers = TransferSeries.from_arrays([1_700_000_000], [balance], [INCOMING])
+    return {'balance': balance, 'balance_atomic': int(balance * 10 ** 18), 'transfers': transfers, 'daily_flows': []}
+
+
+def _rows(backend, table, where):
+    with backend.engine.connect() as conn:
+        return conn.execute(select(table).where(where)).fetchall()
+
+
+def _delete(backend, table, where):
+    backend.write(lambda conn: conn.execute(table.delete().where(where)))
+
+
+def test_get_backend_picks_the_backend(url):
+    backend = get_backend(url)
+    assert isinstance(backend, SqliteBackend if url.startswith('sqlite') else PostgresBackend)
+    assert get_backend(url) is backend
+
+
+def test_migrations_are_idempotent(url):
+    backend = get_backend(url)
+    backend.migrate()
+    backend.migrate()
+
+    with backend.engine.connect() as conn:
+        versions = conn.execute(select(schema_migrations.c.version)).scalars().all()
+    assert sorted(versions) == [version for version, _, _ in MIGRATIONS]
+    tables = inspect(backend.engine).get_table_names()
+    for table in (wallet_data, market_data, tps_samples, datasets):
+        assert table.name in tables
+
+
+def test_write_cycle_upserts_wallets_and_datasets(url):
+    db = Database(url)
+    try:
+        db.write_cycle(wallets={'test_upsert_wallet': _wallet(1.0)}, datasets={'test_upsert': {'price': 1}})
+        written = db.write_cycle(
+            wallets={'test_upsert_wallet': _wallet(2.0)}, datasets={'test_upsert': {'price': 2}}
+        )
+
+        assert written == 2
+        assert len(_rows(db.backend, wallet_data, wallet_data.c.address == 'test_upsert_wallet')) == 1
+        data = db.get_wallet_data('test_upsert_wallet')
+        assert data['balance'] == 2.0
+        assert data['balance_atomic'] == 2 * 10 ** 18
+        assert data['transfers'].amounts.tolist() == [2.0]
+        assert db.get_dataset('test_upsert') == {'price': 2}
+        assert db.get_dataset('test_missing') is None
+    finally:
+        _delete(db.backend, wallet_data, wallet_data.c.address == 'test_upsert_wallet')
+        _delete(db.backend, datasets, datasets.c.name == 'test_upsert')
+
+
+def test_write_cycle_ignores_repeated_sample_timestamps(url):
+    db = Database(url)
+    stamp = datetime(2001, 2, 3, 4, 5, 6)
+    try:
+        db.write_cycle(market=[{'price': 1.0, 'last_updated': stamp}])
+        db.write_cycle(market=[{'price': 2.0, 'last_updated': stamp}])
+
+        rows = _rows(db.backend, market_data, market_data.c.last_updated == stamp)
+        assert [row.price for row in rows] == [1.0]
+    finally:
+        _delete(db.backend, market_data, market_data.c.last_updated == stamp)
+
+
+def test_lease_acquire_renew_expire(url):
+    name = f'test-lease-{time.time_ns()}'
+    first, second = get_backend(url), create_backend(url)
+    try:
+        assert first.acquire_lease(name, 'first', ttl=30)
+        assert not second.acquire_lease(name, 'second', ttl=30)
+        assert first.acquire_lease(name, 'first', ttl=30)
+
+        if isinstance(first, PostgresBackend):
+            # Advisory locks end with the holder's session
+            first.release_lease(name, 'first')
+        else:
+            first.acquire_lease(name, 'first', ttl=0.01)
+            time.sleep(0.05)
+        assert second.acquire_lease(name, 'second', ttl=30)
+        assert not first.acquire_lease(name, 'first', ttl=30)
+    finally:
+        first.release_lease(name, 'first')
+        second.release_lease(name, 'second')
+        second.dispose()
+
+
+def test_prune_tps_samples(url):
+    db = Database(url)
+    old = datetime.now() - timedelta(days=40)
+    recent = datetime.now() - timedelta(days=1)
+    stamps = tps_samples.c.last_updated.in_([old, recent])
+    try:
+        db.write_cycle(tps=[
+            {'tps': 1.0, 'shards': {}, 'last_updated': old},
+            {'tps': 2.0, 'shards': {}, 'last_updated': recent},
+        ])
+        db.prune_tps_samples(30)
+
+        assert [row.tps for row in _rows(db.backend, tps_samples, stamps)] == [2.0]
+    finally:
+        _delete(db.backend, tps_samples, stamps)
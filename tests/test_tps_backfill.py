@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from services.database import Database
+from services.tps_backfill import HOUR, TPSBackfill
+
+START = 1_700_000_000 // HOUR * HOUR
+
+
+def _chunk(missing=0):
+    return {'tx': [60] * 60, 'blocks': [10] * 60, 'missing': missing}
+
+
+def test_hour_with_missing_blocks_is_written_with_its_gap(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'backfill.db'}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    backfill = TPSBackfill(START, START + HOUR, shards=[0, 1], checkpoint_dir=str(tmp_path))
+    backfill._state['chunks'] = {f'0:{START}': _chunk(), f'1:{START}': _chunk(missing=3)}
+
+    assert backfill._write_hour(START)
+    assert backfill.complete
+    assert backfill._state['gaps'] == {str(START): 3}
+    assert backfill._state['chunks'] == {}
+
+    sample = Database(url).get_latest_tps_sample()
+    assert sample['tps'] == 2.0
+    last_updated = sample['last_updated']
+    if isinstance(last_updated, str):
+        last_updated = datetime.fromisoformat(last_updated)
+    assert last_updated == datetime.fromtimestamp(START + HOUR - 60)
+
+
+def test_hour_waits_for_every_shard(tmp_path):
+    backfill = TPSBackfill(START, START + HOUR, shards=[0, 1], checkpoint_dir=str(tmp_path))
+    backfill._state['chunks'] = {f'0:{START}': _chunk()}
+
+    assert not backfill._write_hour(START)
+    assert not backfill.complete
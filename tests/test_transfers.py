@@ -0,0 +1,117 @@
+import json
+import struct
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+from services.database import Database
+from services.transfers import (
+    INCOMING, NO_COUNTERPARTY, OUTGOING, TransferSeries, address_key
+)
+
+NOW = 1_700_000_000
+
+
+def _series():
+    return TransferSeries.from_arrays(
+        [NOW - 30, NOW - 10, NOW - 20],
+        [1.5, 4.0, 2.5],
+        [INCOMING, OUTGOING, INCOMING],
+        [address_key('erd1a'), address_key('erd1c'), address_key('erd1b')]
+    )
+
+
+def _v1_blob(series):
+    """A blob as written before the counterparty column existed"""
+    return b''.join((
+        struct.pack('<4sB3xQ', b'MVXT', 1, len(series)),
+        series.timestamps.astype('<i8').tobytes(),
+        series.amounts.astype('<f8').tobytes(),
+        series.directions.tobytes()
+    ))
+
+
+def test_v2_round_trip_keeps_every_column():
+    series = _series()
+    loaded = TransferSeries.from_bytes(series.to_bytes())
+
+    assert loaded.timestamps.tolist() == [NOW - 30, NOW - 20, NOW - 10]
+    assert loaded.amounts.tolist() == [1.5, 2.5, 4.0]
+    assert loaded.directions.tolist() == [INCOMING, INCOMING, OUTGOING]
+    assert loaded.counterparties.tolist() == [address_key('erd1a'), address_key('erd1b'), address_key('erd1c')]
+    assert loaded.window_sums(NOW - 25) == series.window_sums(NOW - 25)
+
+
+def test_v1_blob_loads_with_unknown_counterparties():
+    series = _series()
+    loaded = TransferSeries.from_bytes(_v1_blob(series))
+
+    assert np.array_equal(loaded.timestamps, series.timestamps)
+    assert np.array_equal(loaded.amounts, series.amounts)
+    assert np.array_equal(loaded.directions, series.directions)
+    assert loaded.counterparties.tolist() == [NO_COUNTERPARTY] * 3
+
+
+def test_from_bytes_rejects_other_blobs():
+    with pytest.raises(ValueError):
+        TransferSeries.from_bytes(struct.pack('<4sB3xQ', b'NOPE', 2, 0))
+    with pytest.raises(ValueError):
+        TransferSeries.from_bytes(struct.pack('<4sB3xQ', b'MVXT', 9, 0))
+
+
+def test_empty_series():
+    empty = TransferSeries.empty()
+    loaded = TransferSeries.from_bytes(empty.to_bytes())
+
+    assert len(loaded) == 0
+    assert list(loaded) == []
+    assert loaded.daily_flows() == []
+    assert loaded.window_sums(0) == {'inflow': 0.0, 'outflow': 0.0, 'net': 0.0}
+    assert len(TransferSeries.from_bytes(_v1_blob(empty))) == 0
+
+
+def test_counterparty_column():
+    assert address_key('') == NO_COUNTERPARTY
+    assert address_key(None) == NO_COUNTERPARTY
+    assert address_key('erd1a') == address_key('erd1a') != address_key('erd1b')
+
+    series = _series()
+    assert series.since(NOW - 20).counterparties.tolist() == [address_key('erd1b'), address_key('erd1c')]
+    # Histories without the column are unknown on every row
+    legacy = TransferSeries.from_arrays([NOW], [1.0], [INCOMING])
+    assert legacy.counterparties.tolist() == [NO_COUNTERPARTY]
+
+
+def test_get_wallet_data_reads_legacy_json_transfers(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'legacy.db'}")
+    transfers = [
+        {'timestamp': datetime.fromtimestamp(NOW - 60).isoformat(), 'value': 3.0, 'action': 'incoming'},
+        {'timestamp': datetime.fromtimestamp(NOW).isoformat(), 'value': 1.0, 'action': 'outgoing'},
+    ]
+    daily_flows = [{'date': datetime.fromtimestamp(NOW).isoformat(), 'inflow': 3.0, 'outflow': 1.0, 'net_flow': 2.0}]
+    # A row written before transfers_blob and balance_atomic existed
+    with db.engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO wallet_data (address, balance, transfers, daily_flows, last_updated)
+                VALUES (:address, :balance, :transfers, :daily_flows, :last_updated)
+            """),
+            {
+                'address': 'legacy_wallet',
+                'balance': 12.5,
+                'transfers': json.dumps(transfers),
+                'daily_flows': json.dumps(daily_flows),
+                'last_updated': datetime.now()
+            }
+        )
+
+    data = db.get_wallet_data('legacy_wallet')
+
+    assert data['balance'] == 12.5
+    assert data['balance_atomic'] is None
+    assert data['transfers'].timestamps.tolist() == [NOW - 60, NOW]
+    assert data['transfers'].directions.tolist() == [INCOMING, OUTGOING]
+    assert data['transfers'].counterparties.tolist() == [NO_COUNTERPARTY] * 2
+    assert data['daily_flows'][0]['date'] == datetime.fromtimestamp(NOW)
@@ -0,0 +1,73 @@
+import json
+
+from services.broadcaster import Broadcaster
+from services.tx_feed import FEED_SIZE, LOOKBACK_SECONDS, TransactionFeed
+
+NOW = 1_700_000_000
+
+
+class FakeService:
+    """The /transactions endpoint over an in-memory list"""
+
+    def __init__(self):
+        self.transactions = []
+
+    def add(self, tx_hash, timestamp):
+        self.transactions.append({'txHash': tx_hash, 'sender': 'erd1a', 'receiver': 'erd1b',
+                                  'value': '1000000000000000000', 'timestamp': timestamp})
+
+    def get_transactions(self, after=None, offset=0, size=50, order='desc'):
+        matching = [tx for tx in self.transactions if after is None or tx['timestamp'] >= after]
+        matching.sort(key=lambda tx: tx['timestamp'], reverse=order == 'desc')
+        return matching[offset:offset + size], 0
+
+
+def _hashes(records):
+    return [record['hash'] for record in records]
+
+
+def test_poll_picks_up_transactions_indexed_late():
+    service = FakeService()
+    service.add('a', NOW)
+    feed = TransactionFeed(service)
+    assert _hashes(feed.poll()) == ['a']
+
+    service.add('b', NOW + 12)
+    assert _hashes(feed.poll()) == ['b']
+    # Indexed after b, but stamped earlier than the cursor
+    service.add('late', NOW + 5)
+    service.add('c', NOW + 13)
+    assert _hashes(feed.poll()) == ['late', 'c']
+    assert feed.poll() == []
+
+
+def test_seen_hashes_outlive_the_display_window():
+    service = FakeService()
+    service.add('first', NOW)
+    feed = TransactionFeed(service, maxlen=10)
+    feed.poll()
+
+    for i in range(FEED_SIZE + 100):
+        service.add(f'tx{i}', NOW + 1)
+    assert len(feed.poll()) == FEED_SIZE + 100
+    # Everything is still inside the lookback window, so nothing repeats
+    assert feed.poll() == []
+    assert len(feed.latest(20)) == 10
+
+    service.add('next', NOW + LOOKBACK_SECONDS + 5)
+    assert _hashes(feed.poll()) == ['next']
+    assert 'first' not in feed._seen
+
+
+def test_lagging_subscriber_is_resynced():
+    state = {'type': 'resync', 'transactions': []}
+    channel = Broadcaster('test', queue_size=2, state=lambda: state)
+    subscription = channel.subscribe()
+    assert json.loads(subscription.get_nowait()) == state
+
+    for i in range(3):
+        state = {'type': 'resync', 'transactions': list(range(i + 1))}
+        channel.publish({'type': 'delta', 'transactions': [i]})
+
+    assert json.loads(subscription.get_nowait()) == {'type': 'resync', 'transactions': [0, 1, 2]}
+    assert subscription.empty()
@@ -1,33 +1,169 @@
-import streamlit as st
-from datetime import datetime, timedelta
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from services.database import Database
+from utils import metrics
 
-def get_cached_data(key, fetch_func, ttl_minutes=10):
-    """Get data from database cache or fetch fresh data"""
+# Last good value per key, shared by every session in this process
+_entries = {}
+_refreshing = set()
+_lock = threading.Lock()
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+# Without a dataset written for this long (ten refresh cycles) no leader is
+# collecting, and every process fetches upstream itself
+LEADER_SILENT_AFTER = 60  # seconds
+
+
+class CacheEntry:
+    def __init__(self, value, ttl_seconds):
+        self.value = value
+        self.ttl_seconds = ttl_seconds
+        self.fetched_at = time.time()
+        self.error = None
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    @property
+    def stale(self):
+        return self.age > self.ttl_seconds
+
+
+def _is_leader():
+    # Imported late so importing the cache does not pull in every collector
+    from services.updater import collector_role
+    return collector_role() == 'leader'
+
+
+def _read_store(key):
+    """(stored value or None, whether a leader wrote recently)"""
     db = Database()
-    
     try:
-        # For network stats, use shorter TTL
-        if key == 'network_stats':
-            ttl_minutes = 0.1  # 6 seconds
-            
-        # Try to get from cache first
         if 'wallet' in key:
-            cached_data = db.get_wallet_data(key, ttl_minutes)
-            if cached_data and cached_data['balance'] > 0:  # Only use cache if balance exists
-                return cached_data
-        
-        # If not in cache or too old, fetch fresh data
-        fresh_data = fetch_func()
-        
-        # Store in cache if it's wallet data
-        if 'wallet' in key and fresh_data and fresh_data['balance'] > 0:
-            db.update_wallet_data(key, fresh_data)
-            
-        return fresh_data
-        
-    except Exception as e:
-        print(f"Cache error for {key}: {e}")
-        return fetch_func()  # Fallback to fresh data
+            data = db.get_wallet_data(key, max_age_minutes=None)
+        else:
+            data = db.get_dataset(key)
+        last_write = db.last_write_at()
     finally:
         db.close()
+    if isinstance(last_write, str):
+        last_write = datetime.fromisoformat(last_write)
+    leader_active = last_write is not None and (datetime.now() - last_write).total_seconds() < LEADER_SILENT_AFTER
+    return data, leader_active
+
+
+def _load(key, fetch_func):
+    """Latest value the collector leader stored for a key.
+
+    Wallets come from wallet_data and everything else from the datasets
+    table. The leader calls fetch_func only while the store has nothing
+    yet (its first cycle), and followers of an active leader never call
+    upstream. When the store cannot be read or no leader has written
+    within LEADER_SILENT_AFTER (no election, database down), fetch_func
+    is called instead, falling back to the stored value if that fails.
+    """
+    try:
+        data, leader_active = _read_store(key)
+    except Exception as e:
+        logging.warning(f"Shared store unavailable for {key}: {e}")
+        data, leader_active = None, False
+
+    if _is_leader():
+        if data is None:
+            data = fetch_func()
+    elif not leader_active:
+        try:
+            data = fetch_func()
+        except Exception as e:
+            if data is None:
+                raise
+            logging.warning(f"No active collector and fetch failed for {key}; using the stored value: {e}")
+    if data is None:
+        raise LookupError(f"Nothing stored for {key} yet")
+    return data
+
+
+def _fetch(key, fetch_func, ttl_seconds):
+    """Load the stored value and remember it as the last good value"""
+    fresh_data = _load(key, fetch_func)
+
+    if 'wallet' in key and fresh_data:
+        # Imported late like the page's analytics sections
+        from services import flows
+        flows.ingest(key, fresh_data['transfers'])
+
+    with _lock:
+        _entries[key] = CacheEntry(fresh_data, ttl_seconds)
+    return fresh_data
+
+
+def _refresh(key, fetch_func, ttl_seconds):
+    try:
+        _fetch(key, fetch_func, ttl_seconds)
+    except Exception as e:
+        logging.warning(f"Background refresh failed for {key}: {e}")
+        with _lock:
+            if key in _entries:
+                _entries[key].error = str(e)
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def _refresh_in_background(key, fetch_func, ttl_seconds):
+    """Start at most one refresh per key"""
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_pool.submit(_refresh, key, fetch_func, ttl_seconds)
+
+
+def get_cached_data(key, fetch_func, ttl_minutes=10, default=None):
+    """Serve the last good value immediately and revalidate it in the background.
+
+    Values are read from the shared store the collector leader writes
+    (see _load). Only the very first request for a key waits on it; after
+    that a stale value is returned as-is while a single background refresh
+    runs, so render latency stays flat. If no good value was ever loaded,
+    `default` is returned.
+    """
+    # For network stats, use shorter TTL
+    if key == 'network_stats':
+        ttl_minutes = 0.1  # 6 seconds
+    ttl_seconds = ttl_minutes * 60
+
+    with _lock:
+        entry = _entries.get(key)
+
+    if entry is not None:
+        metrics.record_cache(key, hit=True)
+        if entry.stale:
+            _refresh_in_background(key, fetch_func, ttl_seconds)
+        return entry.value
+
+    metrics.record_cache(key, hit=False)
+    try:
+        return _fetch(key, fetch_func, ttl_seconds)
+    except LookupError as e:
+        logging.info(f"{e}; showing the default")
+        return default
+    except Exception as e:
+        logging.error(f"Fetch failed for {key} with no cached value: {e}")
+        return default
+
+
+def get_freshness(key):
+    """Return {'age', 'stale', 'error'} for a cached key, or None if never fetched"""
+    with _lock:
+        entry = _entries.get(key)
+    if entry is None:
+        return None
+    return {
+        'age': entry.age,
+        'stale': entry.stale,
+        'error': entry.error
+    }
@@ -0,0 +1,259 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Latency buckets in seconds, tuned for upstream HTTP calls and page sections
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(label_names, label_values, extra=None):
+    """Render a Prometheus label set such as {endpoint="/stats",status="200"}"""
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    rendered = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return '{' + rendered + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        """Return {label_values: count}"""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = []
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    'counts': [0] * (len(self.buckets) + 1),
+                    'sum': 0.0,
+                    'count': 0
+                }
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def summaries(self):
+        """Return {label_values: {'count', 'sum', 'p50', 'p95'}} for display"""
+        with self._lock:
+            series = {key: (list(s['counts']), s['sum'], s['count']) for key, s in self._series.items()}
+
+        result = {}
+        for key, (counts, total, count) in series.items():
+            result[key] = {
+                'count': count,
+                'sum': total,
+                'avg': total / count if count else 0.0,
+                'p50': self._quantile(counts, count, 0.5),
+                'p95': self._quantile(counts, count, 0.95)
+            }
+        return result
+
+    def _quantile(self, counts, count, q):
+        """Upper bucket bound containing the q-th observation"""
+        if not count:
+            return 0.0
+        target = q * count
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            if running >= target:
+                return bound
+        return float('inf')
+
+    def render(self):
+        with self._lock:
+            series = {key: (list(s['counts']), s['sum'], s['count']) for key, s in self._series.items()}
+
+        lines = []
+        for key, (counts, total, count) in sorted(series.items()):
+            running = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                running += bucket_count
+                labels = _format_labels(self.label_names, key, ('le', repr(float(bound))))
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            labels = _format_labels(self.label_names, key, ('le', '+Inf'))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, description, labels=()):
+        return self._register(Counter(name, description, labels))
+
+    def histogram(self, name, description, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, description, labels, buckets))
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+http_requests_total = REGISTRY.counter(
+    'mvx_http_requests_total',
+    'Upstream HTTP requests by host, endpoint and status code',
+    ('host', 'endpoint', 'status')
+)
+http_request_seconds = REGISTRY.histogram(
+    'mvx_http_request_duration_seconds',
+    'Upstream HTTP request latency',
+    ('host', 'endpoint')
+)
+cache_requests_total = REGISTRY.counter(
+    'mvx_cache_requests_total',
+    'Cache lookups by key and result',
+    ('key', 'result')
+)
+job_duration_seconds = REGISTRY.histogram(
+    'mvx_job_duration_seconds',
+    'Background updater job duration',
+    ('job',)
+)
+render_seconds = REGISTRY.histogram(
+    'mvx_render_duration_seconds',
+    'Page section render time',
+    ('section',)
+)
+db_write_seconds = REGISTRY.histogram(
+    'mvx_db_write_duration_seconds',
+    'Database write transaction duration',
+    ('operation',)
+)
+db_rows_written_total = REGISTRY.counter(
+    'mvx_db_rows_written_total',
+    'Rows written to the database by table',
+    ('table',)
+)
+
+
+def observe_request(host, endpoint, status, seconds):
+    """Record one upstream HTTP call"""
+    http_requests_total.inc(host=host, endpoint=endpoint, status=status)
+    http_request_seconds.observe(seconds, host=host, endpoint=endpoint)
+
+
+def record_cache(key, hit):
+    """Record a cache lookup as a hit or a miss"""
+    cache_requests_total.inc(key=key, result='hit' if hit else 'miss')
+
+
+def cache_hit_ratios():
+    """Return {key: (hits, misses, ratio)}"""
+    totals = {}
+    for (key, result), count in cache_requests_total.values().items():
+        hits, misses = totals.get(key, (0, 0))
+        if result == 'hit':
+            hits += count
+        else:
+            misses += count
+        totals[key] = (hits, misses)
+
+    return {
+        key: (hits, misses, hits / (hits + misses) if hits + misses else 0.0)
+        for key, (hits, misses) in totals.items()
+    }
+
+
+@contextmanager
+def timed(histogram, **labels):
+    """Observe the duration of the wrapped block on the given histogram"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+class RenderTimer:
+    """Lap timer for page sections: each lap() closes the previous section"""
+
+    def __init__(self):
+        self._section = None
+        self._start = None
+
+    def lap(self, section):
+        self.finish()
+        self._section = section
+        self._start = time.perf_counter()
+
+    def finish(self):
+        if self._section is not None:
+            render_seconds.observe(time.perf_counter() - self._start, section=self._section)
+        self._section = None
+        self._start = None
+
+
+def render_prometheus():
+    return REGISTRY.render()